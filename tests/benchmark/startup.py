@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for ucsm_apis.
+
+Measures, each in a fresh interpreter, the time to import ucsm_apis and
+every api module, and the first-call latency of one api per subpackage:
+the api is called twice against a UcsHandle whose requests are mocked,
+so the first call includes the lazy imports of ucsmsdk classes and the
+second one is served from the warm caches.
+
+Usage:
+    python -m tests.benchmark.startup [repeat]
+"""
+import os
+import subprocess
+import sys
+
+_root = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+_import_script = """
+import time
+start = time.time()
+import %s
+print(time.time() - start)
+"""
+
+_first_call_script = """
+import time
+from mock import patch
+from ucsmsdk.ucshandle import UcsHandle
+from ucsm_apis.utils.utils import mo_class_get
+from %(module)s import %(api)s
+
+handle = UcsHandle("10.10.10.10", "admin", "password")
+
+
+def query_dn(dn, hierarchy=False):
+    # what UCSM would return for the dn
+    return %(query_dn)s
+
+
+with patch.object(UcsHandle, "query_dn", side_effect=query_dn), \\
+        patch.object(UcsHandle, "query_children", return_value=[]), \\
+        patch.object(UcsHandle, "add_mo"), \\
+        patch.object(UcsHandle, "set_mo"), \\
+        patch.object(UcsHandle, "remove_mo"), \\
+        patch.object(UcsHandle, "commit"):
+    start = time.time()
+    %(api)s(handle, %(args)s)
+    cold = time.time() - start
+    start = time.time()
+    %(api)s(handle, %(args)s)
+    print(cold, time.time() - start)
+"""
+
+# one api per subpackage: (module, api, args, query_dn result)
+_first_calls = [
+    ("ucsm_apis.admin.dns", "dns_server_add", 'name="8.8.8.8"', "None"),
+    ("ucsm_apis.server.boot", "boot_policy_order_set",
+     'name="bp", devices=[{"device_name": "lan", "device_order": "1", '
+     '"vnic_name": "eth0"}, {"device_name": "cd_dvd_local", '
+     '"device_order": "2"}]',
+     'mo_class_get("LsbootPolicy")("org-root", name="bp")'),
+    ("ucsm_apis.service_profile.ls_server", "ls_server_tree_create",
+     'name="sp1", vnic_ethers=[{"name": "eth0", "ifs": '
+     '[{"name": "default"}]}], vcons=[{"id": "1"}]',
+     '"org-root"'),
+]
+
+
+def _modules_get():
+    modules = []
+    package_dir = os.path.join(_root, "ucsm_apis")
+    for subpackage in sorted(os.listdir(package_dir)):
+        subpackage_dir = os.path.join(package_dir, subpackage)
+        if not os.path.isdir(subpackage_dir):
+            continue
+        for file_name in sorted(os.listdir(subpackage_dir)):
+            if file_name.endswith(".py") and file_name != "__init__.py":
+                modules.append("ucsm_apis.%s.%s" % (subpackage,
+                                                    file_name[:-3]))
+    return modules
+
+
+def _run(script):
+    output = subprocess.check_output([sys.executable, "-c", script],
+                                     cwd=_root)
+    return [float(value) for value in
+            output.decode().strip().strip("()").split(",")]
+
+
+def _best(script, repeat):
+    runs = [_run(script) for _ in range(repeat)]
+    return [min(values) for values in zip(*runs)]
+
+
+def main(repeat=5):
+    print("%-45s %10s" % ("import", "ms"))
+    print("%-45s %10.2f" % ("ucsm_apis",
+                            _best(_import_script % "ucsm_apis",
+                                  repeat)[0] * 1000))
+    modules = _modules_get()
+    for module in modules:
+        print("%-45s %10.2f" % (module,
+                                _best(_import_script % module,
+                                      repeat)[0] * 1000))
+
+    print("")
+    print("%-60s %10s %10s" % ("first call", "cold ms", "warm ms"))
+    for module, api, args, query_dn in _first_calls:
+        cold, warm = _best(_first_call_script % {"module": module,
+                                                 "api": api,
+                                                 "args": args,
+                                                 "query_dn": query_dn},
+                           repeat)
+        print("%-60s %10.2f %10.3f" % ("%s.%s" % (module, api),
+                                       cold * 1000, warm * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
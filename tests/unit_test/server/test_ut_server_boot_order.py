@@ -979,3 +979,877 @@ def test_boot_special_case_05(mock_login, mock_query_dn, mock_order_clear):
          boot_policy_order_set(handle, boot_policy_dn, devices)
     assert_equal(error.exception.message, expected_error_message)
 
+
+
+def _existing_boot_policy_get(faulted=False):
+    from ucsmsdk.mometa.lsboot.LsbootLan import LsbootLan
+    from ucsmsdk.mometa.lsboot.LsbootLanImagePath import LsbootLanImagePath
+    from ucsmsdk.mometa.lsboot.LsbootVirtualMedia import LsbootVirtualMedia
+    from ucsmsdk.mometa.lsboot.LsbootBootSecurity import LsbootBootSecurity
+    from ucsmsdk.mometa.lsboot.LsbootUEFIBootParam import \
+        LsbootUEFIBootParam
+    from ucsmsdk.mometa.fault.FaultInst import FaultInst
+
+    bp = LsbootPolicy("org-root", name="test")
+    lan = LsbootLan(parent_mo_or_dn=bp, order="1", prot="pxe")
+    path = LsbootLanImagePath(parent_mo_or_dn=lan, type="primary",
+                              vnic_name="eth0")
+    LsbootLanImagePath(parent_mo_or_dn=lan, type="secondary",
+                       vnic_name="eth1")
+    LsbootVirtualMedia(parent_mo_or_dn=bp, access="read-only", order="2")
+    LsbootBootSecurity(parent_mo_or_dn=bp)
+    if faulted:
+        FaultInst(parent_mo_or_dn=bp, code="F0170")
+        LsbootUEFIBootParam(parent_mo_or_dn=path)
+    # serves both the configResolveDn and the configResolveClass queries
+    response = Mock()
+    response.out_config.child = [bp]
+    response.out_configs.child = response.out_config.child
+    return response
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_single_transaction(mock_login, mock_query_dn,
+                                           mock_remove_mo, mock_set_mo,
+                                           mock_commit):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "efi",
+                 "device_order": "1",
+                },
+                {"device_name": "lan",
+                 "device_order": "2",
+                 "vnic_name": "eth0"
+                },
+    ]
+    boot_policy_order_set(handle, "test", devices, single_transaction=True)
+
+    assert_equal(mock_query_dn.call_count, 1)
+    assert_equal(mock_commit.call_count, 1)
+    removed = sorted([call[0][0].dn for call in mock_remove_mo.call_args_list])
+    assert_equal(removed, ["org-root/boot-policy-test/lan/path-secondary",
+                           "org-root/boot-policy-test/read-only-vm"])
+    boot_policy = mock_set_mo.call_args[0][0]
+    assert_equal(boot_policy.dn, "org-root/boot-policy-test")
+    assert_equal(sorted([mo.get_class_id() for mo in boot_policy.child]),
+                 ["LsbootEFIShell", "LsbootLan"])
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_single_transaction_fault(mock_login, mock_query_dn,
+                                                 mock_remove_mo, mock_set_mo,
+                                                 mock_commit):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get(faulted=True)
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+    ]
+    boot_policy_order_set(handle, "test", devices, single_transaction=True)
+
+    removed = sorted([call[0][0].dn for call in mock_remove_mo.call_args_list])
+    assert_equal(removed, ["org-root/boot-policy-test/lan/path-secondary",
+                           "org-root/boot-policy-test/read-only-vm"])
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_reconcile_noop(mock_login, mock_query_dn, mock_commit):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    delta = boot_policy_order_reconcile(handle, "test", devices)
+
+    assert_equal(delta, {"added": [], "modified": [], "removed": []})
+    assert_equal(mock_query_dn.call_count, 1)
+    assert_equal(mock_commit.call_count, 0)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_reconcile_fault(mock_login, mock_query_dn, mock_commit):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get(faulted=True)
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    delta = boot_policy_order_reconcile(handle, "test", devices)
+
+    assert_equal(delta, {"added": [], "modified": [], "removed": []})
+    assert_equal(mock_commit.call_count, 0)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_reconcile_unknown(mock_login, mock_query_dn,
+                                      mock_query_classid, mock_remove_mo,
+                                      mock_commit):
+    from ucsmsdk.mometa.lsboot.LsbootStorage import LsbootStorage
+    from ucsmsdk.mometa.lsboot.LsbootLocalStorage import LsbootLocalStorage
+    from ucsmsdk.mometa.lsboot.LsbootNvme import LsbootNvme
+
+    mock_login.return_value = True
+    response = _existing_boot_policy_get()
+    storage = LsbootStorage(parent_mo_or_dn=response.out_config.child[0],
+                            order="3")
+    local_storage = LsbootLocalStorage(parent_mo_or_dn=storage)
+    LsbootNvme(parent_mo_or_dn=local_storage, order="3")
+    mock_query_dn.return_value = response
+    mock_query_classid.return_value = response
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    # the devices this module does not know of do not match, and are
+    # removed as the other unexpected devices
+    assert_equal(boot_policy_order_exists(handle, "test", devices),
+                 (False, None))
+    report = boot_policy_order_audit(handle, {boot_policy_dn: devices})
+    assert_equal(report[boot_policy_dn]["mismatches"], [
+        {"device": None, "reason": "unexpected", "rn": "nvme",
+         "message": "Unknown Device 'LsbootNvme' is not expected."}])
+
+    delta = boot_policy_order_reconcile(handle, "test", devices)
+    assert_equal(delta, {"added": [], "modified": [],
+                         "removed": ["org-root/boot-policy-test/storage"]})
+    assert_equal(mock_commit.call_count, 1)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_reconcile_delta(mock_login, mock_query_dn,
+                                    mock_remove_mo, mock_set_mo, mock_add_mo,
+                                    mock_commit):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "3",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+                {"device_name": "efi",
+                 "device_order": "1",
+                },
+    ]
+    delta = boot_policy_order_reconcile(handle, "test", devices)
+
+    assert_equal(delta, {
+        "added": ["org-root/boot-policy-test/efi-shell"],
+        "modified": ["org-root/boot-policy-test/lan"],
+        "removed": ["org-root/boot-policy-test/lan/path-secondary"]})
+    assert_equal(mock_commit.call_count, 1)
+    modified_mo = mock_set_mo.call_args[0][0]
+    assert_equal(modified_mo.order, "3")
+    assert_equal(len(modified_mo.child), 0)
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_exists_single_query(mock_login, mock_query_dn):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    expected = boot_policy_order_tree_build(devices)
+    assert_equal(len(expected.child), 2)
+
+    exists, boot_policy = boot_policy_order_exists(handle, "test", devices)
+    assert_equal(exists, True)
+    assert_equal(boot_policy.dn, boot_policy_dn)
+    assert_equal(mock_query_dn.call_count, 1)
+
+    devices[2]["device_order"] = "3"
+    exists, boot_policy = boot_policy_order_exists(handle, "test", devices)
+    assert_equal(exists, False)
+    assert_equal(mock_query_dn.call_count, 2)
+
+
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_audit(mock_login, mock_query_classid):
+    mock_login.return_value = True
+    mock_query_classid.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "3",
+                },
+                {"device_name": "efi",
+                 "device_order": "2",
+                },
+    ]
+    expected = boot_policy_order_tree_build(devices)
+    report = boot_policy_order_audit(
+        handle, {boot_policy_dn: expected,
+                 "org-root/boot-policy-absent": devices})
+
+    assert_equal(mock_query_classid.call_count, 1)
+    assert_equal(report["org-root/boot-policy-absent"],
+                 {"match": False,
+                  "mismatches": [{"device": None,
+                                  "reason": "missing",
+                                  "rn": "org-root/boot-policy-absent",
+                                  "message": "BootPolicy 'org-root/"
+                                             "boot-policy-absent' does not "
+                                             "exist"}]})
+    assert_equal(report[boot_policy_dn]["match"], False)
+    assert_equal(report[boot_policy_dn]["mismatches"], [
+        {"device": "cd_dvd", "reason": "mismatch", "rn": "read-only-vm",
+         "message": "_compare_boot_policy failed, error: Order mismatch for "
+                    "device 'cd_dvd'."},
+        {"device": "efi", "reason": "missing", "rn": "efi-shell",
+         "message": "Device 'efi' does not exist."},
+        {"device": "lan", "reason": "mismatch", "rn": "lan",
+         "message": "_compare_boot_policy failed, error: Child count "
+                    "mismatch for 'lan'."}])
+
+
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_audit_single_path(mock_login, mock_query_classid):
+    mock_login.return_value = True
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "embedded_disk",
+                 "device_order": "2",
+                 "type": "primary",
+                 "slot_number": "1"
+                },
+                {"device_name": "san",
+                 "device_order": "3",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "target_type": "primary",
+                 "lun": "0",
+                 "wwn": "20:00:00:00:00:00:00:00"
+                },
+    ]
+    response = Mock()
+    response.out_configs.child = [
+        boot_policy_order_tree_build(devices, name="test")]
+    mock_query_classid.return_value = response
+
+    report = boot_policy_order_audit(handle, {boot_policy_dn: devices})
+    assert_equal(report[boot_policy_dn], {"match": True, "mismatches": []})
+
+    devices[2]["lun"] = "1"
+    report = boot_policy_order_audit(handle, {boot_policy_dn: devices})
+    assert_equal(report[boot_policy_dn]["mismatches"], [
+        {"device": "san", "reason": "mismatch", "rn": "san",
+         "message": "_compare_boot_policy failed, error: Properties "
+                    "mismatch for device 'san'"}])
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_audit_fault(mock_login, mock_query_classid,
+                                mock_query_dn):
+    from ucsmsdk.mometa.lsboot.LsbootVirtualMedia import LsbootVirtualMedia
+
+    mock_login.return_value = True
+    response = _existing_boot_policy_get(faulted=True)
+    bp = LsbootPolicy("org-root", name="unknown")
+    LsbootVirtualMedia(parent_mo_or_dn=bp, access="read-write-remote-cimc",
+                       order="1")
+    bp.child[0]._ManagedObject__set_prop("access", "unknown", forced=True)
+    response.out_configs.child.append(bp)
+    mock_query_classid.return_value = response
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    report = boot_policy_order_audit(
+        handle, {boot_policy_dn: devices,
+                 "org-root/boot-policy-unknown": devices})
+
+    assert_equal(report[boot_policy_dn], {"match": True, "mismatches": []})
+    mock_query_dn.return_value = _existing_boot_policy_get(faulted=True)
+    exists, _ = boot_policy_order_exists(handle, "test", devices)
+    assert_equal(exists, True)
+    assert_equal(report["org-root/boot-policy-unknown"], {
+        "match": False,
+        "mismatches": [{"device": None,
+                        "reason": "unexpected",
+                        "rn": "read-write-remote-cimc-vm",
+                        "message": "Unknown Device 'LsbootVirtualMedia' is "
+                                   "not expected."},
+                       {"device": "cd_dvd",
+                        "reason": "missing",
+                        "rn": "read-only-vm",
+                        "message": "Device 'cd_dvd' does not exist."},
+                       {"device": "lan",
+                        "reason": "missing",
+                        "rn": "lan",
+                        "message": "Device 'lan' does not exist."}]})
+
+
+def test_boot_order_fingerprint():
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    fingerprint = boot_policy_order_fingerprint(devices=devices)
+
+    assert_equal(boot_policy_order_fingerprint(devices=devices[2:] +
+                                               devices[:2]), fingerprint)
+    assert_equal(boot_policy_order_fingerprint(
+        _existing_boot_policy_get().out_config.child[0]), fingerprint)
+
+    devices[2]["device_order"] = "3"
+    assert_equal(boot_policy_order_fingerprint(devices=devices) ==
+                 fingerprint, False)
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_exists_cache(mock_login, mock_query_dn):
+    mock_login.return_value = True
+    mock_query_dn.return_value = _existing_boot_policy_get()
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth1"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "2",
+                },
+    ]
+    cache = BootOrderCache()
+    for i in range(3):
+        exists, boot_policy = boot_policy_order_exists(handle, "test",
+                                                       devices, cache=cache)
+        assert_equal(exists, True)
+    assert_equal(mock_query_dn.call_count, 1)
+    assert_equal((cache.hits, cache.misses), (2, 1))
+
+    cache.invalidate(boot_policy_dn)
+    boot_policy_order_exists(handle, "test", devices, cache=cache)
+    assert_equal(mock_query_dn.call_count, 2)
+
+    faulted = _existing_boot_policy_get(faulted=True)
+    assert_equal(
+        boot_policy_order_fingerprint(faulted.out_config.child[0]),
+        boot_policy_order_fingerprint(devices=devices))
+
+    mock_query_dn.return_value = faulted
+    cache.invalidate()
+    exists, _ = boot_policy_order_exists(handle, "test", devices,
+                                         cache=cache)
+    assert_equal(exists, True)
+
+    from ucsmsdk.mometa.lsboot.LsbootVirtualMedia import LsbootVirtualMedia
+    unknown = LsbootVirtualMedia(parent_mo_or_dn=faulted.out_config.child[0],
+                                 access="read-write-remote-cimc", order="3")
+    unknown._ManagedObject__set_prop("access", "unknown", forced=True)
+    cache.invalidate()
+    assert_equal(boot_policy_order_exists(handle, "test", devices,
+                                          cache=cache), (False, None))
+
+
+_boot_policy_response_xml = (
+    '<configResolveDn dn="org-root/boot-policy-test" cookie="cookie" '
+    'response="yes"><outConfig>'
+    '<lsbootPolicy bootMode="legacy" descr="" '
+    'dn="org-root/boot-policy-test" enforceVnicName="yes" name="test" '
+    'rebootOnUpdate="no">'
+    '<lsbootVirtualMedia access="read-only" lunId="0" mappingName="" '
+    'order="1" rn="read-only-vm" type="virtual-media"/>'
+    '<lsbootLan access="read-only" order="2" prot="pxe" rn="lan" '
+    'type="lan">'
+    '<lsbootLanImagePath bootIpPolicyName="" iSCSIVnicName="" '
+    'imgPolicyName="" imgSecPolicyName="" provSrvPolicyName="" '
+    'rn="path-primary" type="primary" vnicName="eth0">'
+    '<lsbootUEFIBootParam bootDescription="" bootLoaderName="" '
+    'bootLoaderPath="" rn="uefi-boot-param"/>'
+    '</lsbootLanImagePath></lsbootLan>'
+    '<lsbootStorage access="read-write" order="3" rn="storage">'
+    '<lsbootLocalStorage rn="local-storage">'
+    '<lsbootDefaultLocalImage order="3" rn="local-any"/>'
+    '</lsbootLocalStorage></lsbootStorage>'
+    '<lsbootEFIShell access="read-only" order="4" rn="efi-shell" '
+    'type="efi-shell"/>'
+    '<faultInst ack="no" code="F0170" '
+    'dn="org-root/boot-policy-test/fault-F0170" rn="fault-F0170" '
+    'severity="warning"/>'
+    '</lsbootPolicy></outConfig></configResolveDn>')
+
+_boot_policy_response_devices = [
+    {"device_name": "cd_dvd", "device_order": "1"},
+    {"device_name": "lan", "device_order": "2", "vnic_name": "eth0"},
+    {"device_name": "local_disk", "device_order": "3"},
+    {"device_name": "efi", "device_order": "4"},
+]
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_exists_response(mock_login, mock_query_dn):
+    from ucsmsdk.ucsxmlcodec import from_xml_str
+
+    mock_login.return_value = True
+    mock_query_dn.return_value = from_xml_str(_boot_policy_response_xml)
+
+    exists, boot_policy = boot_policy_order_exists(
+        handle, "test", _boot_policy_response_devices)
+    assert_equal(exists, True)
+    assert_equal(boot_policy.dn, boot_policy_dn)
+
+    devices = [dict(device) for device in _boot_policy_response_devices]
+    devices[1]["vnic_name"] = "eth1"
+    assert_equal(boot_policy_order_exists(handle, "test", devices),
+                 (False, None))
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_fingerprint_response(mock_login, mock_query_dn):
+    from ucsmsdk.ucsxmlcodec import from_xml_str
+
+    mock_login.return_value = True
+    mock_query_dn.return_value = from_xml_str(_boot_policy_response_xml)
+
+    boot_policy = mock_query_dn.return_value.out_config.child[0]
+    assert_equal(boot_policy_order_fingerprint(boot_policy),
+                 boot_policy_order_fingerprint(
+                     devices=_boot_policy_response_devices))
+
+    cache = BootOrderCache()
+    for i in range(2):
+        exists, _ = boot_policy_order_exists(
+            handle, "test", _boot_policy_response_devices, cache=cache)
+        assert_equal(exists, True)
+    assert_equal(mock_query_dn.call_count, 1)
+    assert_equal((cache.hits, cache.misses), (1, 1))
+
+
+def test_boot_device_registry():
+    from ucsm_apis.server.boot import _boot_devices, _boot_device_names
+
+    assert_equal(len(_boot_device_names), len(_boot_devices))
+    for device_name, boot_device in _boot_devices.items():
+        assert_equal(_boot_device_names[(boot_device.class_id,
+                                         boot_device.access)], device_name)
+
+    devices = [{"device_name": "nvme", "device_order": "1"}]
+    expected_error_message = "_device_add failed, error:  Invalid Device <nvme>"
+    with assert_raises(UcsOperationError) as error:
+        boot_policy_order_tree_build(devices)
+    assert_equal(error.exception.message, expected_error_message)
+
+
+@patch.object(UcsHandle, 'commit_buffer_discard')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_many(mock_login, mock_query_classid, mock_remove_mo,
+                             mock_set_mo, mock_commit, mock_discard):
+    from ucsmsdk.mometa.lsboot.LsbootLan import LsbootLan
+
+    mock_login.return_value = True
+    response = _existing_boot_policy_get()
+    for org_dn in ["org-root/org-a", "org-root/org-b"]:
+        bp = LsbootPolicy(org_dn, name="test")
+        LsbootLan(parent_mo_or_dn=bp, order="1", prot="pxe")
+        response.out_configs.child.append(bp)
+    mock_query_classid.return_value = response
+    mock_commit.side_effect = [None, Exception("commit failed")]
+
+    devices = [
+                {"device_name": "cd_dvd",
+                 "device_order": "1",
+                },
+                {"device_name": "efi",
+                 "device_order": "2",
+                },
+    ]
+    names_by_org = {"org-root": "test",
+                    "org-root/org-a": "test",
+                    "org-root/org-b": "test",
+                    "org-root/org-c": "test"}
+    ret = boot_policy_order_set_many(handle, names_by_org, devices,
+                                     chunk_size=2)
+
+    results = ret["results"]
+    assert_equal(mock_query_classid.call_count, 1)
+    assert_equal(mock_commit.call_count, 2)
+    assert_equal(mock_discard.call_count, 1)
+    assert_equal(results["org-root"], None)
+    assert_equal(results["org-root/org-a"], None)
+    assert_equal(str(results["org-root/org-b"]), "commit failed")
+    assert_equal(results["org-root/org-c"].message,
+                 "boot_policy_order_set_many failed, error: BootPolicy "
+                 "'org-root/org-c/boot-policy-test' does not exist")
+
+    staged = [call[0][0] for call in mock_set_mo.call_args_list]
+    assert_equal([mo.dn for mo in staged],
+                 ["org-root/boot-policy-test",
+                  "org-root/org-a/boot-policy-test",
+                  "org-root/org-b/boot-policy-test"])
+    assert_equal(sorted(mo.dn for mo in staged[1].child),
+                 ["org-root/org-a/boot-policy-test/efi-shell",
+                  "org-root/org-a/boot-policy-test/read-only-vm"])
+    assert_equal(mock_remove_mo.call_count, 3)
+
+
+@patch.object(UcsHandle, 'commit_buffer_discard')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_many_split(mock_login, mock_query_classid,
+                                   mock_remove_mo, mock_set_mo, mock_commit,
+                                   mock_discard):
+    mock_login.return_value = True
+    response = Mock()
+    response.out_configs.child = [
+        LsbootPolicy("org-root/org-%s" % org, name="test")
+        for org in "abcd"]
+    mock_query_classid.return_value = response
+
+    staged = []
+    mock_set_mo.side_effect = staged.append
+
+    def discard():
+        del staged[:]
+
+    def commit():
+        dns = [mo.dn for mo in staged]
+        discard()
+        if "org-root/org-c/boot-policy-test" in dns:
+            raise Exception("commit failed")
+    mock_commit.side_effect = commit
+    mock_discard.side_effect = discard
+
+    devices = [{"device_name": "efi", "device_order": "1"}]
+    names_by_org = dict(("org-root/org-%s" % org, "test") for org in "abcd")
+    ret = boot_policy_order_set_many(handle, names_by_org, devices)
+
+    results = ret["results"]
+    assert_equal(mock_commit.call_count, 5)
+    assert_equal(str(results.pop("org-root/org-c")), "commit failed")
+    assert_equal(results.values(), [None] * 3)
+
+
+@patch.object(UcsHandle, 'commit_buffer_discard')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'remove_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_many_split_remove(mock_login, mock_query_classid,
+                                          mock_remove_mo, mock_set_mo,
+                                          mock_commit, mock_discard):
+    from ucsmsdk.mometa.lsboot.LsbootLan import LsbootLan
+    from ucsmsdk.mometa.lsboot.LsbootLanImagePath import LsbootLanImagePath
+
+    mock_login.return_value = True
+    response = Mock()
+    response.out_configs.child = []
+    for org in "abcd":
+        bp = LsbootPolicy("org-root/org-%s" % org, name="test")
+        lan = LsbootLan(parent_mo_or_dn=bp, order="1", prot="pxe")
+        LsbootLanImagePath(parent_mo_or_dn=lan, type="primary",
+                           vnic_name="eth0")
+        response.out_configs.child.append(bp)
+    mock_query_classid.return_value = response
+
+    staged = []
+    committed = []
+    mock_set_mo.side_effect = lambda mo: staged.append(("set", mo.dn))
+
+    def remove_mo(mo):
+        # detaches the object from its parent as UcsHandle.remove_mo does
+        if mo.parent_mo:
+            mo.parent_mo.child_remove(mo)
+        staged.append(("remove", mo.dn))
+    mock_remove_mo.side_effect = remove_mo
+
+    def discard():
+        del staged[:]
+
+    def commit():
+        dns = list(staged)
+        discard()
+        if ("set", "org-root/org-c/boot-policy-test") in dns:
+            raise Exception("commit failed")
+        committed.extend(dns)
+    mock_commit.side_effect = commit
+    mock_discard.side_effect = discard
+
+    devices = [{"device_name": "efi", "device_order": "1"}]
+    names_by_org = dict(("org-root/org-%s" % org, "test") for org in "abcd")
+    ret = boot_policy_order_set_many(handle, names_by_org, devices)
+
+    assert_equal(mock_commit.call_count, 5)
+    assert_equal(str(ret["results"]["org-root/org-c"]), "commit failed")
+    # the removals are staged again on every retry of the split chunks
+    assert_equal(mock_remove_mo.call_count, 4 + 2 + 2 + 1 + 1)
+    assert_equal(sorted(committed), [
+        ("remove", "org-root/org-%s/boot-policy-test/lan" % org)
+        for org in "abd"] + [
+        ("set", "org-root/org-%s/boot-policy-test" % org) for org in "abd"])
+    # the queried boot policies are left intact
+    for bp in response.out_configs.child:
+        assert_equal([mo.rn for mo in bp.child], ["lan"])
+        assert_equal(bp.child[0].status, None)
+
+
+def test_boot_devices_validate():
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "san",
+                 "device_order": "2",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "target_type": "primary",
+                 "wwn": "20:00:00:25:B5:00:00:01",
+                 "lun": "0"
+                },
+                {"device_name": "san",
+                 "device_order": "2",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "target_type": "secondary",
+                 "wwn": "20:00:00:25:B5:00:00:02",
+                 "lun": "0"
+                },
+                {"device_name": "local_lun",
+                 "device_order": 3,
+                 "type": "primary",
+                 "lun_name": "boot"
+                },
+    ]
+    assert_equal(boot_devices_validate(devices), [])
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                },
+                {"device_name": "san",
+                 "device_order": "2",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "target_type": "primary",
+                 "wwn": "20:00:00:25:B5:00:00:01",
+                 "lun": "0"
+                },
+                {"device_name": "san",
+                 "device_order": "2",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "target_type": "primary",
+                 "wwn": "20:00:00:25:B5:00:00:02",
+                 "lun": "0"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "17",
+                },
+                {"device_name": "cd_dvd_local",
+                 "device_order": "4",
+                },
+                {"device_name": "nvme",
+                 "device_order": "5",
+                },
+    ]
+    assert_equal(boot_devices_validate(devices), [
+        "devices[0] 'lan': _device_add failed, error: Required Parameter "
+        "'vnic_name' missing.",
+        "devices[2] 'san': _device_add failed, error: Device 'san' already "
+        "exist at order '2'",
+        "devices[3] 'cd_dvd': _device_add failed, error: Invalid "
+        "device_order '17', valid values are 1-16.",
+        "devices[5] 'nvme': _device_add failed, error:  Invalid Device <nvme>",
+    ])
+
+    devices[3]["device_order"] = "3"
+    errors = boot_devices_validate_many({"a": devices[3:5], "b": devices[4:5]})
+    assert_equal(errors, {"a": ["_device_add failed, error: 'cd_dvd' or "
+                                "'cd_dvd_local, cd_dvd_remote'"]})
+
+    # a local_lun without type after a typed one
+    devices = [
+                {"device_name": "local_lun",
+                 "device_order": "1",
+                 "type": "primary",
+                 "lun_name": "boot"
+                },
+                {"device_name": "local_lun",
+                 "device_order": "2",
+                },
+    ]
+    assert_equal(boot_devices_validate(devices), [
+        "devices[1] 'local_lun': _device_add failed, error: Device "
+        "'local_lun' already exist at order '1'"])
+
+    # unknown and partial properties are reported, not raised
+    devices = [
+                {"device_name": "local_disk",
+                 "device_order": 1,
+                 "slot": 2
+                },
+                {"device_name": "efi",
+                 "device_order": "2",
+                 "access": "read-write"
+                },
+                {"device_name": "lan",
+                 "device_order": "3",
+                 "vnic_name": "eth0",
+                 "type": "primary"
+                },
+                {"device_name": "san",
+                 "device_order": "4",
+                 "vnic_name": "fc0",
+                 "type": "primary",
+                 "wwn": "20:00:00:25:B5:00:00:01"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "5",
+                 "vnic_name": "eth0"
+                },
+    ]
+    assert_equal(boot_devices_validate(devices), [
+        "devices[0] 'local_disk': _device_add failed, error: Invalid "
+        "property 'slot' for device 'local_disk'.",
+        "devices[1] 'efi': _device_add failed, error: Invalid property "
+        "'access' for device 'efi'.",
+        "devices[2] 'lan': _device_add failed, error: Invalid property "
+        "'type' for device 'lan'.",
+        "devices[3] 'san': _device_add failed, error: Required Parameter "
+        "'target_type' or 'wwn' or 'lun' missing.",
+    ])
+
+    # as in boot_policy_order_set, the virtual media ignore the properties
+    boot_policy = boot_policy_order_tree_build(devices[4:])
+    assert_equal(boot_policy.child[0].access, "read-only")
+
+
+@patch('ucsm_apis.server.boot._boot_policy_order_clear')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_boot_order_set_invalid_no_clear(mock_login, mock_query_dn,
+                                         mock_order_clear):
+    mock_login.return_value = True
+    mock_query_dn.return_value = LsbootPolicy("org-root", name="test")
+
+    devices = [
+                {"device_name": "lan",
+                 "device_order": "1",
+                 "vnic_name": "eth0"
+                },
+                {"device_name": "cd_dvd",
+                 "device_order": "17",
+                },
+    ]
+    with assert_raises(UcsOperationError):
+        boot_policy_order_set(handle, "test", devices)
+    assert_equal(mock_order_clear.call_count, 0)
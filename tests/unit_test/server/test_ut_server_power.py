@@ -96,3 +96,438 @@ def test_power_on_chassis1_blade1_pass(mock_login, mock_query_dn, mock_commit):
     mock_commit.return_value = None
 
     assert server_power_on(handle, chassis_id=1, blade_id=1) is None
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_power_set_bulk_partial(mock_login, mock_query_dns, mock_commit):
+    from ucsm_apis.server.power import server_power_set_bulk
+
+    mock_login.return_value = True
+
+    assigned = Mock()
+    assigned.assigned_to_dn = "org-root/ls-sp1"
+    unassigned = Mock()
+    unassigned.assigned_to_dn = ""
+
+    mock_query_dns.return_value = {
+        "sys/chassis-1/blade-1": assigned,
+        "sys/chassis-1/blade-2": unassigned,
+        "sys/rack-unit-1": None,
+    }
+    mock_commit.return_value = None
+
+    servers = [{"chassis_id": 1, "blade_id": 1},
+               {"chassis_id": 1, "blade_id": 2},
+               {"rack_id": 1}]
+    results = server_power_set_bulk(handle, servers, state="up")
+
+    assert_equal(mock_query_dns.call_count, 1)
+    assert_equal(mock_commit.call_count, 1)
+    assert results["sys/chassis-1/blade-1"] is None
+    assert isinstance(results["sys/chassis-1/blade-2"], UcsOperationError)
+    assert isinstance(results["sys/rack-unit-1"], UcsOperationError)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_power_set_bulk_chunks(mock_login, mock_query_dns, mock_commit):
+    from ucsm_apis.server.power import server_power_set_bulk
+
+    mock_login.return_value = True
+
+    server_mos = {}
+    for blade_id in range(1, 6):
+        mo = Mock()
+        mo.assigned_to_dn = "org-root/ls-sp%d" % blade_id
+        server_mos["sys/chassis-1/blade-%d" % blade_id] = mo
+    mock_query_dns.return_value = server_mos
+    mock_commit.side_effect = [None, Exception("commit failed"), None]
+
+    servers = [{"chassis_id": 1, "blade_id": blade_id}
+               for blade_id in range(1, 6)]
+    results = server_power_set_bulk(handle, servers, state="down",
+                                    chunk_size=2)
+
+    assert_equal(mock_commit.call_count, 3)
+    assert results["sys/chassis-1/blade-1"] is None
+    assert results["sys/chassis-1/blade-3"] is not None
+    assert results["sys/chassis-1/blade-4"] is not None
+    assert results["sys/chassis-1/blade-5"] is None
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'query_classids')
+@patch.object(UcsHandle, 'login')
+def test_power_on_resolver(mock_login, mock_query_classids, mock_query_dn,
+                           mock_commit):
+    from ucsm_apis.server.resolver import ServerResolver
+
+    mock_login.return_value = True
+
+    blade = Mock()
+    blade.dn = "sys/chassis-1/blade-1"
+    blade.assigned_to_dn = "org-root/ls-testsp"
+    mock_query_classids.return_value = {"ComputeBlade": [blade],
+                                        "ComputeRackUnit": []}
+    mock_commit.return_value = None
+
+    resolver = ServerResolver(handle)
+    server_power_on(handle, chassis_id=1, blade_id=1, resolver=resolver)
+    server_power_on(handle, chassis_id=1, blade_id=1, resolver=resolver)
+
+    with assert_raises(UcsOperationError):
+        server_power_on(handle, chassis_id=1, blade_id=2, resolver=resolver)
+
+    assert_equal(mock_query_classids.call_count, 1)
+    assert_equal(mock_query_dn.call_count, 0)
+    assert_equal(resolver.hits, 2)
+    assert_equal(resolver.misses, 1)
+
+
+@patch('ucsm_apis.server.resolver.time')
+@patch.object(UcsHandle, 'query_classids')
+@patch.object(UcsHandle, 'login')
+def test_resolver_ttl(mock_login, mock_query_classids, mock_time):
+    from ucsm_apis.server.resolver import ServerResolver
+
+    mock_login.return_value = True
+    mock_query_classids.return_value = {"ComputeBlade": [],
+                                        "ComputeRackUnit": []}
+
+    resolver = ServerResolver(handle, ttl=30)
+    mock_time.time.return_value = 100
+    resolver.server_get("sys/rack-unit-1")
+    mock_time.time.return_value = 120
+    resolver.server_get("sys/rack-unit-1")
+    assert_equal(mock_query_classids.call_count, 1)
+
+    mock_time.time.return_value = 131
+    resolver.server_get("sys/rack-unit-1")
+    assert_equal(mock_query_classids.call_count, 2)
+
+    resolver.refresh()
+    assert_equal(resolver.refresh_count, 3)
+
+
+@patch('ucsm_apis.server.power.time')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_power_on_staggered(mock_login, mock_query_dns, mock_commit,
+                            mock_time):
+    from ucsm_apis.server.power import server_power_on_staggered
+
+    mock_login.return_value = True
+    mock_time.time.return_value = 0
+    mock_commit.return_value = None
+
+    server_mos = {}
+    for chassis_id in (1, 2):
+        for blade_id in (1, 2, 3):
+            mo = Mock()
+            mo.assigned_to_dn = "org-root/ls-sp%d%d" % (chassis_id, blade_id)
+            mo.oper_power = "on"
+            server_mos["sys/chassis-%d/blade-%d" % (chassis_id, blade_id)] = mo
+    mock_query_dns.side_effect = lambda dns: dict(
+        (dn, server_mos.get(dn)) for dn in dns)
+
+    progress = []
+    servers = [{"chassis_id": chassis_id, "blade_id": blade_id}
+               for chassis_id in (1, 2) for blade_id in (1, 2, 3)]
+    report = server_power_on_staggered(
+        handle, servers, max_per_chassis=None, watts_per_chassis=1000,
+        watts_per_server=500,
+        callback=lambda done, total, elapsed: progress.append(done))
+
+    assert_equal(report["waves"], 2)
+    assert_equal(mock_commit.call_count, 2)
+    assert_equal(len(report["results"]), 6)
+    assert all([err is None for err in report["results"].values()])
+    assert_equal(progress, [4, 6])
+
+
+@patch('ucsm_apis.server.power.time')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_power_on_staggered_timeout(mock_login, mock_query_dns, mock_commit,
+                                    mock_time):
+    from ucsm_apis.server.power import server_power_on_staggered
+
+    mock_login.return_value = True
+    mock_time.time.side_effect = [0, 0, 10, 20, 20]
+    mock_commit.return_value = None
+
+    server_mo = Mock()
+    server_mo.assigned_to_dn = "org-root/ls-sp1"
+    server_mo.oper_power = "off"
+    mock_query_dns.return_value = {"sys/chassis-1/blade-1": server_mo,
+                                   "sys/chassis-1/blade-2": server_mo}
+
+    servers = [{"chassis_id": 1, "blade_id": 1},
+               {"chassis_id": 1, "blade_id": 2}]
+    report = server_power_on_staggered(handle, servers, timeout=15)
+
+    assert_equal(report["waves"], 1)
+    for dn in ("sys/chassis-1/blade-1", "sys/chassis-1/blade-2"):
+        assert isinstance(report["results"][dn], UcsOperationError)
+
+
+def _server_mo_get(dn, **kwargs):
+    from ucsmsdk.mometa.compute.ComputeBlade import ComputeBlade
+    from ucsmsdk.mometa.compute.ComputeRackUnit import ComputeRackUnit
+    from ucsmsdk.mometa.ls.LsServer import LsServer
+
+    parent_dn, rn = dn.rsplit("/", 1)
+    if rn.startswith("blade-"):
+        mo = ComputeBlade(parent_dn, slot_id=rn[len("blade-"):])
+    elif rn.startswith("rack-unit-"):
+        mo = ComputeRackUnit(parent_dn, id=rn[len("rack-unit-"):])
+    else:
+        mo = LsServer(parent_dn, name=rn[len("ls-"):])
+    # most of the server properties are read-only
+    for prop, value in kwargs.items():
+        mo._ManagedObject__set_prop(prop, value, forced=True)
+    return mo
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'login')
+def test_power_cycle_immediate_wait_poll(mock_login, mock_query_dn,
+                                         mock_query_dns, mock_set_mo,
+                                         mock_commit):
+    from ucsm_apis.server.power import server_power_cycle_immediate
+    from ucsm_apis.utils.watcher import MoWatcher
+
+    mock_login.return_value = True
+    dn = "sys/rack-unit-1"
+    mock_query_dn.return_value = Mock(fsm_stamp="2017-01-01T00:00:00")
+    # the cycle has not started yet on the first read, which looks the
+    # same as a completed cycle
+    mock_query_dns.side_effect = [
+        {dn: _server_mo_get(dn, admin_power="policy", oper_power="on",
+                            fsm_status="nop",
+                            fsm_stamp="2017-01-01T00:00:00")},
+        {dn: _server_mo_get(dn, admin_power="policy", oper_power="off",
+                            fsm_status="nop",
+                            fsm_stamp="2017-01-01T00:00:00")},
+        {dn: _server_mo_get(dn, admin_power="policy", oper_power="on",
+                            fsm_status="nop",
+                            fsm_stamp="2017-01-01T00:00:00")},
+    ]
+
+    watcher = MoWatcher(handle, ["ComputeRackUnit"], poll_sec=0.01)
+    server_power_cycle_immediate(handle, rack_id=1, wait=True, timeout=5,
+                                 watcher=watcher)
+    assert_equal(mock_query_dns.call_count, 3)
+
+
+def test_power_cycle_check():
+    from ucsm_apis.server.power import _power_cycle_check
+
+    idle = {"admin_power": "policy", "oper_power": "on",
+            "fsm_status": "nop", "fsm_stamp": "2017-01-01T00:00:00"}
+    check = _power_cycle_check("2017-01-01T00:00:00")
+    assert_equal(check(dict(idle)), None)
+    assert_equal(check(dict(idle, fsm_status="PowerCycleExecute")), None)
+    assert_equal(check(dict(idle)), True)
+
+    # the cycle completed before the first read
+    check = _power_cycle_check("2017-01-01T00:00:00")
+    assert_equal(check(dict(idle, fsm_stamp="2017-01-01T00:01:00")), True)
+
+    check = _power_cycle_check("2017-01-01T00:00:00")
+    assert_equal(check(dict(idle, oper_power="failed")), False)
+
+
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_watcher_wait_unwatched(mock_login, mock_query_dns):
+    import threading
+    from ucsm_apis.utils.watcher import MoWatcher
+
+    mock_login.return_value = True
+    dn = "sys/rack-unit-1"
+    mock_query_dns.return_value = {}
+
+    watcher = MoWatcher(handle, ["ComputeRackUnit"], poll_sec=0.01)
+    watcher.watch(dn, lambda props: None)
+    threading.Timer(0.05, watcher.unwatch, [dn]).start()
+    assert_equal(watcher.wait([dn], timeout=5), {dn: None})
+
+
+@patch('ucsm_apis.utils.watcher.UcsEventHandle')
+def test_watcher_start_concurrent(mock_event_handle):
+    import threading
+    import time
+    from ucsm_apis.utils.watcher import MoWatcher
+
+    def add(class_id, call_back):
+        # leaves time for the other threads to check the subscription
+        time.sleep(0.01)
+        return Mock()
+    mock_event_handle.return_value.add.side_effect = add
+
+    watcher = MoWatcher(handle, ["ComputeBlade", "ComputeRackUnit"])
+    threads = [threading.Thread(target=watcher.start) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert_equal(mock_event_handle.call_count, 1)
+    assert_equal(mock_event_handle.return_value.add.call_count, 2)
+
+    watcher.stop()
+    assert_equal(mock_event_handle.return_value.remove.call_count, 2)
+
+
+@patch('ucsm_apis.utils.watcher.UcsEventHandle')
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_power_set_bulk_wait_event(mock_login, mock_query_dns, mock_add_mo,
+                                   mock_commit, mock_event_handle):
+    import threading
+    from ucsm_apis.server.power import server_power_set_bulk
+
+    mock_login.return_value = True
+    dns = ["sys/chassis-1/blade-1", "sys/chassis-1/blade-2"]
+    server_mos = dict((dn, _server_mo_get(dn, assigned_to_dn="org-root/ls-x",
+                                          oper_power="off"))
+                      for dn in dns)
+    mock_query_dns.return_value = server_mos
+
+    callbacks = []
+    event_handle = mock_event_handle.return_value
+
+    def _add(class_id=None, call_back=None):
+        callbacks.append(call_back)
+        if len(callbacks) == 2:
+            # blade-1 powers on through an event, blade-2 never does
+            mce = Mock()
+            mce.mo = _server_mo_get(dns[0], oper_power="on")
+            mce.change_list = ["operPower"]
+            threading.Timer(0.05, call_back, [mce]).start()
+        return Mock()
+    event_handle.add.side_effect = _add
+
+    servers = [{"chassis_id": 1, "blade_id": 1},
+               {"chassis_id": 1, "blade_id": 2}]
+    results = server_power_set_bulk(handle, servers, state="up", wait=True,
+                                    timeout=0.5)
+
+    assert_equal(len(callbacks), 2)
+    assert_equal(mock_query_dns.call_count, 2)
+    assert results[dns[0]] is None
+    assert isinstance(results[dns[1]], UcsOperationError)
+    assert_equal(event_handle.remove.call_count, 2)
+
+
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'query_classids')
+@patch.object(UcsHandle, 'login')
+def test_power_state_get_all(mock_login, mock_query_classids,
+                             mock_query_classid):
+    from ucsm_apis.server.power import server_power_state_get_all
+
+    mock_login.return_value = True
+
+    blade = _server_mo_get("sys/chassis-1/blade-2", chassis_id="1",
+                           slot_id="2", oper_power="on", admin_power="policy",
+                           assigned_to_dn="org-root/ls-sp1")
+    rack = _server_mo_get("sys/rack-unit-3", id="3", oper_power="off",
+                          admin_power="policy", assigned_to_dn="")
+    mock_query_classids.return_value = {"ComputeBlade": [blade],
+                                        "ComputeRackUnit": [rack]}
+
+    states = server_power_state_get_all(handle)
+    assert_equal(mock_query_classids.call_count, 1)
+    assert_equal(states[0], ("sys/chassis-1/blade-2", "1", "2", "on",
+                             "policy", "org-root/ls-sp1"))
+    assert_equal(states[1].slot_id, "3")
+    assert states[1].chassis_id is None
+    assert states[1].assigned_to_dn is None
+
+    mock_query_classid.side_effect = [[blade], []]
+    states = server_power_state_get_all(
+        handle, filter_str='(oper_power, "on", type="eq")')
+    assert_equal(mock_query_classid.call_count, 2)
+    assert_equal([state.dn for state in states], ["sys/chassis-1/blade-2"])
+
+
+@patch.object(UcsHandle, 'login')
+def test_power_set_scope_invalid(mock_login):
+    from ucsm_apis.server.power import server_power_set_scope
+
+    mock_login.return_value = True
+
+    expected_error_message = "server_power_set_scope: Failed to set power "\
+        "state failed, error: Specify exactly one of chassis_id, pool_dn or "\
+        "org_dn"
+    with assert_raises(UcsOperationError) as error:
+        server_power_set_scope(handle, state="down", chassis_id=1,
+                               org_dn="org-root")
+    assert_equal(error.exception.message, expected_error_message)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_power_set_scope_chassis(mock_login, mock_query_classid,
+                                 mock_query_dns, mock_add_mo, mock_commit):
+    from ucsm_apis.server.power import server_power_set_scope
+
+    mock_login.return_value = True
+    mock_query_classid.return_value = [
+        _server_mo_get("sys/chassis-3/blade-%d" % slot_id, chassis_id="3",
+                       slot_id=str(slot_id),
+                       assigned_to_dn="org-root/ls-sp%d" % slot_id)
+        for slot_id in range(1, 9)]
+
+    results = server_power_set_scope(handle, state="down", chassis_id=3,
+                                     chunk_size=4)
+
+    assert_equal(mock_query_classid.call_count, 1)
+    assert_equal(mock_query_dns.call_count, 0)
+    assert_equal(mock_add_mo.call_count, 8)
+    assert_equal(mock_commit.call_count, 2)
+    assert_equal(sorted(results.keys()),
+                 ["sys/chassis-3/blade-%d" % slot_id
+                  for slot_id in range(1, 9)])
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_power_set_scope_org(mock_login, mock_query_classid, mock_query_dns,
+                             mock_commit):
+    from ucsm_apis.server.power import server_power_set_scope
+
+    mock_login.return_value = True
+    mock_query_classid.return_value = [
+        _server_mo_get("org-root/org-hpc/ls-sp1", type="instance",
+                       pn_dn="sys/rack-unit-1"),
+        _server_mo_get("org-root/org-hpc/ls-t1", type="updating-template",
+                       pn_dn=""),
+        _server_mo_get("org-root/org-hpc/ls-sp2", type="instance",
+                       pn_dn=""),
+    ]
+    mock_query_dns.return_value = {
+        "sys/rack-unit-1": _server_mo_get(
+            "sys/rack-unit-1", assigned_to_dn="org-root/org-hpc/ls-sp1")}
+
+    results = server_power_set_scope(handle, state="up",
+                                     org_dn="org-root/org-hpc")
+    assert_equal(results, {"sys/rack-unit-1": None})
+    assert_equal(mock_commit.call_count, 1)
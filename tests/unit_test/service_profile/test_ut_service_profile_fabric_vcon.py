@@ -0,0 +1,62 @@
+from mock import patch
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.mometa.fabric.FabricVCon import FabricVCon
+from ucsmsdk.mometa.vnic.VnicEther import VnicEther
+
+from ucsm_apis.service_profile.fabric_vcon import \
+    fabric_vcon_placement_set_many
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_fabric_vcon_placement_set_many(mock_login, mock_query_dns,
+                                        mock_add_mo, mock_set_mo,
+                                        mock_commit):
+    mock_login.return_value = True
+    ls_server_dns = ["org-root/ls-sp1", "org-root/ls-sp2", "org-root/ls-sp3"]
+    mos = [
+        # sp1 has no vcon-1 yet and eth0 on the wrong vcon
+        VnicEther("org-root/ls-sp1", name="eth0", admin_vcon="2",
+                  order="1"),
+        # sp2 already matches
+        FabricVCon("org-root/ls-sp2", id="1", fabric="A"),
+        VnicEther("org-root/ls-sp2", name="eth0", admin_vcon="1",
+                  order="1"),
+        # sp3 has no eth0
+        FabricVCon("org-root/ls-sp3", id="1", fabric="A"),
+    ]
+    mos_by_dn = dict((mo.dn, mo) for mo in mos)
+
+    def query_dns(dns):
+        return dict((dn, mos_by_dn.get(dn)) for dn in dns)
+    mock_query_dns.side_effect = query_dns
+
+    ret = fabric_vcon_placement_set_many(
+        handle, ls_server_dns, vcons={1: {"fabric": "A"}},
+        vnic_ethers={"eth0": {"admin_vcon": 1, "order": 1}},
+        chunk_size=2)
+
+    assert_equal(ret["skipped"], ["org-root/ls-sp2"])
+    assert_equal(ret["results"]["org-root/ls-sp1"], None)
+    assert_equal(ret["results"]["org-root/ls-sp3"].message,
+                 "fabric_vcon_placement_set_many failed, error: VnicEther "
+                 "'org-root/ls-sp3/ether-eth0' does not exist")
+    assert_equal(ret["changes"],
+                 {"org-root/ls-sp1/vcon-1": {"fabric": (None, "A")},
+                  "org-root/ls-sp1/ether-eth0": {"admin_vcon": ("2", 1)}})
+    assert_equal(ret["commits"], 1)
+
+    # only the dns of the plan are queried, chunk_size service profiles
+    # at a time
+    assert_equal(mock_query_dns.call_count, 2)
+    assert_equal(sorted(mock_query_dns.call_args_list[1][0][0]),
+                 ["org-root/ls-sp3/ether-eth0", "org-root/ls-sp3/vcon-1"])
+    assert_equal(mock_add_mo.call_args[0][0].dn, "org-root/ls-sp1/vcon-1")
+    assert_equal(mock_set_mo.call_args[0][0].admin_vcon, "1")
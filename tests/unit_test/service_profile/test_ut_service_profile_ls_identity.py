@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.mometa.ls.LsServer import LsServer
+from ucsmsdk.mometa.vnic.VnicEther import VnicEther
+from ucsmsdk.mometa.vnic.VnicFc import VnicFc
+
+from ucsm_apis.service_profile.ls_identity import LsIdentityIndex
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+uuid = "11111111-2222-3333-4444-555555555555"
+
+
+def _class_mos_get():
+    ls_server = LsServer("org-root", name="sp1")
+    ls_server._ManagedObject__set_prop("uuid", uuid, forced=True)
+    return {
+        "LsServer": [ls_server],
+        "VnicEther": [
+            VnicEther("org-root/ls-sp1", name="eth0",
+                      addr="00:25:b5:00:00:1f"),
+            VnicEther("org-root/ls-sp1", name="eth1", addr="derived"),
+            VnicEther("org-root/lan-conn-pol-lcp", name="eth0",
+                      addr="00:25:B5:00:00:2F"),
+        ],
+        "VnicFc": [
+            VnicFc("org-root/ls-sp1", name="fc0",
+                   addr="20:00:00:25:B5:00:00:1F"),
+        ],
+    }
+
+
+@patch.object(UcsHandle, 'query_dn')
+@patch.object(UcsHandle, 'query_classids')
+@patch.object(UcsHandle, 'login')
+def test_ls_identity_index(mock_login, mock_query_classids, mock_query_dn):
+    mock_login.return_value = True
+    mock_query_classids.return_value = _class_mos_get()
+
+    index = LsIdentityIndex(handle)
+    assert_equal(index.mac_get("00:25:B5:00:00:1F"),
+                 ("org-root/ls-sp1", "org-root/ls-sp1/ether-eth0"))
+    assert_equal(index.mac_get("00:25:B5:00:00:2F"), None)
+    assert_equal(index.wwpn_get("20:00:00:25:b5:00:00:1f"),
+                 ("org-root/ls-sp1", "org-root/ls-sp1/fc-fc0"))
+    assert_equal(index.uuid_get(uuid),
+                 ("org-root/ls-sp1", "org-root/ls-sp1"))
+    assert_equal(mock_query_classids.call_count, 1)
+
+    # eth0 got a new address, the other identities of sp1 are gone
+    mock_query_dn.return_value = [
+        LsServer("org-root", name="sp1"),
+        VnicEther("org-root/ls-sp1", name="eth0", addr="00:25:B5:00:00:3F"),
+    ]
+    index.ls_server_refresh("org-root/ls-sp1")
+    assert_equal(index.mac_get("00:25:B5:00:00:1F"), None)
+    assert_equal(index.mac_get("00:25:B5:00:00:3F"),
+                 ("org-root/ls-sp1", "org-root/ls-sp1/ether-eth0"))
+    assert_equal(index.wwpn_get("20:00:00:25:B5:00:00:1F"), None)
+    assert_equal(mock_query_classids.call_count, 1)
+
+
+@patch.object(UcsHandle, 'query_classids')
+@patch.object(UcsHandle, 'login')
+def test_ls_identity_index_cache(mock_login, mock_query_classids):
+    mock_login.return_value = True
+    mock_query_classids.return_value = _class_mos_get()
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(cache_dir, "identity.json")
+        index = LsIdentityIndex(handle, ttl=3600, cache_path=cache_path)
+        index.refresh()
+        assert_equal(mock_query_classids.call_count, 1)
+
+        # a new index is served from the cache without a query
+        index = LsIdentityIndex(handle, ttl=3600, cache_path=cache_path)
+        assert_equal(index.is_stale(), False)
+        assert_equal(tuple(index.mac_get("00:25:B5:00:00:1F")),
+                     ("org-root/ls-sp1", "org-root/ls-sp1/ether-eth0"))
+        assert_equal(mock_query_classids.call_count, 1)
+
+        index.ttl = 0
+        assert_equal(index.is_stale(), True)
+    finally:
+        shutil.rmtree(cache_dir)
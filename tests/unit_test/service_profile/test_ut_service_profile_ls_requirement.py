@@ -0,0 +1,83 @@
+from mock import patch
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.mometa.ls.LsServer import LsServer
+
+from ucsm_apis.service_profile.ls_requirement import _percentiles_get
+from ucsm_apis.service_profile.ls_requirement import ls_requirement_bind_many
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+def _ls_server_mo_get(dn, **kwargs):
+    parent_dn, rn = dn.rsplit("/", 1)
+    mo = LsServer(parent_mo_or_dn=parent_dn, name=rn[len("ls-"):])
+    # the association properties are read-only
+    for prop, value in kwargs.items():
+        mo._ManagedObject__set_prop(prop, value, forced=True)
+    return mo
+
+
+def test_percentiles_get():
+    assert_equal(_percentiles_get([]), {})
+    assert_equal(_percentiles_get(range(1, 101)),
+                 {"p50": 50, "p90": 90, "p99": 99, "max": 100})
+    assert_equal(_percentiles_get([3, 1, 2]),
+                 {"p50": 2, "p90": 3, "p99": 3, "max": 3})
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_ls_requirement_bind_many(mock_login, mock_query_dns, mock_add_mo,
+                                  mock_commit):
+    mock_login.return_value = True
+    sp1, sp2, sp3 = "org-root/ls-sp1", "org-root/ls-sp2", "org-root/ls-sp3"
+    associated = dict(assoc_state="associated", config_state="applied")
+    states = [
+        # before the commit
+        {sp1: _ls_server_mo_get(sp1, pn_dn="sys/chassis-1/blade-1",
+                                **associated),
+         sp2: _ls_server_mo_get(sp2, assoc_state="unassociated",
+                                config_state="not-applied"),
+         sp3: _ls_server_mo_get(sp3, pn_dn="sys/chassis-1/blade-3",
+                                **associated)},
+        {sp1: _ls_server_mo_get(sp1, pn_dn="sys/chassis-1/blade-1",
+                                **associated),
+         sp2: _ls_server_mo_get(sp2, assoc_state="associating",
+                                config_state="applying")},
+        {sp1: _ls_server_mo_get(sp1, assoc_state="associating",
+                                config_state="applying"),
+         sp2: _ls_server_mo_get(sp2, assoc_state="failed",
+                                config_state="failed-to-apply")},
+        {sp1: _ls_server_mo_get(sp1, pn_dn="sys/chassis-1/blade-2",
+                                **associated)},
+    ]
+
+    def query_dns(dns):
+        state = states[min(mock_query_dns.call_count, len(states)) - 1]
+        # sp3 stays associated to the same server
+        state[sp3] = states[0][sp3]
+        return dict((dn, state.get(dn)) for dn in dns)
+    mock_query_dns.side_effect = query_dns
+
+    ret = ls_requirement_bind_many(handle, [sp1, sp2, sp3], name="rack-12",
+                                   timeout=0.5, poll_sec=0.01)
+    assert_equal(ret["results"][sp1], None)
+    assert_equal(ret["results"][sp2].message,
+                 "ls_requirement_bind_many failed, error: LsServer "
+                 "'org-root/ls-sp2' failed to associate")
+    # an ls server already associated does not complete without a change
+    assert_equal(ret["results"][sp3].message,
+                 "ls_requirement_bind_many failed, error: LsServer "
+                 "'org-root/ls-sp3' not associated in 0.5 seconds")
+    assert_equal(sorted(ret["times"]), [sp1])
+    assert_equal(sorted(ret["percentiles"]), ["max", "p50", "p90", "p99"])
+
+    # all the bindings go in one commit
+    assert_equal([call[0][0].dn for call in mock_add_mo.call_args_list],
+                 [sp1 + "/pn-req", sp2 + "/pn-req", sp3 + "/pn-req"])
+    assert_equal(mock_add_mo.call_args[0][0].name, "rack-12")
+    assert_equal(mock_commit.call_count, 1)
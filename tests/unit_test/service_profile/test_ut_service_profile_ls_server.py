@@ -0,0 +1,187 @@
+from mock import patch
+from nose.tools import assert_raises
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.ucsexception import UcsOperationError
+
+from ucsm_apis.service_profile.ls_server import ls_server_tree_create
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'login')
+def test_ls_server_tree_create(mock_login, mock_add_mo, mock_commit):
+    mock_login.return_value = True
+
+    mo = ls_server_tree_create(
+        handle, name="sp1", org_dn="org-root/org-web", type="instance",
+        vnic_ethers=[{"name": "eth0", "switch_id": "A",
+                      "ifs": [{"name": "default", "default_net": "yes"}]}],
+        vnic_fcs=[{"name": "fc0", "switch_id": "B",
+                   "ifs": [{"name": "default"}]}],
+        vcons=[{"id": "1"}],
+        power={"state": "up"})
+
+    assert_equal(mo.dn, "org-root/org-web/ls-sp1")
+    assert_equal(sorted(child.dn for child in mo.child),
+                 ["org-root/org-web/ls-sp1/ether-eth0",
+                  "org-root/org-web/ls-sp1/fc-fc0",
+                  "org-root/org-web/ls-sp1/power",
+                  "org-root/org-web/ls-sp1/vcon-1"])
+    vnic_ether = [child for child in mo.child
+                  if child.get_class_id() == "VnicEther"][0]
+    assert_equal(vnic_ether.switch_id, "A")
+    assert_equal([child.dn for child in vnic_ether.child],
+                 ["org-root/org-web/ls-sp1/ether-eth0/if-default"])
+
+    # the whole tree goes in a single commit
+    mock_add_mo.assert_called_once_with(mo, modify_present=True)
+    assert_equal(mock_commit.call_count, 1)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'add_mo')
+@patch.object(UcsHandle, 'login')
+def test_ls_server_tree_create_invalid(mock_login, mock_add_mo, mock_commit):
+    mock_login.return_value = True
+
+    with assert_raises(UcsOperationError) as error:
+        ls_server_tree_create(
+            handle, name="sp1",
+            vnic_ethers=[{"name": "eth0"}, {"name": "eth0"}],
+            vcons=[{"id": "1"}, {"id": 1}])
+    assert_equal(error.exception.message,
+                 "ls_server_tree_create failed, error: vnic_ethers[1]: "
+                 "duplicate 'eth0'; vcons[1]: duplicate '1'")
+    assert_equal(mock_add_mo.call_count, 0)
+    assert_equal(mock_commit.call_count, 0)
+
+
+@patch.object(UcsHandle, 'process_xml_elem')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_ls_server_instantiate_many(mock_login, mock_query_dns,
+                                    mock_process_xml_elem):
+    from ucsmsdk.mometa.ls.LsServer import LsServer
+    from ucsm_apis.service_profile.ls_server import ls_server_instantiate_many
+
+    mock_login.return_value = True
+    org_dn = "org-root/org-web"
+    names = ["sp-1", "sp-2", "sp-3", "sp-4", "sp-5"]
+
+    def query_dns(dns):
+        return dict((dn, LsServer(org_dn, name="sp-2")
+                     if dn == org_dn + "/ls-sp-2" else None) for dn in dns)
+    mock_query_dns.side_effect = query_dns
+
+    def process_xml_elem(elem):
+        names_sent = [dn.get("value") for dn in elem.find("inNameSet")]
+        assert "sp-2" not in names_sent
+        if "sp-5" in names_sent:
+            raise UcsOperationError("LsInstantiateNNamedTemplate", "boom")
+        return [LsServer(org_dn, name=name) for name in names_sent]
+    mock_process_xml_elem.side_effect = process_xml_elem
+
+    ret = ls_server_instantiate_many(handle, "org-root/ls-web-template",
+                                     names, org_dn=org_dn, chunk_size=2)
+    results = ret["results"]
+    assert_equal(sorted(results), names)
+    assert_equal([name for name in names if results[name] is None],
+                 ["sp-1", "sp-3", "sp-4"])
+    assert_equal(results["sp-2"].message,
+                 "ls_server_instantiate_many failed, error: LsServer "
+                 "'org-root/org-web/ls-sp-2' already exists")
+    assert_equal(results["sp-5"].message,
+                 "LsInstantiateNNamedTemplate failed, error: boom")
+    assert_equal(ret["calls"], 3)
+    assert_equal(mock_process_xml_elem.call_count, 3)
+
+
+@patch.object(UcsHandle, 'login')
+def test_ls_server_instantiate_many_chunk_size(mock_login):
+    from ucsm_apis.service_profile.ls_server import ls_server_instantiate_many
+
+    mock_login.return_value = True
+    with assert_raises(UcsOperationError) as error:
+        ls_server_instantiate_many(handle, "org-root/ls-web-template",
+                                   ["sp-1"], chunk_size=0)
+    assert_equal(error.exception.message,
+                 "ls_server_instantiate_many failed, error: chunk_size must "
+                 "be a positive integer, got '0'")
+
+
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_ls_server_inventory(mock_login, mock_query_classid):
+    from ucsmsdk.mometa.ls.LsServer import LsServer
+    from ucsmsdk.mometa.ls.LsPower import LsPower
+    from ucsmsdk.mometa.ls.LsRequirement import LsRequirement
+    from ucsmsdk.mometa.fabric.FabricVCon import FabricVCon
+    from ucsmsdk.mometa.vnic.VnicEther import VnicEther
+    from ucsmsdk.mometa.vnic.VnicFc import VnicFc
+    from ucsm_apis.service_profile.ls_server import ls_server_inventory
+    from ucsm_apis.service_profile.ls_server import LsServerInventory
+    from ucsm_apis.service_profile.ls_server import VnicInventory
+    from ucsm_apis.service_profile.ls_server import VconInventory
+
+    mock_login.return_value = True
+    sp1 = "org-root/org-web/ls-sp1"
+    sp2 = "org-root/org-web/org-a/ls-sp2"
+    mos = {
+        "LsServer": [
+            LsServer("org-root/org-web/org-a", name="sp2", type="instance",
+                     src_templ_name="tmpl"),
+            LsServer("org-root/org-web", name="sp1", type="instance"),
+        ],
+        "VnicEther": [
+            VnicEther(sp1, name="eth1", switch_id="B", admin_vcon="2",
+                      order="2", addr="00:25:B5:00:00:02"),
+            VnicEther(sp1, name="eth0", switch_id="A", admin_vcon="1",
+                      order="1", addr="00:25:B5:00:00:01"),
+            VnicEther(sp2, name="eth0", switch_id="A", admin_vcon="any",
+                      order="1", addr="derived"),
+            # not under a service profile
+            VnicEther("org-root/org-web/lan-conn-pol-lcp", name="eth0"),
+        ],
+        "VnicFc": [VnicFc(sp1, name="fc0", switch_id="A", admin_vcon="1",
+                          order="3", addr="20:00:00:25:B5:00:00:01")],
+        "FabricVCon": [FabricVCon(sp1, id="1", fabric="NONE",
+                                  placement="physical", select="all",
+                                  share="shared", transport="ethernet,fc")],
+        "LsPower": [LsPower(sp1, state="up"), LsPower(sp2, state="down")],
+        "LsRequirement": [LsRequirement(sp2, name="rack-12")],
+    }
+    mos["LsServer"][1]._ManagedObject__set_prop(
+        "assoc_state", "associated", forced=True)
+    mos["LsServer"][1]._ManagedObject__set_prop(
+        "pn_dn", "sys/chassis-1/blade-1", forced=True)
+    mock_query_classid.side_effect = \
+        lambda class_id, filter_str=None: mos[class_id]
+
+    inventory = ls_server_inventory(handle, org_dn="org-root/org-web")
+
+    # one query per class, all filtered on the org and its sub-orgs
+    assert_equal(sorted(call[0][0]
+                        for call in mock_query_classid.call_args_list),
+                 sorted(mos))
+    for call in mock_query_classid.call_args_list:
+        assert_equal(call[1]["filter_str"],
+                     '(dn, "^org-root/org-web/", type="re")')
+
+    assert_equal(inventory, [
+        LsServerInventory(
+            sp1, "sp1", "instance", None, "associated",
+            "sys/chassis-1/blade-1", "up", None,
+            (VnicInventory("eth0", "A", "00:25:B5:00:00:01", "1", "1"),
+             VnicInventory("eth1", "B", "00:25:B5:00:00:02", "2", "2")),
+            (VnicInventory("fc0", "A", "20:00:00:25:B5:00:00:01", "1",
+                           "3"),),
+            (VconInventory("1", "NONE", "physical", "all", "shared",
+                           "ethernet,fc"),)),
+        LsServerInventory(
+            sp2, "sp2", "instance", "tmpl", None, None, "down", "rack-12",
+            (VnicInventory("eth0", "A", "derived", "any", "1"),), (), ()),
+    ])
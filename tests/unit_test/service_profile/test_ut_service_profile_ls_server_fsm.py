@@ -0,0 +1,61 @@
+from mock import patch
+from nose.tools import assert_raises
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.ucsexception import UcsOperationError
+from ucsmsdk.mometa.ls.LsServerFsm import LsServerFsm
+
+from ucsm_apis.service_profile.ls_server_fsm import LsServerFsmWatcher
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+def _fsm_mo_get(dn, **kwargs):
+    mo = LsServerFsm(parent_mo_or_dn=dn[:-len("/fsm")])
+    # the fsm properties are read-only
+    for prop, value in kwargs.items():
+        mo._ManagedObject__set_prop(prop, value, forced=True)
+    return mo
+
+
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'login')
+def test_ls_server_fsm_watcher_poll(mock_login, mock_query_dns):
+    mock_login.return_value = True
+    sp1, sp2 = "org-root/ls-sp1", "org-root/ls-sp2"
+    states = [
+        # sp1 still shows the previous run, sp2 is in progress
+        {sp1 + "/fsm": _fsm_mo_get(sp1 + "/fsm", fsm_status="success",
+                                   current_fsm="associate", progress="100",
+                                   completion_time="t0"),
+         sp2 + "/fsm": _fsm_mo_get(sp2 + "/fsm", fsm_status="in-progress",
+                                   current_fsm="associate", progress="40",
+                                   completion_time="t0")},
+        {sp1 + "/fsm": _fsm_mo_get(sp1 + "/fsm", fsm_status="success",
+                                   current_fsm="associate", progress="100",
+                                   completion_time="t1"),
+         sp2 + "/fsm": _fsm_mo_get(sp2 + "/fsm", fsm_status="fail",
+                                   current_fsm="associate", progress="60",
+                                   completion_time="t1")},
+    ]
+
+    def query_dns(dns):
+        state = states[0] if mock_query_dns.call_count == 1 else states[1]
+        return dict((dn, state.get(dn)) for dn in dns)
+    mock_query_dns.side_effect = query_dns
+
+    watcher = LsServerFsmWatcher(handle, poll_sec=0.01)
+    futures = watcher.watch([sp1, sp2], since={sp1: "t0"})
+    assert_equal(futures[sp1].done(), False)
+    assert_equal(watcher.progress_get(sp2),
+                 {"stage": "associate", "status": "in-progress",
+                  "progress": 40, "done": None})
+
+    assert_equal(watcher.wait(timeout=5), {sp1: True, sp2: False})
+    assert_equal(futures[sp1].done(), True)
+    assert_equal(watcher.progress_get(sp2)["done"], False)
+
+    with assert_raises(UcsOperationError):
+        watcher.progress_get("org-root/ls-sp3")
+    watcher.stop()
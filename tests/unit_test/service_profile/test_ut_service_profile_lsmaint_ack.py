@@ -0,0 +1,108 @@
+from mock import patch
+from nose.tools import assert_raises
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.ucsexception import UcsOperationError
+from ucsmsdk.mometa.lsmaint.LsmaintAck import LsmaintAck
+from ucsmsdk.mometa.ls.LsServerFsm import LsServerFsm
+
+from ucsm_apis.service_profile.lsmaint_ack import lsmaint_ack_rolling
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+def _fsm_mo_get(dn, **kwargs):
+    mo = LsServerFsm(parent_mo_or_dn=dn[:-len("/fsm")])
+    # the fsm properties are read-only
+    for prop, value in kwargs.items():
+        mo._ManagedObject__set_prop(prop, value, forced=True)
+    return mo
+
+
+def _handle_patch(mock_query_classid, mock_query_dns, mock_set_mo,
+                  mock_commit, ls_server_dns, failed_dns=()):
+    # the fsm of a service profile runs once its ack is committed
+    mock_query_classid.return_value = [LsmaintAck(dn) for dn in
+                                       ls_server_dns]
+    staged = []
+    acked = set()
+
+    mock_set_mo.side_effect = lambda mo: staged.append(mo.dn[:-len("/ack")])
+
+    def commit():
+        acked.update(staged)
+        del staged[:]
+    mock_commit.side_effect = commit
+
+    def query_dns(dns):
+        fsms = {}
+        for dn in dns:
+            ls_server_dn = dn[:-len("/fsm")]
+            if ls_server_dn not in acked:
+                fsms[dn] = _fsm_mo_get(dn, fsm_status="success",
+                                       progress="100", completion_time="t0")
+            else:
+                fsm_status = "fail" if ls_server_dn in failed_dns \
+                    else "success"
+                fsms[dn] = _fsm_mo_get(dn, fsm_status=fsm_status,
+                                       progress="100", completion_time="t1")
+        return fsms
+    mock_query_dns.side_effect = query_dns
+    return acked
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_lsmaint_ack_rolling(mock_login, mock_query_classid, mock_query_dns,
+                             mock_set_mo, mock_commit):
+    mock_login.return_value = True
+    ls_server_dns = ["org-root/ls-sp1", "org-root/ls-sp2", "org-root/ls-sp3"]
+    _handle_patch(mock_query_classid, mock_query_dns, mock_set_mo,
+                  mock_commit, ls_server_dns)
+
+    ret = lsmaint_ack_rolling(handle, wave_size=2, timeout=5, poll_sec=0.01)
+    assert_equal(ret["results"], dict((dn, None) for dn in ls_server_dns))
+    assert_equal(ret["waves"], 2)
+    assert_equal(mock_commit.call_count, 2)
+    assert_equal(mock_set_mo.call_args[0][0].admin_state,
+                 "trigger-immediate")
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_dns')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_lsmaint_ack_rolling_max_failures(mock_login, mock_query_classid,
+                                          mock_query_dns, mock_set_mo,
+                                          mock_commit):
+    mock_login.return_value = True
+    ls_server_dns = ["org-root/ls-sp1", "org-root/ls-sp2"]
+    acked = _handle_patch(mock_query_classid, mock_query_dns, mock_set_mo,
+                          mock_commit, ls_server_dns,
+                          failed_dns=["org-root/ls-sp1"])
+
+    ret = lsmaint_ack_rolling(handle, wave_size=1, timeout=5,
+                              max_failures=0, poll_sec=0.01)
+    assert_equal(ret["results"]["org-root/ls-sp1"].message,
+                 "lsmaint_ack_rolling failed, error: LsServer "
+                 "'org-root/ls-sp1' fsm failed")
+    assert_equal(ret["results"]["org-root/ls-sp2"].message,
+                 "lsmaint_ack_rolling failed, error: LsmaintAck "
+                 "'org-root/ls-sp2/ack' not acknowledged, 1 failures")
+    assert_equal(ret["waves"], 1)
+    assert_equal(acked, set(["org-root/ls-sp1"]))
+
+
+@patch.object(UcsHandle, 'login')
+def test_lsmaint_ack_rolling_wave_size(mock_login):
+    mock_login.return_value = True
+    with assert_raises(UcsOperationError) as error:
+        lsmaint_ack_rolling(handle, wave_size=0)
+    assert_equal(error.exception.message,
+                 "lsmaint_ack_rolling failed, error: wave_size must be a "
+                 "positive integer, got '0'")
@@ -0,0 +1,139 @@
+from mock import patch
+from nose.tools import assert_equal
+
+from ucsmsdk.ucshandle import UcsHandle
+from ucsmsdk.mometa.vnic.VnicEther import VnicEther
+from ucsmsdk.mometa.vnic.VnicFc import VnicFc
+
+from ucsm_apis.service_profile.vnic_ether import vnic_ether_modify_many
+from ucsm_apis.service_profile.vnic_fc import vnic_fc_modify_many
+
+handle = UcsHandle("10.10.10.10", "username", "password")
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_vnic_ether_modify_many(mock_login, mock_query_classid, mock_set_mo,
+                                mock_commit):
+    mock_login.return_value = True
+    mock_query_classid.return_value = [
+        VnicEther("org-root/org-web/ls-sp1", name="eth0", mtu="1500"),
+        VnicEther("org-root/org-web/org-a/ls-sp2", name="eth0", mtu="9000"),
+        VnicEther("org-root/org-web/lan-conn-pol-lcp", name="eth0",
+                  mtu="1500"),
+        VnicEther("org-root/org-webx/ls-sp3", name="eth0", mtu="1500"),
+    ]
+
+    ret = vnic_ether_modify_many(handle,
+                                 selector={"name": "eth0",
+                                           "org_dn": "org-root/org-web"},
+                                 mtu=9000)
+    assert_equal(ret["skipped"], ["org-root/org-web/org-a/ls-sp2/ether-eth0"])
+    assert_equal(ret["results"], {"org-root/org-web/ls-sp1/ether-eth0": None})
+    assert_equal(ret["changes"],
+                 {"org-root/org-web/ls-sp1/ether-eth0": {"mtu": ("1500",
+                                                                 9000)}})
+    assert_equal(mock_set_mo.call_count, 1)
+    assert_equal(mock_commit.call_count, 1)
+
+    filter_str = mock_query_classid.call_args[1]["filter_str"]
+    assert_equal(filter_str,
+                 '(dn, "^org-root/org-web/(org-[^/]+/)*ls-[^/]+/ether-[^/]+$",'
+                 ' type="re") and (name, "eth0", type="eq")')
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_vnic_ether_modify_many_values(mock_login, mock_query_classid,
+                                       mock_set_mo, mock_commit):
+    mock_login.return_value = True
+    mock_query_classid.side_effect = lambda *args, **kwargs: [
+        VnicEther("org-root/ls-sp1", name="eth0", admin_vcon="any"),
+        VnicEther("org-root/ls-sp2", name="eth0", admin_vcon="2"),
+    ]
+
+    # the values are set as strings
+    ret = vnic_ether_modify_many(handle, selector={}, admin_vcon=1)
+    assert_equal(ret["results"], {"org-root/ls-sp1/ether-eth0": None,
+                                  "org-root/ls-sp2/ether-eth0": None})
+    assert_equal([call[0][0].admin_vcon
+                  for call in mock_set_mo.call_args_list], ["1", "1"])
+
+    # an invalid value is reported per object, nothing is committed
+    ret = vnic_ether_modify_many(handle, selector={}, admin_vcon=9)
+    assert_equal(sorted(ret["results"]), ["org-root/ls-sp1/ether-eth0",
+                                          "org-root/ls-sp2/ether-eth0"])
+    assert_equal(
+        ret["results"]["org-root/ls-sp1/ether-eth0"].message.startswith(
+            "vnic_ether_modify_many failed, error: "
+            "org-root/ls-sp1/ether-eth0: Invalid Value Exception"), True)
+    assert_equal(mock_commit.call_count, 1)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_vnic_fc_modify_many(mock_login, mock_query_classid, mock_set_mo,
+                             mock_commit):
+    mock_login.return_value = True
+    mock_query_classid.return_value = [
+        VnicFc("org-root/ls-sp1", name="fc0", max_data_field_size="2048"),
+        VnicFc("org-root/san-conn-pol-scp", name="fc0",
+               max_data_field_size="2048"),
+    ]
+
+    ret = vnic_fc_modify_many(handle, selector={}, max_data_field_size=2048)
+    assert_equal(ret["skipped"], ["org-root/ls-sp1/fc-fc0"])
+    assert_equal(ret["results"], {})
+    assert_equal(mock_commit.call_count, 0)
+
+
+@patch.object(UcsHandle, 'commit')
+@patch.object(UcsHandle, 'set_mo')
+@patch.object(UcsHandle, 'query_classid')
+@patch.object(UcsHandle, 'login')
+def test_vnic_fc_if_set_many(mock_login, mock_query_classid, mock_set_mo,
+                             mock_commit):
+    from ucsmsdk.mometa.ls.LsServer import LsServer
+    from ucsmsdk.mometa.vnic.VnicFcIf import VnicFcIf
+    from ucsm_apis.service_profile.vnic_fc import vnic_fc_if_set_many
+
+    mock_login.return_value = True
+    template = LsServer("org-root", name="tmpl", type="updating-template")
+    bound = LsServer("org-root", name="sp-bound", type="instance")
+    bound._ManagedObject__set_prop("oper_src_templ_name", template.dn,
+                                   forced=True)
+    fc_ifs = [
+        VnicFcIf("org-root/ls-sp1/fc-fc0", name="vsan-100"),
+        VnicFcIf("org-root/ls-sp-bound/fc-fc0", name="vsan-100"),
+        VnicFcIf("org-root/ls-sp2/fc-fc0", name="vsan-200"),
+        VnicFcIf("org-root/san-conn-pol-scp/fc-fc0", name="vsan-100"),
+    ]
+
+    def query_classid(class_id, filter_str=None):
+        if class_id == "VnicFcIf":
+            return fc_ifs
+        if "updating-template" in filter_str:
+            return [template]
+        return [bound]
+    mock_query_classid.side_effect = query_classid
+
+    ret = vnic_fc_if_set_many(handle, selector={"vnic_fc_name": "fc0"},
+                              name="vsan-200")
+    assert_equal(ret["skipped"], ["org-root/ls-sp2/fc-fc0/if-default"])
+    assert_equal(sorted(ret["results"]),
+                 ["org-root/ls-sp-bound/fc-fc0/if-default",
+                  "org-root/ls-sp1/fc-fc0/if-default"])
+    assert_equal(ret["results"]["org-root/ls-sp1/fc-fc0/if-default"], None)
+    assert_equal(
+        ret["results"]["org-root/ls-sp-bound/fc-fc0/if-default"].message,
+        "vnic_fc_if_set_many failed, error: service profile "
+        "org-root/ls-sp-bound is bound to the updating template "
+        "org-root/ls-tmpl")
+    assert_equal(mock_set_mo.call_count, 1)
+    assert_equal(mock_commit.call_count, 1)
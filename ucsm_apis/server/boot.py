@@ -13,9 +13,15 @@
 """
 This module performs the operation related to boot.
 """
+import hashlib
+import time
+from collections import namedtuple
+from functools import partial
+
 from ucsmsdk import ucsgenutils
 from ucsmsdk.ucsexception import UcsOperationError
-from ucsmsdk.ucscoreutils import load_class
+
+from ..utils.utils import mo_class_get
 
 def boot_policy_create(handle, name, org_dn="org-root",
                        reboot_on_update="no", enforce_vnic_name="yes",
@@ -290,13 +296,16 @@ def boot_security_disable(handle, name, org_dn="org-root"):
     return _boot_security_configure(handle, name, org_dn, secure_boot="no")
 
 
+def _children_get(parent_mo, class_id):
+    return [mo for mo in parent_mo.child if mo.get_class_id() == class_id]
+
+
 def _local_lun_add(parent_mo, order, lun_name=None, type=None):
     from ucsmsdk.mometa.lsboot.LsbootLocalHddImage import LsbootLocalHddImage
     from ucsmsdk.mometa.lsboot.LsbootLocalLunImagePath import \
         LsbootLocalLunImagePath
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == "LsbootLocalHddImage"]
+    mo = _children_get(parent_mo, "LsbootLocalHddImage")
     if mo and not mo[0].child:
         raise UcsOperationError(
             "_local_lun_add",
@@ -341,8 +350,7 @@ def _local_jbod_add(parent_mo, order, slot_number):
     from ucsmsdk.mometa.lsboot.LsbootLocalDiskImagePath import \
         LsbootLocalDiskImagePath
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == "LsbootLocalDiskImage"]
+    mo = _children_get(parent_mo, "LsbootLocalDiskImage")
     if mo:
         raise UcsOperationError(
             "_local_jbod_add",
@@ -366,8 +374,7 @@ def _local_embedded_disk_add(parent_mo, order, slot_number=None, type=None):
     from ucsmsdk.mometa.lsboot.LsbootEmbeddedLocalDiskImagePath import \
         LsbootEmbeddedLocalDiskImagePath
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == "LsbootEmbeddedLocalDiskImage"]
+    mo = _children_get(parent_mo, "LsbootEmbeddedLocalDiskImage")
     if mo and not mo[0].child:
         raise UcsOperationError("_local_embedded_disk_add",
                                 "Instance of Local Embedded Disk already "
@@ -410,8 +417,7 @@ def _lan_device_add(parent_mo, order, vnic_name):
     from ucsmsdk.mometa.lsboot.LsbootLan import LsbootLan
     from ucsmsdk.mometa.lsboot.LsbootLanImagePath import LsbootLanImagePath
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == "LsbootLan"]
+    mo = _children_get(parent_mo, "LsbootLan")
 
     if mo and mo[0].child:
         child_count = len(mo[0].child)
@@ -431,7 +437,8 @@ def _lan_device_add(parent_mo, order, vnic_name):
         return
 
     if not vnic_name:
-        raise UcsOperationError("Required Parameter 'vnic_name' missing.")
+        raise UcsOperationError("_lan_device_add",
+                                "Required Parameter 'vnic_name' missing.")
 
     mo_ = LsbootLan(parent_mo_or_dn=parent_mo, order=order, prot="pxe")
     LsbootLanImagePath(
@@ -440,10 +447,6 @@ def _lan_device_add(parent_mo, order, vnic_name):
         type="primary")
 
 
-def _children_get(parent_mo, class_id):
-    return [mo for mo in parent_mo.child if mo.get_class_id() == class_id]
-
-
 def _san_add(parent_mo, order):
     from ucsmsdk.mometa.lsboot.LsbootSan import LsbootSan
     return LsbootSan(parent_mo_or_dn=parent_mo, order=order)
@@ -453,7 +456,8 @@ def _san_image_add(parent_mo, type, vnic_name):
     from ucsmsdk.mometa.lsboot.LsbootSanCatSanImage import \
         LsbootSanCatSanImage
     if not (vnic_name and type):
-        raise UcsOperationError("Required Parameter 'vnic_name' or "
+        raise UcsOperationError("_san_device_add",
+                                "Required Parameter 'vnic_name' or "
                                 "'type' missing.")
     return LsbootSanCatSanImage(parent_mo_or_dn=parent_mo,
                                 vnic_name=vnic_name,
@@ -465,7 +469,8 @@ def _san_boot_target_add(parent_mo, target_type, wwn, lun):
         LsbootSanCatSanImagePath
     if target_type or wwn or lun:
         if not (wwn and lun and target_type):
-            raise UcsOperationError("Required Parameter 'wwn' or "
+            raise UcsOperationError("_san_device_add",
+                                    "Required Parameter 'wwn' or "
                                     "'lun' or 'target_type' missing.")
         return LsbootSanCatSanImagePath(parent_mo_or_dn=parent_mo,
                                         type=target_type,
@@ -522,7 +527,6 @@ def _san_device_add(parent_mo, order,
                     vnic_name=None, type=None,
                     wwn=None, lun=None, target_type=None):
 
-    # mo = [mo for mo in parent_mo.child if mo.get_class_id() == "LsbootSan"]
     # Get LsbootSan
     sans = _children_get(parent_mo, "LsbootSan")
 
@@ -611,8 +615,7 @@ def _iscsi_device_add(parent_mo, order, vnic_name):
     from ucsmsdk.mometa.lsboot.LsbootIScsi import LsbootIScsi
     from ucsmsdk.mometa.lsboot.LsbootIScsiImagePath import LsbootIScsiImagePath
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == "LsbootIScsi"]
+    mo = _children_get(parent_mo, "LsbootIScsi")
 
     if mo and mo[0].child:
         child_count = len(mo[0].child)
@@ -648,9 +651,6 @@ _local_devices = {
    "embedded_disk": ["LsbootEmbeddedLocalDiskImage", _local_embedded_disk_add],
 }
 
-_local_device_invert = dict(
-zip([value[0] for value in _local_devices.values()], _local_devices.keys()))
-
 _vmedia_devices = {
     "cd_dvd": "read-only",
     "cd_dvd_local": "read-only-local",
@@ -663,9 +663,6 @@ _vmedia_devices = {
     "hdd_cimc": "read-write-remote-cimc"
 }
 
-_vmedia_device_invert = dict(
-    zip(_vmedia_devices.values(), _vmedia_devices.keys()))
-
 
 def _local_device_add(parent_mo, device_name, device_order, **kwargs):
 
@@ -677,15 +674,14 @@ def _local_device_add(parent_mo, device_name, device_order, **kwargs):
         return
 
     class_id = _local_devices[device_name][0]
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == class_id]
+    mo = _children_get(parent_mo, class_id)
 
     if mo:
         raise UcsOperationError(
             "_local_device_add", "Device '%s' already exist at order '%s'" %
             (device_name, mo[0].order))
 
-    class_struct = load_class(class_id)
+    class_struct = mo_class_get(class_id)
     class_obj = class_struct(parent_mo_or_dn=parent_mo, order=device_order,
                              **kwargs)
 
@@ -694,14 +690,14 @@ def _vmedia_device_add(parent_mo, device_name, device_order, **kwargs):
     class_id = "LsbootVirtualMedia"
     access = _vmedia_devices[device_name]
 
-    mo = [mo for mo in parent_mo.child
-          if mo.get_class_id() == class_id and mo.access == access]
+    mo = [mo for mo in _children_get(parent_mo, class_id)
+          if mo.access == access]
     if mo:
         raise UcsOperationError(
             "_vmedia_device_add", "Device '%s' already exist at order '%s'" %
             (device_name, mo[0].order))
 
-    class_struct = load_class(class_id)
+    class_struct = mo_class_get(class_id)
     class_obj = class_struct(parent_mo_or_dn=parent_mo,
                              access=access,
                              order=device_order, **kwargs)
@@ -710,13 +706,13 @@ def _vmedia_device_add(parent_mo, device_name, device_order, **kwargs):
 def _efi_device_add(parent_mo, device_order, **kwargs):
     class_id = "LsbootEFIShell"
 
-    mo = [mo for mo in parent_mo.child if mo.get_class_id() == class_id]
+    mo = _children_get(parent_mo, class_id)
     if mo:
         raise UcsOperationError(
-        "__efi_device_add", "Device '%s' already exist at order '%s'" %
-        (device_name, mo[0].order))
+            "_efi_device_add", "Device '%s' already exist at order '%s'" %
+            ("efi", mo[0].order))
 
-    class_struct = load_class(class_id)
+    class_struct = mo_class_get(class_id)
     class_obj = class_struct(parent_mo_or_dn=parent_mo,
                              order=device_order, **kwargs)
 
@@ -759,41 +755,251 @@ def _validate_device_combination(devices):
                                 "'floppy' or 'floppy_local, floppy_remote'")
 
 
-def _device_add(handle, boot_policy, devices):
+def _boot_device_get(device):
+    device_name = device.get("device_name")
+    boot_device = _boot_devices.get(device_name)
+    if boot_device is None:
+        raise UcsOperationError(
+            "_device_add",
+            " Invalid Device <%s>" %
+            device_name)
+
+    device_order = device.get("device_order")
+    try:
+        valid_order = 1 <= int(device_order) <= 16
+    except (TypeError, ValueError):
+        valid_order = False
+    if not valid_order:
+        raise UcsOperationError(
+            "_device_add",
+            "Invalid device_order '%s', valid values are 1-16." %
+            device_order)
+    return boot_device
+
+
+def _boot_device_props_get(device):
+    return {key: value for key, value in device.iteritems()
+            if key not in ["device_name", "device_order"]}
+
+
+def _boot_device_add(boot_policy, device):
     from ucsmsdk.mometa.lsboot.LsbootStorage import LsbootStorage
     from ucsmsdk.mometa.lsboot.LsbootLocalStorage import LsbootLocalStorage
 
+    boot_device = _boot_device_get(device)
+    device_name = device["device_name"]
+    device_order = device["device_order"]
+    device_props = _boot_device_props_get(device)
+
+    parent_mo = boot_policy
+    if boot_device.local:
+        lsboot_storages = _children_get(boot_policy, "LsbootStorage")
+        if lsboot_storages:
+            parent_mo = _children_get(lsboot_storages[0],
+                                      "LsbootLocalStorage")[0]
+        else:
+            lsboot_storage = LsbootStorage(parent_mo_or_dn=boot_policy)
+            parent_mo = LsbootLocalStorage(parent_mo_or_dn=lsboot_storage)
+    boot_device.add(parent_mo, device_name, str(device_order),
+                    **device_props)
+
+
+def _boot_device_props_errors_get(device_name, boot_device, props):
+    from ucsmsdk.ucscoremeta import MoPropertyMeta
+
+    if boot_device.access is not None:
+        # the virtual media devices take no properties, they are ignored
+        return []
+
+    errors = []
+    device_props = _boot_device_props.get(device_name)
+    if device_props is None:
+        # the properties are set on the device object itself
+        prop_meta = mo_class_get(boot_device.class_id).prop_meta
+        for prop in sorted(props):
+            if prop == "order" or prop not in prop_meta or \
+                    prop_meta[prop].access != MoPropertyMeta.READ_WRITE:
+                errors.append("Invalid property '%s' for device '%s'." %
+                              (prop, device_name))
+            elif props[prop] and not prop_meta[prop].validate_property_value(
+                    str(props[prop])):
+                errors.append("Invalid value '%s' of property '%s' for "
+                              "device '%s'." %
+                              (props[prop], prop, device_name))
+        return errors
+
+    allowed = device_props.required + sum(device_props.groups, [])
+    for prop in sorted(props):
+        if prop not in allowed:
+            errors.append("Invalid property '%s' for device '%s'." %
+                          (prop, device_name))
+    for prop in device_props.required:
+        if not props.get(prop):
+            errors.append("Required Parameter '%s' missing." % prop)
+    for group in device_props.groups:
+        given = [prop for prop in group if props.get(prop)]
+        if given and len(given) != len(group):
+            errors.append("Required Parameter %s missing." %
+                          " or ".join("'%s'" % prop for prop in group))
+    return errors
+
+
+def _boot_device_instance_get(device_name, props):
+    # the instance props tell apart the paths of a repeated device, a
+    # device is given up to its first missing instance prop
+    instance = []
+    device_props = _boot_device_props.get(device_name)
+    for prop in device_props.instance if device_props else []:
+        if not props.get(prop):
+            break
+        instance.append(props[prop])
+    return tuple(instance)
+
+
+def _boot_device_instance_errors_get(device_name, device_order, instance,
+                                     added):
+    device_props = _boot_device_props.get(device_name)
+    instances = added.setdefault(device_name, [])
+    if device_props and device_props.count:
+        if len(instances) >= device_props.count:
+            return ["Both instances of '%s' device are already added." %
+                    device_name]
+    else:
+        for order, instance_ in instances:
+            # an instance conflicts with the instances it is a prefix of,
+            # and with those which are a prefix of it
+            length = min(len(instance), len(instance_))
+            if instance[:length] == instance_[:length]:
+                return ["Device '%s' already exist at order '%s'" %
+                        (device_name, order)]
+    instances.append((device_order, instance))
+    return []
+
+
+def boot_devices_validate(devices):
+    """
+    validates a boot device list without building the boot order
+
+    Every device is checked against the boot device registry: its name,
+    order and properties, and whether it repeats a device which was
+    already given. No managed object is built. A device which fails is
+    left out and the next devices are still checked, so that all the
+    errors are reported at once instead of failing on the first one.
+
+    Args:
+        devices (list of dict): same format as in boot_policy_order_set
+
+    Returns:
+        list of string: error messages, empty if the devices are valid
+
+    Example:
+        errors = boot_devices_validate(devices)
+    """
+    if not devices:
+        return ["No device present."]
+
+    errors = []
+    valid = []
+    added = {}
+    for i, device in enumerate(devices):
+        if not isinstance(device, dict):
+            errors.append("devices[%d]: Device must be a dict." % i)
+            continue
+
+        device_name = device.get("device_name")
+        prefix = "devices[%d] '%s': " % (i, device_name)
+        try:
+            boot_device = _boot_device_get(device)
+        except UcsOperationError as err:
+            errors.append(prefix + str(err))
+            continue
+
+        props = _boot_device_props_get(device)
+        device_errors = _boot_device_props_errors_get(device_name,
+                                                      boot_device, props)
+        if not device_errors:
+            device_errors = _boot_device_instance_errors_get(
+                device_name, str(device["device_order"]),
+                _boot_device_instance_get(device_name, props), added)
+        if device_errors:
+            errors.extend(prefix + str(UcsOperationError("_device_add", err))
+                          for err in device_errors)
+        else:
+            valid.append(device)
+
+    try:
+        _validate_device_combination(valid)
+    except UcsOperationError as err:
+        errors.append(str(err))
+    return errors
+
+
+def boot_devices_validate_many(specs):
+    """
+    validates many boot device lists
+
+    Args:
+        specs (dict or list): {key: devices} or [devices]
+
+    Returns:
+        dict: {key or index: [error messages]} for the invalid specs only
+
+    Example:
+        errors = boot_devices_validate_many({"sample_boot": devices})
+    """
+    if isinstance(specs, dict):
+        items = specs.iteritems()
+    else:
+        items = enumerate(specs)
+
+    errors = {}
+    for key, devices in items:
+        spec_errors = boot_devices_validate(devices)
+        if spec_errors:
+            errors[key] = spec_errors
+    return errors
+
+
+def _device_add(handle, boot_policy, devices):
     _validate_device_combination(devices)
 
-    ls_boot_storage_exist = False
     for device in devices:
-        device_name = device["device_name"]
-        device_order = str(device["device_order"])
-        device_props = {key: value for key, value in device.iteritems()
-                        if key not in ["device_name", "device_order"]}
-        if device_name in _local_devices:
-            if not ls_boot_storage_exist:
-                lsboot_storage = LsbootStorage(parent_mo_or_dn=boot_policy)
-                lsboot_local_storage = LsbootLocalStorage(
-                    parent_mo_or_dn=lsboot_storage)
-                ls_boot_storage_exist = True
-            _local_device_add(lsboot_local_storage, device_name,
-                              device_order, **device_props)
-        elif device_name in _vmedia_devices:
-            _vmedia_device_add(boot_policy, device_name, device_order)
-        elif device_name == "lan":
-            _lan_device_add(boot_policy, device_order, **device_props)
-        elif device_name == "san":
-            _san_device_add(boot_policy, device_order, **device_props)
-        elif device_name == "iscsi":
-            _iscsi_device_add(boot_policy, device_order, **device_props)
-        elif device_name == "efi":
-            _efi_device_add(boot_policy, device_order, **device_props)
-        else:
-            raise UcsOpeartionError(
-                "_device_add",
-                " Invalid Device <%s>" %
-                device_name)
+        _boot_device_add(boot_policy, device)
+
+
+def boot_policy_order_tree_build(devices, name="expected",
+                                 org_dn="org-root"):
+    """
+    builds the expected boot order tree for the given devices
+
+    The tree is built in memory on a detached LsbootPolicy, nothing is
+    queried or modified on the handle. As the boot order comparison does
+    not depend on the policy name, the same tree can be used to check
+    many boot policies.
+
+    Args:
+        devices (list of dict): same format as in boot_policy_order_set
+        name (string): boot policy name
+        org_dn (string): org dn
+
+    Returns:
+        LsbootPolicy: managed object with the boot devices as children
+
+    Raises:
+        UcsOperationError: if the devices are not valid
+
+    Example:
+        expected = boot_policy_order_tree_build(devices=devices)
+    """
+    from ucsmsdk.mometa.lsboot.LsbootPolicy import LsbootPolicy
+
+    if not devices:
+        raise UcsOperationError("boot_policy_order_tree_build",
+                                "No device present.")
+
+    boot_policy = LsbootPolicy(parent_mo_or_dn=org_dn, name=name)
+    _device_add(None, boot_policy, devices)
+    return boot_policy
 
 
 def _boot_policy_order_clear(handle, boot_policy):
@@ -815,33 +1021,168 @@ def _boot_policy_order_clear(handle, boot_policy):
     handle.commit()
 
 
-def _extract_device_from_bp_child(bp_child):
+def _boot_policy_hierarchy_get(handle, name, org_dn, caller):
+    dn = org_dn + "/boot-policy-" + name
+    response = handle.query_dn(dn=dn, hierarchy=True, need_response=True)
+    if not response.out_config.child:
+        raise UcsOperationError(caller, "BootPolicy '%s' does not exist" % dn)
+    return response.out_config.child[0]
+
+
+def _boot_children_get(mo):
+    # only the boot devices and their paths are managed by this module.
+    # Any other child of the boot policy or of its storage is a boot
+    # device, known or not, so that the devices this module does not
+    # know of are reported and replaced. Faults, boot security and the
+    # objects under the paths (e.g. uefi boot parameters) are left out.
+    if mo.get_class_id() in _boot_container_class_ids:
+        return [child for child in mo.child
+                if child.get_class_id() not in _boot_ignored_class_ids]
+    return [child for child in mo.child
+            if child.get_class_id() in _boot_path_class_ids]
+
+
+def _mo_tree_index_get(mo):
+    index = {}
+    mos = _boot_children_get(mo)
+    while mos:
+        mo_ = mos.pop()
+        index[mo_.dn] = mo_
+        mos.extend(_boot_children_get(mo_))
+    return index
+
+
+def _mo_config_props_get(mo):
+    from ucsmsdk.ucscoremeta import MoPropertyMeta
+
+    props = {}
+    for prop, prop_meta in mo.prop_meta.items():
+        if prop == "status" or prop_meta.access not in [
+                MoPropertyMeta.NAMING,
+                MoPropertyMeta.CREATE_ONLY,
+                MoPropertyMeta.READ_WRITE]:
+            continue
+        value = getattr(mo, prop)
+        if value is not None:
+            props[prop] = value
+    return props
+
+
+def _boot_policy_order_replace(handle, name, org_dn, devices):
+    existing_boot_policy = _boot_policy_hierarchy_get(
+        handle, name, org_dn, caller="boot_policy_order_set")
+
+    boot_policy = boot_policy_order_tree_build(devices, name, org_dn)
+    _boot_policy_order_replace_stage(
+        handle, _boot_policy_removed_get(existing_boot_policy, boot_policy),
+        boot_policy)
+    handle.commit()
+
+
+def _boot_policy_removed_get(existing_boot_policy, boot_policy):
+    expected_dns = _mo_tree_index_get(boot_policy)
+
+    # only the topmost existing objects which are not part of the new
+    # tree, the others are modified in place by the same transaction
+    removed = []
+    mos = _boot_children_get(existing_boot_policy)
+    while mos:
+        mo = mos.pop()
+        if mo.dn in expected_dns:
+            mos.extend(_boot_children_get(mo))
+        else:
+            removed.append(mo)
+    return removed
+
+
+def _mo_remove_stage(handle, mo):
+    from ucsmsdk.ucscoremeta import MoPropertyMeta
+
+    # remove_mo detaches the object from its parent, remove a copy so that
+    # the queried tree is left intact and the removal can be staged again
+    naming_props = dict((prop, getattr(mo, prop))
+                        for prop, prop_meta in mo.prop_meta.items()
+                        if prop_meta.access == MoPropertyMeta.NAMING)
+    mo_class = mo_class_get(mo.get_class_id())
+    handle.remove_mo(mo_class(parent_mo_or_dn=mo.dn[:-len(mo.rn) - 1],
+                              **naming_props))
+
+
+def _boot_policy_order_replace_stage(handle, removed, boot_policy):
+    for mo in removed:
+        _mo_remove_stage(handle, mo)
+    handle.set_mo(boot_policy)
+
+
+def _mo_tree_clone(mo, parent_mo_or_dn):
+    mo_class = mo_class_get(mo.get_class_id())
+    mo_ = mo_class(parent_mo_or_dn=parent_mo_or_dn,
+                   **_mo_config_props_get(mo))
+    for child in mo.child:
+        _mo_tree_clone(child, mo_)
+    return mo_
+
+
+def _boot_policy_delta_get(existing_boot_policy, expected_boot_policy):
+    existing_mos = _mo_tree_index_get(existing_boot_policy)
+    expected_mos = _mo_tree_index_get(expected_boot_policy)
+
+    added = []
+    modified = []
+    mos = _boot_children_get(expected_boot_policy)
+    while mos:
+        mo = mos.pop(0)
+        existing_mo = existing_mos.get(mo.dn)
+        if existing_mo is None:
+            # the whole subtree is new
+            added.append(mo)
+            continue
+        if not existing_mo.check_prop_match(**_mo_config_props_get(mo)):
+            modified.append(mo)
+        mos.extend(_boot_children_get(mo))
+
+    removed = []
+    mos = _boot_children_get(existing_boot_policy)
+    while mos:
+        mo = mos.pop(0)
+        if mo.dn in expected_mos:
+            mos.extend(_boot_children_get(mo))
+        else:
+            removed.append(mo)
+
+    return added, modified, removed
+
+
+def _boot_device_access_get(mo):
+    # UCSM also fills in the read-only access of the other device classes,
+    # it only tells the LsbootVirtualMedia devices apart
+    if mo.get_class_id() == "LsbootVirtualMedia":
+        return mo.access
+    return None
+
+
+def _extract_device_from_bp_child(bp_child, unknown=None):
+    # the unknown devices are appended to unknown if given, else rejected
     bp_devices = {}
 
-    for ch_ in bp_child:
+    mos = [ch_ for ch_ in bp_child
+           if ch_.get_class_id() not in _boot_ignored_class_ids]
+    while mos:
+        ch_ = mos.pop(0)
         class_id = ch_.get_class_id()
-        if class_id == "LsbootBootSecurity":
+        if class_id in ["LsbootStorage", "LsbootLocalStorage"]:
+            mos.extend(_boot_children_get(ch_))
             continue
-        elif class_id == "LsbootSan":
-            bp_devices["san"] = ch_
-        elif class_id == "LsbootLan":
-            bp_devices["lan"] = ch_
-        elif class_id == "LsbootVirtualMedia":
-            access = ch_.access
-            device = _vmedia_device_invert[access]
-            bp_devices[device] = ch_
-        elif class_id == "LsbootStorage":
-            local_storage = ch_.child[0]
-            for local_ch_ in local_storage.child:
-                local_class_id = local_ch_.get_class_id()
-                device = _local_device_invert[local_class_id]
-                bp_devices[device] = local_ch_
-        elif class_id == "LsbootIScsi":
-            bp_devices["iscsi"] = ch_
-        elif class_id == "LsbootEFIShell":
-            bp_devices["efi"] = ch_
-        else:
-            raise UcsOpeationError("_compare_boot_policy", "Unknown Device.")
+
+        device = _boot_device_names.get((class_id,
+                                         _boot_device_access_get(ch_)))
+        if device is None:
+            if unknown is None:
+                raise UcsOperationError("_compare_boot_policy",
+                                        "Unknown Device.")
+            unknown.append(ch_)
+            continue
+        bp_devices[device] = ch_
 
     return bp_devices
 
@@ -868,8 +1209,8 @@ def _child_pri_sec_filter(child_list):
 def _compare_local_lun(existing_lun, expected_lun):
     _device_compare(existing_lun, 'local_lun', order=expected_lun.order)
 
-    existing_child = existing_lun.child
-    expected_child = expected_lun.child
+    existing_child = _boot_children_get(existing_lun)
+    expected_child = _boot_children_get(expected_lun)
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
                                 "Child count mismatch for 'local_lun'.")
@@ -900,8 +1241,8 @@ def _compare_local_lun(existing_lun, expected_lun):
 def _compare_local_jbod(existing_jbod, expected_jbod):
     _device_compare(existing_jbod, 'local_jbod', order=expected_jbod.order)
 
-    existing_child = existing_jbod.child
-    expected_child = expected_jbod.child
+    existing_child = _boot_children_get(existing_jbod)
+    expected_child = _boot_children_get(expected_jbod)
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
                                 "Child count mismatch for 'local_jbod'.")
@@ -918,8 +1259,8 @@ def _compare_embedded_disk(existing_disk, expected_disk):
                     'embedded_disk',
                     order=expected_disk.order)
 
-    existing_child = existing_disk.child
-    expected_child = expected_disk.child
+    existing_child = _boot_children_get(existing_disk)
+    expected_child = _boot_children_get(expected_disk)
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
                                 "Child count mismatch for 'embedded_disk'.")
@@ -928,8 +1269,8 @@ def _compare_embedded_disk(existing_disk, expected_disk):
     if len(existing_child) == 1:
         _device_compare(existing_child[0],
                         'embedded_disk',
-                        type=expected_disk.type,
-                        slot_number=expected_disk.slot_number)
+                        type=expected_child[0].type,
+                        slot_number=expected_child[0].slot_number)
     if len(existing_child) == 2:
         existing_child_primary, existing_child_secondary =\
             _child_pri_sec_filter(existing_child)
@@ -952,8 +1293,8 @@ def _compare_lan(existing_lan, expected_lan):
                     'lan',
                     order=expected_lan.order)
 
-    existing_child = existing_lan.child
-    expected_child = expected_lan.child
+    existing_child = _boot_children_get(existing_lan)
+    expected_child = _boot_children_get(expected_lan)
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
                                 "Child count mismatch for 'lan'.")
@@ -962,8 +1303,8 @@ def _compare_lan(existing_lan, expected_lan):
     if len(existing_child) == 1:
         _device_compare(existing_child[0],
                         'lan',
-                        type=expected_lan.type,
-                        vnic_name=expected_lan.vnic_name)
+                        type=expected_child[0].type,
+                        vnic_name=expected_child[0].vnic_name)
     if len(existing_child) == 2:
         existing_child_primary, existing_child_secondary =\
             _child_pri_sec_filter(existing_child)
@@ -992,9 +1333,9 @@ def _compare_san_sub_child(existing_sub_child, expected_sub_child):
     if len(existing_sub_child) == 1:
         _device_compare(existing_sub_child[0],
                         'san',
-                        type=expected_san.type,
-                        wwn=expected_sub_child.wwn,
-                        lun=expected_sub_child.lun)
+                        type=expected_sub_child[0].type,
+                        wwn=expected_sub_child[0].wwn,
+                        lun=expected_sub_child[0].lun)
     if len(existing_sub_child) == 2:
         existing_sub_child_primary, existing_sub_child_secondary =\
             _child_pri_sec_filter(existing_sub_child)
@@ -1020,8 +1361,8 @@ def _compare_san(existing_san, expected_san):
                     'san',
                     order=expected_san.order)
 
-    existing_child = existing_san.child
-    expected_child = expected_san.child
+    existing_child = _boot_children_get(existing_san)
+    expected_child = _boot_children_get(expected_san)
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
                                 "Child count mismatch for 'san'.")
@@ -1030,11 +1371,11 @@ def _compare_san(existing_san, expected_san):
     if len(existing_child) == 1:
         _device_compare(existing_child[0],
                         'san',
-                        type=expected_san.type,
-                        vnic_name=expected_san.vnic_name)
+                        type=expected_child[0].type,
+                        vnic_name=expected_child[0].vnic_name)
 
-        existing_sub_child = existing_child.child
-        expected_sub_child = expected_child.child
+        existing_sub_child = _boot_children_get(existing_child[0])
+        expected_sub_child = _boot_children_get(expected_child[0])
 
         _compare_san_sub_child(existing_sub_child, expected_sub_child)
 
@@ -1050,16 +1391,17 @@ def _compare_san(existing_san, expected_san):
                         type=expected_child_primary.type,
                         vnic_name=expected_child_primary.vnic_name)
         # compare sub_child under primary child
-        _compare_san_sub_child(existing_child_primary.child,
-                               expected_child_primary.child)
+        _compare_san_sub_child(_boot_children_get(existing_child_primary),
+                               _boot_children_get(expected_child_primary))
 
         _device_compare(existing_child_secondary,
                         'san',
                         type=expected_child_secondary.type,
                         vnic_name=expected_child_secondary.vnic_name)
         # compare sub_child under secondary child
-        _compare_san_sub_child(existing_child_secondary.child,
-                               expected_child_secondary.child)
+        _compare_san_sub_child(
+            _boot_children_get(existing_child_secondary),
+            _boot_children_get(expected_child_secondary))
 
 
 def _compare_iscsi(existing_iscsi, expected_iscsi):
@@ -1067,8 +1409,8 @@ def _compare_iscsi(existing_iscsi, expected_iscsi):
                     'iscsi',
                     order=expected_iscsi.order)
 
-    existing_child = existing_iscsi.child
-    expected_child = expected_iscsi.child
+    existing_child = _boot_children_get(existing_iscsi)
+    expected_child = _boot_children_get(expected_iscsi)
 
     if len(existing_child) != len(expected_child):
         raise UcsOperationError("_compare_boot_policy",
@@ -1103,68 +1445,314 @@ def _compare_efi(existing_efi, expected_efi):
     _device_compare(existing_efi, 'efi', order=expected_efi.order)
 
 
-def _compare_boot_policy(existing_boot_policy, expected_boot_policy):
-    # check child count
-    existing_bp_child = existing_boot_policy.child
-    expected_bp_child = expected_boot_policy.child
+def _compare_order(existing_device, expected_device, device_name):
+    if not existing_device.check_prop_match(order=expected_device.order):
+        raise UcsOperationError(
+            "_compare_boot_policy",
+            "Order mismatch for device '%s'." %
+            device_name)
 
-    existing_bp_child = [ch for ch in existing_bp_child
-                         if ch.get_class_id() != "LsbootBootSecurity"]
 
-    if len(existing_bp_child) != len(expected_bp_child):
-        raise UcsOperationError("_compare_boot_policy",
-                                "Child count mismatch.")
+def _unnamed_device_add(add):
+    # adapts the handlers which do not take the device name
+    def _add(parent_mo, device_name, device_order, **kwargs):
+        add(parent_mo, device_order, **kwargs)
+    return _add
 
-    existing_bp_devices = _extract_device_from_bp_child(existing_bp_child)
-    expected_bp_devices = _extract_device_from_bp_child(expected_bp_child)
 
-    for device_name in existing_bp_devices:
+def _vmedia_device_add_noprops(parent_mo, device_name, device_order,
+                               **kwargs):
+    # the virtual media devices take no properties, they are ignored
+    _vmedia_device_add(parent_mo, device_name, device_order)
+
+
+# class_id, access: access distinguishes the LsbootVirtualMedia devices,
+#     None for the other classes
+# local: the device is added under LsbootStorage/LsbootLocalStorage
+# add: (parent_mo, device_name, device_order, **kwargs)
+# compare: (existing_device, expected_device)
+# paths: class ids of the objects added under the device
+_BootDevice = namedtuple("_BootDevice",
+                         ["class_id", "access", "local", "add", "compare",
+                          "paths"])
+
+_local_device_compares = {
+    "local_lun": _compare_local_lun,
+    "local_jbod": _compare_local_jbod,
+    "embedded_disk": _compare_embedded_disk,
+}
+
+_local_device_paths = {
+    "local_lun": ["LsbootLocalLunImagePath"],
+    "local_jbod": ["LsbootLocalDiskImagePath"],
+    "embedded_disk": ["LsbootEmbeddedLocalDiskImagePath"],
+}
+
+# properties of the devices whose add handler takes named properties, the
+# other devices set theirs on the device object
+# required: props which must be given
+# groups: props which are given all together or not at all
+# instance: props which tell apart the paths of a repeated device
+# count: how many times the device may be given, None if told apart by
+#     the instance props
+_BootDeviceProps = namedtuple("_BootDeviceProps",
+                              ["required", "groups", "instance", "count"])
+
+_boot_device_props = {
+    "lan": _BootDeviceProps(["vnic_name"], [], [], 2),
+    "iscsi": _BootDeviceProps(["vnic_name"], [], [], 2),
+    "san": _BootDeviceProps([], [["vnic_name", "type"],
+                                 ["target_type", "wwn", "lun"]],
+                            ["type", "target_type"], None),
+    "local_lun": _BootDeviceProps([], [["lun_name", "type"]], ["type"],
+                                  None),
+    "local_jbod": _BootDeviceProps(["slot_number"], [], [], None),
+    "embedded_disk": _BootDeviceProps([], [["slot_number", "type"]],
+                                      ["type"], None),
+}
+
+
+def _boot_devices_get():
+    boot_devices = {
+        "lan": _BootDevice("LsbootLan", None, False,
+                           _unnamed_device_add(_lan_device_add),
+                           _compare_lan, ["LsbootLanImagePath"]),
+        "san": _BootDevice("LsbootSan", None, False,
+                           _unnamed_device_add(_san_device_add),
+                           _compare_san, ["LsbootSanCatSanImage",
+                                          "LsbootSanCatSanImagePath"]),
+        "iscsi": _BootDevice("LsbootIScsi", None, False,
+                             _unnamed_device_add(_iscsi_device_add),
+                             _compare_iscsi, ["LsbootIScsiImagePath"]),
+        "efi": _BootDevice("LsbootEFIShell", None, False,
+                           _unnamed_device_add(_efi_device_add),
+                           _compare_efi, []),
+    }
+    for device_name, (class_id, _) in _local_devices.items():
+        compare = _local_device_compares.get(
+            device_name, partial(_compare_order, device_name=device_name))
+        boot_devices[device_name] = _BootDevice(
+            class_id, None, True, _local_device_add, compare,
+            _local_device_paths.get(device_name, []))
+    for device_name, access in _vmedia_devices.items():
+        boot_devices[device_name] = _BootDevice(
+            "LsbootVirtualMedia", access, False, _vmedia_device_add_noprops,
+            partial(_compare_order, device_name=device_name), [])
+    return boot_devices
+
+
+_boot_devices = _boot_devices_get()
+
+_boot_device_names = dict(
+    ((boot_device.class_id, boot_device.access), device_name)
+    for device_name, boot_device in _boot_devices.items())
+
+# the boot devices are the children of these, except the ignored classes
+_boot_container_class_ids = frozenset(["LsbootPolicy", "LsbootStorage",
+                                       "LsbootLocalStorage"])
+
+# the objects under a boot policy which are not boot devices, they are
+# left in place by the boot order operations
+_boot_ignored_class_ids = frozenset(["FaultInst", "LsbootBootSecurity",
+                                     "LsbootUEFIBootParam"])
+
+_boot_path_class_ids = frozenset().union(
+    *(boot_device.paths for boot_device in _boot_devices.values()))
+
+
+def _boot_policy_mismatches_get(existing_boot_policy, expected_boot_policy):
+    unknown = []
+    existing_bp_devices = _extract_device_from_bp_child(
+        existing_boot_policy.child, unknown)
+    expected_bp_devices = _extract_device_from_bp_child(
+        expected_boot_policy.child)
+
+    mismatches = [{"device": None,
+                   "reason": "unexpected",
+                   "rn": mo.rn,
+                   "message": "Unknown Device '%s' is not expected." %
+                              mo.get_class_id()}
+                  for mo in unknown]
+    for device_name in sorted(set(existing_bp_devices) |
+                              set(expected_bp_devices)):
+        if device_name not in existing_bp_devices:
+            mismatches.append({"device": device_name,
+                               "reason": "missing",
+                               "rn": expected_bp_devices[device_name].rn,
+                               "message": "Device '%s' does not exist." %
+                                          device_name})
+            continue
         if device_name not in expected_bp_devices:
-            raise UcsOperationError("_compare_boot_policy",
-                                    "Device does not already exist.")
-
-        existing_bp_device = existing_bp_devices[device_name]
-        expected_bp_device = expected_bp_devices[device_name]
-
-        if device_name in _vmedia_devices:
-            if not existing_bp_device.check_prop_match(
-                    order=expected_bp_device.order):
-                raise UcsOperationError(
-                    "_compare_boot_policy",
-                    "Order mismatch for device '%s'." %
-                    device_name)
-        elif device_name in _local_devices:
-            if _local_devices[device_name][1] is None:
-                if not existing_bp_device.check_prop_match(
-                        order=expected_bp_device.order):
-                    raise UcsOperationError(
-                        "_compare_boot_policy",
-                        "Order mismatch for device '%s'." %
-                        device_name)
-            elif device_name == "local_lun":
-                _compare_local_lun(existing_bp_device,
-                                   expected_bp_device)
-            elif device_name == "local_jbod":
-                _compare_local_jbod(existing_bp_device,
-                                    expected_bp_device)
-            elif device_name == "embedded_disk":
-                _compare_embedded_disk(existing_bp_device,
-                                       expected_bp_device)
-        elif device_name == "lan":
-            _compare_lan(existing_bp_device,
-                         expected_bp_device)
-        elif device_name == "san":
-            _compare_san(existing_bp_device,
-                         expected_bp_device)
-        elif device_name == "iscsi":
-            _compare_iscsi(existing_bp_device,
-                           expected_bp_device)
-        elif device_name == "efi":
-            _compare_efi(existing_bp_device,
-                         expected_bp_device)
-
-
-def boot_policy_order_set(handle, name, devices, org_dn="org-root"):
+            mismatches.append({"device": device_name,
+                               "reason": "unexpected",
+                               "rn": existing_bp_devices[device_name].rn,
+                               "message": "Device '%s' is not expected." %
+                                          device_name})
+            continue
+        try:
+            _boot_devices[device_name].compare(
+                existing_bp_devices[device_name],
+                expected_bp_devices[device_name])
+        except UcsOperationError as err:
+            mismatches.append({"device": device_name,
+                               "reason": "mismatch",
+                               "rn": existing_bp_devices[device_name].rn,
+                               "message": err.message})
+    return mismatches
+
+
+def _compare_boot_policy(existing_boot_policy, expected_boot_policy):
+    mismatches = _boot_policy_mismatches_get(existing_boot_policy,
+                                             expected_boot_policy)
+    if mismatches:
+        raise UcsOperationError("_compare_boot_policy",
+                                mismatches[0]["message"])
+
+
+# the properties checked by the _compare_* helpers, by class id
+_boot_compare_props = dict(
+    [(boot_device.class_id, ["order"])
+     for boot_device in _boot_devices.values()] + [
+        ("LsbootLocalLunImagePath", ["type", "lun_name"]),
+        ("LsbootLocalDiskImagePath", ["slot_number"]),
+        ("LsbootEmbeddedLocalDiskImagePath", ["type", "slot_number"]),
+        ("LsbootLanImagePath", ["type", "vnic_name"]),
+        ("LsbootSanCatSanImage", ["type", "vnic_name"]),
+        ("LsbootSanCatSanImagePath", ["type", "wwn", "lun"]),
+        ("LsbootIScsiImagePath", ["type", "i_scsi_vnic_name"]),
+    ])
+
+
+def _boot_device_canonical_get(device_mo):
+    entries = []
+    mos = [(device_mo, device_mo.rn)]
+    while mos:
+        mo, rn = mos.pop()
+        # UCSM returns the unset properties as empty strings
+        props = tuple((prop, str(getattr(mo, prop)))
+                      for prop in _boot_compare_props[mo.get_class_id()]
+                      if getattr(mo, prop) not in [None, ""])
+        entries.append((rn, props))
+        mos.extend((child, rn + "/" + child.rn)
+                   for child in _boot_children_get(mo))
+    return tuple(sorted(entries))
+
+
+def boot_policy_order_fingerprint(boot_policy=None, devices=None):
+    """
+    computes a canonical fingerprint of the boot order of a boot policy
+
+    The fingerprint covers every boot device, with the properties which
+    boot_policy_order_exists compares on the device and on its
+    primary/secondary paths. Faults and the other objects not managed by
+    this module are left out. It does not depend on the order of the
+    children, nor on the boot policy name. Properties which are not set
+    or empty are left out, so equal fingerprints mean the boot order
+    matches, while different fingerprints may still match as per
+    boot_policy_order_exists.
+
+    Args:
+        boot_policy (LsbootPolicy): boot policy with its boot devices as
+            children, as returned by a hierarchical query or by
+            boot_policy_order_tree_build
+        devices (list of dict): same format as in boot_policy_order_set,
+            used if boot_policy is None
+
+    Returns:
+        string: hex digest
+
+    Raises:
+        UcsOperationError: if the devices are not valid
+
+    Example:
+        boot_policy_order_fingerprint(devices=devices)
+    """
+    if boot_policy is None:
+        boot_policy = boot_policy_order_tree_build(devices)
+
+    bp_devices = _extract_device_from_bp_child(boot_policy.child)
+    canonical = tuple(sorted(
+        (device_name, _boot_device_canonical_get(device_mo))
+        for device_name, device_mo in bp_devices.items()))
+    return hashlib.sha1(repr(canonical)).hexdigest()
+
+
+class BootOrderCache(object):
+    """
+    Caches the boot order fingerprint of boot policies by dn.
+
+    boot_policy_order_exists uses the cache to skip the comparison when
+    the fingerprints match, and to skip the query while the cached entry
+    is fresh. Changes made to a boot policy are seen once its entry
+    expires or is invalidated.
+
+    Args:
+        ttl (int): seconds for which an entry is fresh,
+            entries never expire if None
+
+    Example:
+        cache = BootOrderCache(ttl=300)
+        boot_policy_order_exists(handle, name="sample_boot",
+                                 devices=devices, cache=cache)
+        print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def get(self, dn):
+        """
+        Gets the fresh entry of a boot policy.
+
+        Args:
+            dn (string): boot policy dn
+
+        Returns:
+            (fingerprint, LsbootPolicy MO) or None
+        """
+        entry = self._entries.get(dn)
+        if entry is not None and (self.ttl is None or
+                                  time.time() - entry[2] < self.ttl):
+            self.hits += 1
+            return entry[0], entry[1]
+        self.misses += 1
+        return None
+
+    def set(self, dn, fingerprint, boot_policy):
+        """
+        Stores the fingerprint of a boot policy.
+
+        Args:
+            dn (string): boot policy dn
+            fingerprint (string): boot order fingerprint
+            boot_policy (LsbootPolicy): boot policy with its boot devices
+
+        Returns:
+            None
+        """
+        self._entries[dn] = (fingerprint, boot_policy, time.time())
+
+    def invalidate(self, dn=None):
+        """
+        Drops the entry of a boot policy, or all the entries if dn is None.
+
+        Args:
+            dn (string): boot policy dn
+
+        Returns:
+            None
+        """
+        if dn is None:
+            self._entries = {}
+        else:
+            self._entries.pop(dn, None)
+
+
+def boot_policy_order_set(handle, name, devices, org_dn="org-root",
+                          single_transaction=False):
     """
     sets boot order for a given boot policy
 
@@ -1202,6 +1790,9 @@ def boot_policy_order_set(handle, name, devices, org_dn="org-root"):
          *note - mandatory keys are 'device_name' and 'device_order'
                  other key depends on the device.
         org_dn (string): org dn
+        single_transaction (bool): True/False, if True, the existing devices
+         are removed and the new devices are added in a single commit,
+         so the boot policy is never left without boot devices
 
     Returns:
         None
@@ -1320,12 +1911,22 @@ def boot_policy_order_set(handle, name, devices, org_dn="org-root"):
 
         def test_boot_policy_order_set():
             boot_policy_order_set(handle, name="sample_boot", devices=devices)
+            boot_policy_order_set(handle, name="sample_boot", devices=devices,
+                                  single_transaction=True)
 
     """
     # check if devices is not empty
     if not devices:
         raise UcsOperationError("boot_policy_order_set", "No device present.")
 
+    if single_transaction:
+        _boot_policy_order_replace(handle, name, org_dn, devices)
+        return
+
+    # build the boot order in memory first, so that invalid devices are
+    # reported before the boot policy is cleared
+    boot_policy_order_tree_build(devices)
+
     boot_policy = boot_policy_get(handle=handle, name=name, org_dn=org_dn,
                                   caller="boot_policy_order_set")
 
@@ -1339,7 +1940,7 @@ def boot_policy_order_set(handle, name, devices, org_dn="org-root"):
 
 
 def boot_policy_order_exists(handle, name, devices, org_dn="org-root",
-                             debug=False):
+                             debug=False, cache=None):
     """
     checks if a given boot order exists for a given boot policy
 
@@ -1378,6 +1979,9 @@ def boot_policy_order_exists(handle, name, devices, org_dn="org-root",
          *note - mandatory keys are 'device_name' and 'device_order'
                  other key depends on the device.
         debug (bool): True/False, if True, incase of error print stacktrace
+        cache (BootOrderCache): boot order fingerprints of the boot
+            policies, the boot policy is not queried while its cached
+            fingerprint is fresh and matches
 
     Returns:
         (True/False, LsbootPolicy MO/None)
@@ -1388,38 +1992,270 @@ def boot_policy_order_exists(handle, name, devices, org_dn="org-root",
     Example:
         boot_policy_order_exists(handle, name="sample_boot", devices=devices)
     """
-    # create the boot_policy_order_tree
+    # build the expected boot order tree in memory
     try:
-        # check if devices is not empty
-        if not devices:
-            raise UcsOperationError(
-                "boot_policy_order_exists",
-                "No device present.")
-
-        boot_policy = boot_policy_get(handle=handle, name=name, org_dn=org_dn,
-                                      caller="boot_policy_order_exists")
-
-        # Add devices and configure boot order
-        _device_add(handle, boot_policy, devices)
+        expected_boot_policy = boot_policy_order_tree_build(devices, name,
+                                                            org_dn)
     except Exception as err:
         return False, None
 
-    expected_boot_policy = boot_policy
+    dn = org_dn + "/boot-policy-" + name
+    if cache is not None:
+        expected_fingerprint = boot_policy_order_fingerprint(
+            expected_boot_policy)
+        entry = cache.get(dn)
+        if entry is not None and entry[0] == expected_fingerprint:
+            return True, entry[1]
 
     try:
-        response = handle.query_dn(dn=boot_policy.dn,
-                                   hierarchy=True,
-                                   need_response=True)
-        existing_boot_policy = response.out_configs.child[0]
+        existing_boot_policy = _boot_policy_hierarchy_get(
+            handle, name, org_dn, caller="boot_policy_order_exists")
     except Exception as err:
         if debug:
             import traceback
             print str(traceback.print_exc())
         return False, None
 
+    if cache is not None:
+        try:
+            existing_fingerprint = boot_policy_order_fingerprint(
+                existing_boot_policy)
+        except Exception as err:
+            return False, None
+        cache.set(dn, existing_fingerprint, existing_boot_policy)
+        if existing_fingerprint == expected_fingerprint:
+            return True, existing_boot_policy
+
     try:
         _compare_boot_policy(existing_boot_policy, expected_boot_policy)
     except Exception as err:
         return False, None
 
-    return True, boot_policy
+    return True, existing_boot_policy
+
+
+def boot_policy_order_reconcile(handle, name, devices, org_dn="org-root"):
+    """
+    reconciles the boot order of a boot policy with the given devices
+
+    The boot policy is fetched with one hierarchical query and compared
+    with the expected boot order. Only the devices which are missing,
+    different or no longer expected are added, modified or removed,
+    in a single commit. Nothing is committed if the boot order matches.
+
+    Args:
+        handle (UcsHandle)
+        name (string): boot policy name
+        devices (list of dict): same format as in boot_policy_order_set
+        org_dn (string): org dn
+
+    Returns:
+        dict: {"added": [dn], "modified": [dn], "removed": [dn]}
+
+    Raises:
+        UcsOperationError: if LsbootPolicy is not present
+
+    Example:
+        boot_policy_order_reconcile(handle, name="sample_boot",
+                                    devices=devices)
+    """
+    if not devices:
+        raise UcsOperationError("boot_policy_order_reconcile",
+                                "No device present.")
+
+    expected_boot_policy = boot_policy_order_tree_build(devices, name, org_dn)
+
+    existing_boot_policy = _boot_policy_hierarchy_get(
+        handle, name, org_dn, caller="boot_policy_order_reconcile")
+
+    added, modified, removed = _boot_policy_delta_get(existing_boot_policy,
+                                                      expected_boot_policy)
+    delta = {"added": [mo.dn for mo in added],
+             "modified": [mo.dn for mo in modified],
+             "removed": [mo.dn for mo in removed]}
+    if not (added or modified or removed):
+        return delta
+
+    for mo in removed:
+        handle.remove_mo(mo)
+    for mo in added:
+        handle.add_mo(mo, modify_present=True)
+    for mo in modified:
+        # stage the changed object alone, without its children
+        parent_dn = mo.dn[:-len(mo.rn) - 1]
+        mo_class = mo_class_get(mo.get_class_id())
+        mo_ = mo_class(parent_mo_or_dn=parent_dn, **_mo_config_props_get(mo))
+        handle.set_mo(mo_)
+    handle.commit()
+    return delta
+
+
+def boot_policy_order_audit(handle, expected_by_policy):
+    """
+    audits the boot order of many boot policies
+
+    All the boot policies are fetched with their boot devices in one
+    hierarchical class query and compared in memory with the expected
+    boot order, device by device as in boot_policy_order_exists. Faults
+    and boot security are ignored, the boot devices this module does not
+    know of are reported as unexpected.
+
+    Args:
+        handle (UcsHandle)
+        expected_by_policy (dict): {boot policy dn: devices}, where devices
+            is a list of dict in the same format as in
+            boot_policy_order_set, or an expected tree returned by
+            boot_policy_order_tree_build. The same expected tree can be
+            shared by many boot policies.
+
+    Returns:
+        dict: {boot policy dn: {"match": True/False,
+                                "mismatches": [mismatch]}}
+
+        mismatch is a dict with the keys
+            "device": device name, None if the device is unknown or the
+                boot policy does not exist or could not be compared
+            "reason": "missing", "unexpected", "mismatch" or "error"
+            "rn": rn of the device, dn of the boot policy if the boot
+                policy does not exist or could not be compared
+            "message": error message of the comparison
+
+    Raises:
+        UcsOperationError: if the devices are not valid
+
+    Example:
+        expected = boot_policy_order_tree_build(devices=devices)
+        report = boot_policy_order_audit(
+            handle, {"org-root/boot-policy-b1": expected,
+                     "org-root/boot-policy-b2": expected})
+    """
+    expected_trees = {}
+    for dn, expected in expected_by_policy.items():
+        if isinstance(expected, list):
+            expected = boot_policy_order_tree_build(expected)
+        expected_trees[dn] = expected
+
+    response = handle.query_classid("LsbootPolicy", hierarchy=True,
+                                    need_response=True)
+    existing_trees = dict((mo.dn, mo) for mo in response.out_configs.child)
+
+    report = {}
+    for dn, expected_boot_policy in expected_trees.items():
+        existing_boot_policy = existing_trees.get(dn)
+        if existing_boot_policy is None:
+            mismatches = [{"device": None,
+                           "reason": "missing",
+                           "rn": dn,
+                           "message": "BootPolicy '%s' does not exist" % dn}]
+        else:
+            try:
+                mismatches = _boot_policy_mismatches_get(
+                    existing_boot_policy, expected_boot_policy)
+            except Exception as err:
+                mismatches = [{"device": None,
+                               "reason": "error",
+                               "rn": dn,
+                               "message": str(err)}]
+        report[dn] = {"match": not mismatches, "mismatches": mismatches}
+    return report
+
+
+def _boot_policy_chunk_commit(handle, chunk, stage, results):
+    for key in chunk:
+        stage(key)
+    try:
+        handle.commit()
+    except Exception as err:
+        handle.commit_buffer_discard()
+        if len(chunk) == 1:
+            results[chunk[0]] = err
+            return
+        # split the rejected chunk, so that one failing boot policy does
+        # not fail the others
+        middle = len(chunk) // 2
+        _boot_policy_chunk_commit(handle, chunk[:middle], stage, results)
+        _boot_policy_chunk_commit(handle, chunk[middle:], stage, results)
+
+
+def boot_policy_order_set_many(handle, names_by_org, devices,
+                               chunk_size=None):
+    """
+    sets the same boot order on boot policies of many orgs
+
+    The boot order tree is built once from the devices and cloned for
+    every boot policy. All the boot policies are fetched with one
+    hierarchical class query, and each boot order is replaced in place
+    as in boot_policy_order_set with single_transaction=True. The
+    changes are committed chunk_size boot policies at a time, a rejected
+    chunk is split and retried until the failing boot policies are found.
+
+    Args:
+        handle (UcsHandle)
+        names_by_org (dict): {org_dn: boot policy name}
+        devices (list of dict): same format as in boot_policy_order_set
+        chunk_size (int): boot policies per commit, all in one if None
+
+    Returns:
+        dict: {"results": {org_dn: None if succeeded,
+                           UcsOperationError/exception if failed},
+               "elapsed": wall-clock time in seconds}
+
+    Raises:
+        UcsOperationError: if the devices are not valid
+
+    Example:
+        boot_policy_order_set_many(
+            handle,
+            names_by_org={"org-root/org-hr": "sample_boot",
+                          "org-root/org-finance": "sample_boot"},
+            devices=devices,
+            chunk_size=10)
+    """
+    from ucsmsdk.mometa.lsboot.LsbootPolicy import LsbootPolicy
+
+    start = time.time()
+    expected_boot_policy = boot_policy_order_tree_build(devices)
+
+    results = dict((org_dn, None) for org_dn in names_by_org)
+    if not names_by_org:
+        return {"results": results, "elapsed": time.time() - start}
+
+    filter_str = " or ".join('(name, "%s", type="eq")' % name
+                             for name in sorted(set(names_by_org.values())))
+    response = handle.query_classid("LsbootPolicy", filter_str=filter_str,
+                                    hierarchy=True, need_response=True)
+    existing_trees = dict((mo.dn, mo) for mo in response.out_configs.child)
+
+    staged = []
+    for org_dn in sorted(names_by_org):
+        dn = org_dn + "/boot-policy-" + names_by_org[org_dn]
+        if dn not in existing_trees:
+            results[org_dn] = UcsOperationError(
+                "boot_policy_order_set_many",
+                "BootPolicy '%s' does not exist" % dn)
+        else:
+            staged.append(org_dn)
+
+    if not chunk_size:
+        chunk_size = len(staged) or 1
+
+    # the objects to remove are looked up once per boot policy, a rejected
+    # chunk is staged again from them when it is split
+    removed_by_org = {}
+
+    def stage(org_dn):
+        boot_policy = LsbootPolicy(parent_mo_or_dn=org_dn,
+                                   name=names_by_org[org_dn])
+        for mo in expected_boot_policy.child:
+            _mo_tree_clone(mo, boot_policy)
+        if org_dn not in removed_by_org:
+            removed_by_org[org_dn] = _boot_policy_removed_get(
+                existing_trees[boot_policy.dn], boot_policy)
+        _boot_policy_order_replace_stage(handle, removed_by_org[org_dn],
+                                         boot_policy)
+
+    for i in range(0, len(staged), chunk_size):
+        _boot_policy_chunk_commit(handle, staged[i:i + chunk_size], stage,
+                                  results)
+
+    return {"results": results, "elapsed": time.time() - start}
@@ -11,8 +11,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+from collections import namedtuple
+
 from ..utils.utils import blade_dn_get
 from ..utils.utils import rack_dn_get
+from ..utils.watcher import MoWatcher
+from .resolver import _server_class_ids
 from ucsmsdk.ucsexception import UcsOperationError
 from ucsmsdk.mometa.ls.LsPower import LsPowerConsts
 from ucsmsdk.mometa.ls.LsPower import LsPower
@@ -36,22 +41,34 @@ def _service_profile_power_set(
         chassis_id=None,
         blade_id=None,
         rack_id=None,
-        state=None):
+        state=None,
+        resolver=None):
     dn = _server_dn_get(
         chassis_id=chassis_id,
         blade_id=blade_id,
         rack_id=rack_id)
-    blade_mo = handle.query_dn(dn)
+    if resolver is not None:
+        blade_mo = resolver.server_get(dn)
+    else:
+        blade_mo = handle.query_dn(dn)
     if blade_mo is None:
         raise UcsOperationError(
             "server_power_set: Failed to set server power",
             "server %s does not exist" % (dn))
 
-    if blade_mo.assigned_to_dn is None:
+    if not blade_mo.assigned_to_dn:
         raise UcsOperationError(
             "server_power_set: Failed to set server power",
             "server %s is not associated to a service profile" % (dn))
 
+    if resolver is not None:
+        mo = LsPower(
+            parent_mo_or_dn=blade_mo.assigned_to_dn,
+            state=state)
+        handle.add_mo(mo, modify_present=True)
+        handle.commit()
+        return
+
     sp_mo = handle.query_dn(blade_mo.assigned_to_dn)
     LsPower(
         parent_mo_or_dn=sp_mo,
@@ -60,7 +77,84 @@ def _service_profile_power_set(
     handle.commit()
 
 
-def server_power_on(handle, chassis_id=None, blade_id=None, rack_id=None):
+def _oper_power_check(oper_power):
+    def check(props):
+        if props.get("oper_power") == oper_power:
+            return True
+        if props.get("oper_power") in ["error", "failed"]:
+            return False
+        return None
+    return check
+
+
+def _power_cycle_check(fsm_stamp=None):
+    # UCSM resets admin_power to "policy" once the request is processed,
+    # which is also the idle state before the cycle started. The cycle
+    # is only complete after it was observed: oper_power leaving "on", an
+    # FSM stage in progress, or an FSM completed after the request.
+    observed = [False]
+
+    def check(props):
+        if props.get("oper_power") in ["error", "failed"]:
+            return False
+        if props.get("oper_power") not in [None, "on"] or \
+                props.get("fsm_status") not in [None, "nop"] or \
+                (fsm_stamp is not None and
+                 props.get("fsm_stamp") not in [None, fsm_stamp]):
+            observed[0] = True
+        if observed[0] and \
+                props.get("admin_power") == "policy" and \
+                props.get("oper_power") == "on" and \
+                props.get("fsm_status") in [None, "nop"]:
+            return True
+        return None
+    return check
+
+
+def _server_power_wait(handle, dns, check, timeout=None, watcher=None,
+                       caller="server_power_wait"):
+    own_watcher = watcher is None
+    if own_watcher:
+        watcher = MoWatcher(handle, _server_class_ids)
+
+    for dn in dns:
+        watcher.watch(dn, check)
+    try:
+        status = watcher.wait(dns, timeout=timeout)
+    finally:
+        if own_watcher:
+            watcher.stop()
+
+    results = {}
+    for dn in dns:
+        if status[dn] is True:
+            results[dn] = None
+        elif status[dn] is False:
+            results[dn] = UcsOperationError(
+                caller,
+                "power operation failed on server %s" % (dn))
+        else:
+            results[dn] = UcsOperationError(
+                caller,
+                "server %s did not complete the power operation in %s "
+                "seconds" % (dn, timeout))
+    return results
+
+
+def _server_power_wait_one(handle, chassis_id, blade_id, rack_id, check,
+                           timeout, watcher, caller):
+    dn = _server_dn_get(
+        chassis_id=chassis_id,
+        blade_id=blade_id,
+        rack_id=rack_id)
+    results = _server_power_wait(handle, [dn], check, timeout=timeout,
+                                 watcher=watcher, caller=caller)
+    if results[dn] is not None:
+        raise results[dn]
+
+
+def server_power_on(handle, chassis_id=None, blade_id=None, rack_id=None,
+                    resolver=None, wait=False, timeout=600, watcher=None):
     """
     Power-On the server.
 
@@ -69,6 +163,12 @@ def server_power_on(handle, chassis_id=None, blade_id=None, rack_id=None):
         chassis_id (int): chassis id
         blade_id (int): blade id
         rack_id (int): rack id
+        resolver (ServerResolver): resolves the service profile from the
+            server index instead of querying the server
+        wait (bool): True/False, if True, waits until the operation completes
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): shares the event subscription with other
+            callers waiting concurrently, if wait is True
 
     Returns:
         None
@@ -85,10 +185,22 @@ def server_power_on(handle, chassis_id=None, blade_id=None, rack_id=None):
         chassis_id=chassis_id,
         blade_id=blade_id,
         rack_id=rack_id,
-        state=LsPowerConsts.STATE_UP)
-
-
-def server_power_off(handle, chassis_id=None, blade_id=None, rack_id=None):
+        state=LsPowerConsts.STATE_UP,
+        resolver=resolver)
+    if wait:
+        _server_power_wait_one(
+            handle=handle,
+            chassis_id=chassis_id,
+            blade_id=blade_id,
+            rack_id=rack_id,
+            check=_oper_power_check("on"),
+            timeout=timeout,
+            watcher=watcher,
+            caller="server_power_on")
+
+
+def server_power_off(handle, chassis_id=None, blade_id=None, rack_id=None,
+                     resolver=None, wait=False, timeout=600, watcher=None):
     """
     Power-Off the server.
 
@@ -97,6 +209,12 @@ def server_power_off(handle, chassis_id=None, blade_id=None, rack_id=None):
         chassis_id (int): chassis id
         blade_id (int): blade id
         rack_id (int): rack id
+        resolver (ServerResolver): resolves the service profile from the
+            server index instead of querying the server
+        wait (bool): True/False, if True, waits until the operation completes
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): shares the event subscription with other
+            callers waiting concurrently, if wait is True
 
     Returns:
         None
@@ -114,7 +232,18 @@ def server_power_off(handle, chassis_id=None, blade_id=None, rack_id=None):
         chassis_id=chassis_id,
         blade_id=blade_id,
         rack_id=rack_id,
-        state=LsPowerConsts.STATE_DOWN)
+        state=LsPowerConsts.STATE_DOWN,
+        resolver=resolver)
+    if wait:
+        _server_power_wait_one(
+            handle=handle,
+            chassis_id=chassis_id,
+            blade_id=blade_id,
+            rack_id=rack_id,
+            check=_oper_power_check("off"),
+            timeout=timeout,
+            watcher=watcher,
+            caller="server_power_off")
 
 
 def _server_admin_power_set(
@@ -134,16 +263,21 @@ def _server_admin_power_set(
             "server %s not found" %
             (dn))
 
+    fsm_stamp = mo.fsm_stamp
     mo.admin_power = state
     handle.set_mo(mo)
     handle.commit()
+    return fsm_stamp
 
 
 def server_power_cycle_wait(
         handle,
         chassis_id=None,
         blade_id=None,
-        rack_id=None):
+        rack_id=None,
+        wait=False,
+        timeout=600,
+        watcher=None):
     """
     Triggers a graceful OS shutdown and powercycle operation on the specified server.
 
@@ -152,6 +286,10 @@ def server_power_cycle_wait(
         chassis_id (int): chassis id
         blade_id (int): blade id
         rack_id (int): rack id
+        wait (bool): True/False, if True, waits until the operation completes
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): shares the event subscription with other
+            callers waiting concurrently, if wait is True
 
     Returns:
         None
@@ -164,19 +302,32 @@ def server_power_cycle_wait(
         server_power_cycle_wait(handle, rack_id=1)
     """
 
-    _server_admin_power_set(
+    fsm_stamp = _server_admin_power_set(
         handle=handle,
         chassis_id=chassis_id,
         blade_id=blade_id,
         rack_id=rack_id,
         state="cycle-wait")
+    if wait:
+        _server_power_wait_one(
+            handle=handle,
+            chassis_id=chassis_id,
+            blade_id=blade_id,
+            rack_id=rack_id,
+            check=_power_cycle_check(fsm_stamp),
+            timeout=timeout,
+            watcher=watcher,
+            caller="server_power_cycle_wait")
 
 
 def server_power_cycle_immediate(
         handle,
         chassis_id=None,
         blade_id=None,
-        rack_id=None):
+        rack_id=None,
+        wait=False,
+        timeout=600,
+        watcher=None):
     """
     Triggers an immediate powercycle operation on the specified server.
 
@@ -185,6 +336,10 @@ def server_power_cycle_immediate(
         chassis_id (int): chassis id
         blade_id (int): blade id
         rack_id (int): rack id
+        wait (bool): True/False, if True, waits until the operation completes
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): shares the event subscription with other
+            callers waiting concurrently, if wait is True
 
     Returns:
         None
@@ -197,9 +352,458 @@ def server_power_cycle_immediate(
         server_power_cycle_immediate(handle, rack_id=1)
     """
 
-    _server_admin_power_set(
+    fsm_stamp = _server_admin_power_set(
         handle=handle,
         chassis_id=chassis_id,
         blade_id=blade_id,
         rack_id=rack_id,
         state="cycle-immediate")
+    if wait:
+        _server_power_wait_one(
+            handle=handle,
+            chassis_id=chassis_id,
+            blade_id=blade_id,
+            rack_id=rack_id,
+            check=_power_cycle_check(fsm_stamp),
+            timeout=timeout,
+            watcher=watcher,
+            caller="server_power_cycle_immediate")
+
+
+def _server_dns_get(servers):
+    dns = []
+    for server in servers:
+        dn = _server_dn_get(**server)
+        if dn not in dns:
+            dns.append(dn)
+    return dns
+
+
+def _service_profile_power_set_bulk(
+        handle,
+        dns,
+        state,
+        chunk_size=None,
+        resolver=None,
+        caller="server_power_set_bulk",
+        server_mos=None):
+    results = dict((dn, None) for dn in dns)
+    if not dns:
+        return results
+
+    if server_mos is None:
+        if resolver is not None:
+            server_mos = dict((dn, resolver.server_get(dn)) for dn in dns)
+        else:
+            server_mos = handle.query_dns(dns)
+
+    staged = []
+    for dn in dns:
+        server_mo = server_mos.get(dn)
+        if server_mo is None:
+            results[dn] = UcsOperationError(
+                "%s: Failed to set server power" % caller,
+                "server %s does not exist" % (dn))
+        elif not server_mo.assigned_to_dn:
+            results[dn] = UcsOperationError(
+                "%s: Failed to set server power" % caller,
+                "server %s is not associated to a service profile" % (dn))
+        else:
+            staged.append((dn, server_mo.assigned_to_dn))
+
+    if not chunk_size:
+        chunk_size = len(staged) or 1
+
+    for i in range(0, len(staged), chunk_size):
+        chunk = staged[i:i + chunk_size]
+        for dn, sp_dn in chunk:
+            mo = LsPower(parent_mo_or_dn=sp_dn, state=state)
+            handle.add_mo(mo, modify_present=True)
+        try:
+            handle.commit()
+        except Exception as err:
+            handle.commit_buffer_discard()
+            for dn, sp_dn in chunk:
+                results[dn] = err
+
+    return results
+
+
+def _service_profile_power_wait_bulk(handle, results, state, timeout,
+                                     watcher, caller):
+    oper_power = "on" if state == LsPowerConsts.STATE_UP else "off"
+    committed = [dn for dn in results if results[dn] is None]
+    if committed:
+        results.update(_server_power_wait(
+            handle,
+            committed,
+            _oper_power_check(oper_power),
+            timeout=timeout,
+            watcher=watcher,
+            caller=caller))
+
+
+def server_power_set_bulk(handle, servers, state, chunk_size=None,
+                          resolver=None, wait=False, timeout=600,
+                          watcher=None):
+    """
+    Sets the power state of many servers in as few commits as possible.
+
+    All the servers are resolved with a single query and the LsPower of
+    every associated service profile is staged in the commit buffer, which
+    is then pushed in one commit, or in one commit per chunk.
+
+    Args:
+        handle (UcsHandle)
+        servers (list of dict): servers identified by either of
+            {"chassis_id": chassis_id, "blade_id": blade_id} or
+            {"rack_id": rack_id}
+        state (string): power state, valid values are "up" or "down"
+        chunk_size (int): number of servers per commit,
+            all servers are committed at once if None
+        resolver (ServerResolver): resolves the servers from the server
+            index instead of querying them
+        wait (bool): True/False, if True, waits on a single event
+            subscription until every server reaches the power state
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): watcher to wait with, if wait is True
+
+    Returns:
+        dict: {server_dn: None on success, exception on failure}
+
+    Raises:
+        UcsOperationError: if a server is not specified correctly
+
+    Example:
+        servers = [{"chassis_id": 1, "blade_id": 1},
+                   {"chassis_id": 1, "blade_id": 2},
+                   {"rack_id": 1}]
+        server_power_set_bulk(handle, servers, state="up", chunk_size=50)
+    """
+    dns = _server_dns_get(servers)
+    results = _service_profile_power_set_bulk(
+        handle=handle,
+        dns=dns,
+        state=state,
+        chunk_size=chunk_size,
+        resolver=resolver)
+
+    if wait:
+        _service_profile_power_wait_bulk(handle, results, state,
+                                         timeout=timeout, watcher=watcher,
+                                         caller="server_power_set_bulk")
+    return results
+
+
+def _server_power_group_get(dn):
+    # blades in a chassis share the chassis power supplies,
+    # every rack unit has its own.
+    if "/blade-" in dn:
+        return dn.rsplit("/", 1)[0]
+    return dn
+
+
+def server_power_on_staggered(handle, servers, max_per_chassis=1,
+                              watts_per_chassis=None, watts_per_server=None,
+                              poll_sec=5, timeout=1800, chunk_size=None,
+                              callback=None, resolver=None):
+    """
+    Powers on servers in waves to limit the inrush current per chassis.
+
+    A wave is released with one commit and each server is counted against
+    its chassis budget until it reports oper_power "on". The servers in
+    flight are polled together with a single query every poll_sec seconds,
+    and the next wave is released as soon as there is budget for it.
+
+    Args:
+        handle (UcsHandle)
+        servers (list of dict): servers identified by either of
+            {"chassis_id": chassis_id, "blade_id": blade_id} or
+            {"rack_id": rack_id}
+        max_per_chassis (int): servers powering on at once per chassis,
+            no limit if None
+        watts_per_chassis (int): inrush power budget per chassis,
+            no limit if None
+        watts_per_server (int or dict): inrush power of a server, either
+            a single value or {server_dn: watts}.
+            Mandatory if watts_per_chassis is specified.
+        poll_sec (int): polling interval in seconds
+        timeout (int): time in seconds after which the servers which are
+            not on yet are reported as failed
+        chunk_size (int): number of servers per commit within a wave
+        callback (function): called with (done, total, elapsed) whenever
+            servers complete
+        resolver (ServerResolver): resolves the servers from the server
+            index instead of querying them
+
+    Returns:
+        dict: {"results": {server_dn: None on success,
+                           exception on failure},
+               "waves": number of waves released,
+               "elapsed": wall-clock time in seconds}
+
+    Raises:
+        UcsOperationError: if a server is not specified correctly or the
+            power budget is incomplete
+
+    Example:
+        servers = [{"chassis_id": 1, "blade_id": blade_id}
+                   for blade_id in range(1, 9)]
+        server_power_on_staggered(handle, servers, max_per_chassis=2)
+        server_power_on_staggered(handle, servers, max_per_chassis=None,
+                                  watts_per_chassis=2500,
+                                  watts_per_server=600)
+    """
+    if watts_per_chassis is not None and watts_per_server is None:
+        raise UcsOperationError(
+            "server_power_on_staggered",
+            "Required parameter 'watts_per_server' missing.")
+
+    def _watts_get(dn):
+        if watts_per_server is None:
+            return 0
+        if isinstance(watts_per_server, dict):
+            if dn not in watts_per_server:
+                raise UcsOperationError(
+                    "server_power_on_staggered",
+                    "Power of server %s not specified." % (dn))
+            return watts_per_server[dn]
+        return watts_per_server
+
+    dns = _server_dns_get(servers)
+    watts = dict((dn, _watts_get(dn)) for dn in dns)
+
+    pending = {}
+    group_order = []
+    for dn in dns:
+        group = _server_power_group_get(dn)
+        if group not in pending:
+            pending[group] = []
+            group_order.append(group)
+        pending[group].append(dn)
+
+    in_flight = dict((group, []) for group in group_order)
+    results = {}
+    waves = 0
+    total = len(dns)
+    start = time.time()
+
+    def _admissible(group, dn):
+        flying = in_flight[group]
+        if not flying:
+            return True
+        if max_per_chassis is not None and len(flying) >= max_per_chassis:
+            return False
+        if watts_per_chassis is not None:
+            used = sum([watts[dn_] for dn_ in flying])
+            if used + watts[dn] > watts_per_chassis:
+                return False
+        return True
+
+    while True:
+        wave = []
+        for group in group_order:
+            while pending[group] and _admissible(group, pending[group][0]):
+                dn = pending[group].pop(0)
+                in_flight[group].append(dn)
+                wave.append(dn)
+
+        if wave:
+            waves += 1
+            wave_results = _service_profile_power_set_bulk(
+                handle=handle,
+                dns=wave,
+                state=LsPowerConsts.STATE_UP,
+                chunk_size=chunk_size,
+                resolver=resolver,
+                caller="server_power_on_staggered")
+            for dn in wave:
+                if wave_results[dn] is not None:
+                    results[dn] = wave_results[dn]
+                    in_flight[_server_power_group_get(dn)].remove(dn)
+
+        flying = [dn for group in group_order for dn in in_flight[group]]
+        if not flying:
+            if not any(pending.values()):
+                break
+            continue
+
+        if time.time() - start >= timeout:
+            for group in group_order:
+                for dn in in_flight[group] + pending[group]:
+                    results[dn] = UcsOperationError(
+                        "server_power_on_staggered",
+                        "server %s did not power on in %s seconds" %
+                        (dn, timeout))
+                in_flight[group] = []
+                pending[group] = []
+            break
+
+        time.sleep(poll_sec)
+
+        completed = False
+        server_mos = handle.query_dns(flying)
+        for dn in flying:
+            server_mo = server_mos.get(dn)
+            if server_mo is not None and server_mo.oper_power == "on":
+                results[dn] = None
+                in_flight[_server_power_group_get(dn)].remove(dn)
+                completed = True
+
+        if completed and callback is not None:
+            callback(len(results), total, time.time() - start)
+
+    return {"results": results,
+            "waves": waves,
+            "elapsed": time.time() - start}
+
+
+ServerPowerState = namedtuple(
+    "ServerPowerState",
+    ["dn", "chassis_id", "slot_id", "oper_power", "admin_power",
+     "assigned_to_dn"])
+
+
+def _server_power_state_get(mo):
+    if mo.get_class_id() == "ComputeBlade":
+        chassis_id = mo.chassis_id
+        slot_id = mo.slot_id
+    else:
+        chassis_id = None
+        slot_id = mo.id
+    return ServerPowerState(
+        dn=mo.dn,
+        chassis_id=chassis_id,
+        slot_id=slot_id,
+        oper_power=mo.oper_power,
+        admin_power=mo.admin_power,
+        assigned_to_dn=mo.assigned_to_dn or None)
+
+
+def server_power_state_get_all(handle, filter_str=None):
+    """
+    Gets the power state of all the blades and rack units.
+
+    Args:
+        handle (UcsHandle)
+        filter_str (string): filter applied to both the ComputeBlade and the
+            ComputeRackUnit query, same syntax as query_classid
+
+    Returns:
+        list of ServerPowerState: (dn, chassis_id, slot_id, oper_power,
+            admin_power, assigned_to_dn) sorted by dn.
+            chassis_id is None and slot_id is the rack id for rack units.
+
+    Raises:
+        None
+
+    Example:
+        server_power_state_get_all(handle)
+        server_power_state_get_all(
+            handle, filter_str='(oper_power, "on", type="eq")')
+    """
+    if filter_str is None:
+        class_mos = handle.query_classids(_server_class_ids)
+        mos = [mo for class_id in _server_class_ids
+               for mo in class_mos.get(class_id, [])]
+    else:
+        mos = []
+        for class_id in _server_class_ids:
+            mos.extend(handle.query_classid(class_id=class_id,
+                                            filter_str=filter_str))
+
+    states = [_server_power_state_get(mo) for mo in mos]
+    states.sort(key=lambda state: state.dn)
+    return states
+
+
+def _scope_servers_get(handle, chassis_id=None, pool_dn=None, org_dn=None):
+    scopes = [scope for scope in [chassis_id, pool_dn, org_dn]
+              if scope is not None]
+    if len(scopes) != 1:
+        raise UcsOperationError(
+            "server_power_set_scope: Failed to set power state",
+            "Specify exactly one of chassis_id, pool_dn or org_dn")
+
+    if chassis_id is not None:
+        mos = handle.query_classid(
+            class_id="ComputeBlade",
+            filter_str='(chassis_id, "%s", type="eq")' % chassis_id)
+        server_mos = dict((mo.dn, mo) for mo in mos)
+        dns = [_server_dn_get(chassis_id=mo.chassis_id, blade_id=mo.slot_id)
+               for mo in mos]
+        return dns, server_mos
+
+    dns = []
+    if pool_dn is not None:
+        for mo in handle.query_children(in_dn=pool_dn):
+            class_id = mo.get_class_id()
+            if class_id == "ComputePooledSlot":
+                dns.append(_server_dn_get(chassis_id=mo.chassis_id,
+                                          blade_id=mo.slot_id))
+            elif class_id == "ComputePooledRackUnit":
+                dns.append(_server_dn_get(rack_id=mo.id))
+        return dns, None
+
+    # service profiles of the org and of all its sub-orgs
+    mos = handle.query_classid(
+        class_id="LsServer",
+        filter_str='(dn, "^%s/", type="re")' % org_dn)
+    for mo in mos:
+        if mo.type == "instance" and mo.pn_dn and mo.pn_dn not in dns:
+            dns.append(mo.pn_dn)
+    return dns, None
+
+
+def server_power_set_scope(handle, state, chassis_id=None, pool_dn=None,
+                           org_dn=None, chunk_size=None, wait=False,
+                           timeout=600, watcher=None):
+    """
+    Sets the power state of every server in a scope.
+
+    The scope is either all the blades of a chassis, all the servers of a
+    server pool, or all the servers associated to the service profiles of
+    an org and its sub-orgs. It is resolved with a single query and the
+    power state is applied in batched commits.
+
+    Args:
+        handle (UcsHandle)
+        state (string): power state, valid values are "up" or "down"
+        chassis_id (int): chassis id
+        pool_dn (string): server pool dn
+        org_dn (string): org dn
+        chunk_size (int): number of servers per commit,
+            all servers are committed at once if None
+        wait (bool): True/False, if True, waits until every server reaches
+            the power state
+        timeout (int): time in seconds to wait for, if wait is True
+        watcher (MoWatcher): watcher to wait with, if wait is True
+
+    Returns:
+        dict: {server_dn: None on success, exception on failure}
+
+    Raises:
+        UcsOperationError: if not exactly one scope is specified
+
+    Example:
+        server_power_set_scope(handle, state="down", chassis_id=3)
+        server_power_set_scope(handle, state="up",
+                               pool_dn="org-root/compute-pool-X")
+        server_power_set_scope(handle, state="down",
+                               org_dn="org-root/org-hpc", chunk_size=50)
+    """
+    dns, server_mos = _scope_servers_get(handle, chassis_id=chassis_id,
+                                         pool_dn=pool_dn, org_dn=org_dn)
+    results = _service_profile_power_set_bulk(
+        handle=handle,
+        dns=dns,
+        state=state,
+        chunk_size=chunk_size,
+        caller="server_power_set_scope",
+        server_mos=server_mos)
+
+    if wait:
+        _service_profile_power_wait_bulk(handle, results, state,
+                                         timeout=timeout, watcher=watcher,
+                                         caller="server_power_set_scope")
+    return results
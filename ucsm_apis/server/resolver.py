@@ -0,0 +1,124 @@
+# Copyright 2017 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+This module maintains an index of servers and their service profiles.
+"""
+import time
+
+_server_class_ids = ["ComputeBlade", "ComputeRackUnit"]
+
+
+class ServerResolver(object):
+    """
+    Indexes every ComputeBlade and ComputeRackUnit of a domain by dn.
+
+    The index is loaded with a single class query and is shared by the
+    helpers which need to map a server to its service profile, instead of
+    querying each server separately.
+
+    Args:
+        handle (UcsHandle)
+        ttl (int): seconds after which the index is reloaded on lookup,
+            the index is only reloaded by refresh() if None
+
+    Example:
+        resolver = ServerResolver(handle, ttl=60)
+        server_power_on(handle, chassis_id=1, blade_id=1, resolver=resolver)
+        print(resolver.hits, resolver.misses)
+    """
+
+    def __init__(self, handle, ttl=None):
+        self.handle = handle
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.refresh_count = 0
+        self._servers = {}
+        self._refresh_time = None
+
+    def refresh(self):
+        """
+        Reloads all the servers with one class query.
+
+        Returns:
+            None
+        """
+        class_mos = self.handle.query_classids(_server_class_ids)
+
+        servers = {}
+        for mos in class_mos.values():
+            for mo in mos:
+                servers[mo.dn] = mo
+
+        self._servers = servers
+        self._refresh_time = time.time()
+        self.refresh_count += 1
+
+    def is_stale(self):
+        """
+        Checks if the index needs to be reloaded.
+
+        Returns:
+            True/False
+        """
+        if self._refresh_time is None:
+            return True
+        if self.ttl is None:
+            return False
+        return time.time() - self._refresh_time >= self.ttl
+
+    def server_get(self, dn):
+        """
+        Gets the server managed object from the index.
+
+        Args:
+            dn (string): server dn
+
+        Returns:
+            ComputeBlade/ComputeRackUnit: managed object or None
+        """
+        if self.is_stale():
+            self.refresh()
+
+        mo = self._servers.get(dn)
+        if mo is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return mo
+
+    def assigned_to_dn_get(self, dn):
+        """
+        Gets the dn of the service profile associated to the server.
+
+        Args:
+            dn (string): server dn
+
+        Returns:
+            string: service profile dn or None
+        """
+        mo = self.server_get(dn)
+        if mo is None or not mo.assigned_to_dn:
+            return None
+        return mo.assigned_to_dn
+
+    def servers_get(self):
+        """
+        Gets all the indexed servers.
+
+        Returns:
+            dict: {server_dn: ComputeBlade/ComputeRackUnit}
+        """
+        if self.is_stale():
+            self.refresh()
+        return dict(self._servers)
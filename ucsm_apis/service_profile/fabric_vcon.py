@@ -4,6 +4,9 @@ This module intends on creating higher level api calls for establishing an
 """
 from ucsmsdk.ucsexception import UcsOperationError
 
+from ..utils.utils import _mo_props_differ_get
+from ..utils.utils import mo_class_get
+
 def fabric_vcon_create(handle, id, ls_server_dn, fabric='NONE', 
 					   inst_type="manual", placement="physical", select="all", 
 					   share="shared", transport="ethernet", **kwargs):
@@ -152,5 +155,146 @@ def fabric_vcon_delete(handle, id, ls_server_dn):
 	
 	mo = fabric_vcon_get(handle=handle, id=id, ls_server_dn=ls_server_dn,
 						 caller="fabric_vcon_delete")
-	handle.remove_mo()
-	handle.commit()
\ No newline at end of file
+	handle.remove_mo(mo)
+	handle.commit()
+	
+def _fabric_vcon_placement_changes_get(mo, props):
+	if mo is not None:
+		return _mo_props_differ_get(mo, props)
+	return dict((prop, (None, value)) for prop, value in props.items()
+				if value is not None)
+				
+def _fabric_vcon_placement_plan(ls_server_dn, existing, vcons, vnics):
+	# returns [(mo or None, class_id, rn, changes)], raises if a vnic is
+	# not present
+	plan = []
+	for id in sorted(vcons):
+		rn = "vcon-" + id
+		mo = existing.get(ls_server_dn + "/" + rn)
+		changes = _fabric_vcon_placement_changes_get(mo, vcons[id])
+		if changes:
+			plan.append((mo, "FabricVCon", rn, changes))
+			
+	for class_id, prefix in [("VnicEther", "ether-"), ("VnicFc", "fc-")]:
+		for name in sorted(vnics[class_id]):
+			dn = ls_server_dn + "/" + prefix + name
+			mo = existing.get(dn)
+			if mo is None:
+				raise UcsOperationError("fabric_vcon_placement_set_many",
+										"%s '%s' does not exist" %
+										(class_id, dn))
+			changes = _fabric_vcon_placement_changes_get(
+				mo, vnics[class_id][name])
+			if changes:
+				plan.append((mo, class_id, prefix + name, changes))
+	return plan
+	
+def fabric_vcon_placement_set_many(handle, ls_server_dns, vcons=None,
+								   vnic_ethers=None, vnic_fcs=None,
+								   chunk_size=50, dry_run=False):
+	"""
+	sets the vcon placement of many service profiles
+	
+	The FabricVCon, VnicEther and VnicFc objects to change are fetched by
+	dn, with one query per chunk_size service profiles. The complete set
+	of vcon and vnic changes is computed for each service profile, and
+	the changes of chunk_size service profiles are applied with one
+	commit.
+	
+	Args:
+		handle (UcsHandle)
+		ls_server_dns (list of string): dns of the service profiles
+		vcons (dict): {id: {property: value}} of the FabricVCon, e.g.
+			{"1": {"fabric": "A", "select": "all"}}, missing vcons are
+			created
+		vnic_ethers (dict): {vnic ether name: {property: value}}, e.g.
+			{"eth0": {"admin_vcon": "1", "order": "1", "switch_id": "A"}}
+		vnic_fcs (dict): {vnic fc name: {property: value}}
+		chunk_size (int): service profiles per commit
+		dry_run (bool): only reports the changes, nothing is committed
+		
+	Returns:
+		dict: {"results": {ls_server_dn: None if modified,
+						   UcsOperationError/exception if failed},
+			   "skipped": [ls_server_dn already matching],
+			   "changes": {dn: {property: (current value, value)}},
+			   "commits": number of commits}
+			   
+	Raises:
+		None
+		
+	Example:
+		fabric_vcon_placement_set_many(
+			handle, ["org-root/ls-web-%d" % i for i in range(400)],
+			vcons={"1": {"fabric": "A"}, "2": {"fabric": "B"}},
+			vnic_ethers={"eth0": {"admin_vcon": "1", "order": "1"},
+						 "eth1": {"admin_vcon": "2", "order": "2"}},
+			vnic_fcs={"fc0": {"admin_vcon": "1", "order": "3"}},
+			dry_run=True)
+	"""
+	vcons = dict((str(id), props) for id, props in (vcons or {}).items())
+	vnics = {"VnicEther": vnic_ethers or {}, "VnicFc": vnic_fcs or {}}
+	rns = ["vcon-" + id for id in vcons]
+	rns.extend("ether-" + name for name in vnics["VnicEther"])
+	rns.extend("fc-" + name for name in vnics["VnicFc"])
+	
+	existing = {}
+	ls_server_dns = list(ls_server_dns)
+	if rns:
+		for i in range(0, len(ls_server_dns), chunk_size):
+			dns = [ls_server_dn + "/" + rn
+				   for ls_server_dn in ls_server_dns[i:i + chunk_size]
+				   for rn in rns]
+			for dn, mo in handle.query_dns(dns).items():
+				if mo is not None:
+					existing[dn] = mo
+					
+	results = {}
+	skipped = []
+	changes = {}
+	plans = []
+	for ls_server_dn in ls_server_dns:
+		try:
+			plan = _fabric_vcon_placement_plan(ls_server_dn, existing, vcons,
+											   vnics)
+		except UcsOperationError as err:
+			results[ls_server_dn] = err
+			continue
+		if not plan:
+			skipped.append(ls_server_dn)
+			continue
+		for mo, class_id, rn, mo_changes in plan:
+			changes[ls_server_dn + "/" + rn] = mo_changes
+		plans.append((ls_server_dn, plan))
+		
+	commits = 0
+	if dry_run:
+		plans = []
+		
+	for i in range(0, len(plans), chunk_size):
+		chunk = plans[i:i + chunk_size]
+		for ls_server_dn, plan in chunk:
+			for mo, class_id, rn, mo_changes in plan:
+				props = dict((prop, str(mo_changes[prop][1]))
+							 for prop in mo_changes)
+				if mo is None:
+					mo = mo_class_get(class_id)(parent_mo_or_dn=ls_server_dn,
+												id=rn[len("vcon-"):])
+					mo.set_prop_multiple(**props)
+					handle.add_mo(mo, modify_present=True)
+				else:
+					mo.set_prop_multiple(**props)
+					handle.set_mo(mo)
+			results[ls_server_dn] = None
+		commits += 1
+		try:
+			handle.commit()
+		except Exception as err:
+			handle.commit_buffer_discard()
+			for ls_server_dn, plan in chunk:
+				results[ls_server_dn] = err
+				
+	return {"results": results,
+			"skipped": sorted(skipped),
+			"changes": changes,
+			"commits": commits}
@@ -0,0 +1,199 @@
+"""
+This module intends on creating an index of the identities (MAC, WWPN and
+ UUID) of the service profiles
+"""
+import json
+import os
+import time
+
+_identity_class_ids = ["LsServer", "VnicEther", "VnicFc"]
+_identity_kinds = ["mac", "wwpn", "uuid"]
+
+
+def _identity_get(mo):
+	class_id = mo.get_class_id()
+	if class_id == "LsServer":
+		kind, value, sp_dn = "uuid", mo.uuid, mo.dn
+	else:
+		kind = "mac" if class_id == "VnicEther" else "wwpn"
+		value, sp_dn = mo.addr, mo.dn.rsplit("/", 1)[0]
+		# vnics of connectivity policies and vnic templates
+		if not sp_dn.rsplit("/", 1)[-1].startswith("ls-"):
+			return None
+	if not value or value in ["derived", "0"]:
+		return None
+	return kind, value.upper(), sp_dn
+	
+class LsIdentityIndex(object):
+	"""
+	Indexes the MAC of every VnicEther, the WWPN of every VnicFc and the
+	UUID of every LsServer.
+	
+	The index is loaded with one class query, and each service profile
+	can then be refreshed on its own with one hierarchical query. If
+	cache_path is given, the index is saved there on refresh and loaded
+	from there on creation, so it survives process restarts.
+	
+	Args:
+		handle (UcsHandle)
+		ttl (int): seconds after which the index is reloaded on lookup,
+			the index is only reloaded by refresh() if None
+		cache_path (string): path of the on-disk cache
+		
+	Example:
+		index = LsIdentityIndex(handle, ttl=3600,
+								cache_path="/var/tmp/ucs_identity.json")
+		index.mac_get("00:25:B5:00:00:1F")
+		index.ls_server_refresh("org-root/ls-web-1")
+	"""
+	
+	def __init__(self, handle, ttl=None, cache_path=None):
+		self.handle = handle
+		self.ttl = ttl
+		self.cache_path = cache_path
+		self.refresh_count = 0
+		self._index = dict((kind, {}) for kind in _identity_kinds)
+		self._sp_identities = {}
+		self._refresh_time = None
+		if cache_path is not None and os.path.exists(cache_path):
+			self.load()
+			
+	def _add(self, mo):
+		identity = _identity_get(mo)
+		if identity is None:
+			return
+		kind, value, sp_dn = identity
+		self._index[kind][value] = (sp_dn, mo.dn)
+		self._sp_identities.setdefault(sp_dn, []).append((kind, value))
+		
+	def _ls_server_remove(self, sp_dn):
+		for kind, value in self._sp_identities.pop(sp_dn, []):
+			if self._index[kind].get(value, (None,))[0] == sp_dn:
+				del self._index[kind][value]
+				
+	def refresh(self):
+		"""
+		Reloads all the identities with one class query.
+		
+		Returns:
+			None
+		"""
+		class_mos = self.handle.query_classids(_identity_class_ids)
+		
+		self._index = dict((kind, {}) for kind in _identity_kinds)
+		self._sp_identities = {}
+		for mos in class_mos.values():
+			for mo in mos:
+				self._add(mo)
+				
+		self._refresh_time = time.time()
+		self.refresh_count += 1
+		if self.cache_path is not None:
+			self.save()
+			
+	def ls_server_refresh(self, sp_dn):
+		"""
+		Reloads the identities of one service profile.
+		
+		Args:
+			sp_dn (string): service profile dn
+			
+		Returns:
+			None
+		"""
+		mos = self.handle.query_dn(sp_dn, hierarchy=True) or []
+		
+		self._ls_server_remove(sp_dn)
+		for mo in mos:
+			if mo.get_class_id() in _identity_class_ids:
+				self._add(mo)
+		if self.cache_path is not None:
+			self.save()
+			
+	def is_stale(self):
+		"""
+		Checks if the index needs to be reloaded.
+		
+		Returns:
+			True/False
+		"""
+		if self._refresh_time is None:
+			return True
+		if self.ttl is None:
+			return False
+		return time.time() - self._refresh_time >= self.ttl
+		
+	def save(self):
+		"""
+		Saves the index to cache_path.
+		
+		Returns:
+			None
+		"""
+		data = {"time": self._refresh_time}
+		for kind in _identity_kinds:
+			data[kind] = self._index[kind]
+		tmp_path = self.cache_path + ".tmp"
+		with open(tmp_path, "w") as cache_file:
+			json.dump(data, cache_file)
+		os.rename(tmp_path, self.cache_path)
+		
+	def load(self):
+		"""
+		Loads the index from cache_path.
+		
+		Returns:
+			None
+		"""
+		with open(self.cache_path) as cache_file:
+			data = json.load(cache_file)
+			
+		self._index = dict((kind, {}) for kind in _identity_kinds)
+		self._sp_identities = {}
+		for kind in _identity_kinds:
+			for value, (sp_dn, dn) in data[kind].items():
+				self._index[kind][value] = (sp_dn, dn)
+				self._sp_identities.setdefault(sp_dn, []).append(
+					(kind, value))
+		self._refresh_time = data["time"]
+		
+	def _get(self, kind, value):
+		if self.is_stale():
+			self.refresh()
+		return self._index[kind].get(value.upper())
+		
+	def mac_get(self, mac):
+		"""
+		Gets the owner of a MAC address.
+		
+		Args:
+			mac (string): MAC address
+			
+		Returns:
+			(service profile dn, VnicEther dn) or None
+		"""
+		return self._get("mac", mac)
+		
+	def wwpn_get(self, wwpn):
+		"""
+		Gets the owner of a WWPN.
+		
+		Args:
+			wwpn (string): WWPN
+			
+		Returns:
+			(service profile dn, VnicFc dn) or None
+		"""
+		return self._get("wwpn", wwpn)
+		
+	def uuid_get(self, uuid):
+		"""
+		Gets the owner of a UUID.
+		
+		Args:
+			uuid (string): UUID
+			
+		Returns:
+			(service profile dn, service profile dn) or None
+		"""
+		return self._get("uuid", uuid)
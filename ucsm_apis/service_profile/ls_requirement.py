@@ -2,8 +2,13 @@
 This module intends on creating higher level api calls for establishing an
  LsRequirement
 """
+import math
+import time
+
 from ucsmsdk.ucsexception import UcsOperationError
 
+from ..utils.watcher import MoWatcher
+
 def ls_requirement_create(handle, ls_server_dn ,name=None, qualifier=None, 
 						  restrict_migration=None, **kwargs):
 	"""
@@ -144,3 +149,136 @@ def ls_requirement_delete(handle, ls_server_dn):
 	handle.remove_mo(mo)
 	handle.commit()
 	
+def _ls_server_assoc_check(props):
+	if props.get("assoc_state") == "failed" or \
+			props.get("config_state") == "failed-to-apply":
+		return False
+	if props.get("assoc_state") == "associated" and \
+			props.get("config_state") == "applied":
+		return True
+	return None
+	
+def _ls_server_bind_check(mo=None):
+	# an ls server may already be associated and applied before the
+	# binding, it only completes once the binding was observed: its
+	# assoc_state or config_state leaving the prior value, or its pn_dn
+	# changing
+	prior = {}
+	if mo is not None:
+		prior = dict((prop, getattr(mo, prop, None))
+					 for prop in ["assoc_state", "config_state", "pn_dn"])
+	observed = [not prior]
+	
+	def check(props):
+		if any(props.get(prop) not in [None, value]
+			   for prop, value in prior.items()):
+			observed[0] = True
+		if not observed[0]:
+			return None
+		return _ls_server_assoc_check(props)
+	return check
+	
+def _percentiles_get(values, percents=(50, 90, 99)):
+	# nearest-rank percentiles
+	if not values:
+		return {}
+	values = sorted(values)
+	percentiles = dict(("p%d" % percent,
+						values[int(math.ceil(percent / 100.0 *
+											 len(values))) - 1])
+					   for percent in percents)
+	percentiles["max"] = values[-1]
+	return percentiles
+	
+def ls_requirement_bind_many(handle, ls_server_dns, name, qualifier=None,
+							 restrict_migration=None, timeout=3600,
+							 poll_sec=None):
+	"""
+	binds many ls servers to a server pool and waits for their association
+	
+	The LsRequirement of every ls server is set with one commit. The
+	association of all the ls servers is then tracked from one LsServer
+	event subscription, or one configResolveDns per poll if poll_sec is
+	specified, until every one is associated, failed or timed out. An ls
+	server only counts as associated once its association state was seen
+	changing after the commit, so that the ls servers which were already
+	associated do not complete at once.
+	
+	Args:
+		handle (UcsHandle)
+		ls_server_dns (list of string): dns of the ls servers
+		name (string): name of the server pool
+		qualifier (string): name of the server pool qualification policy
+		restrict_migration (string): "yes" or "no"
+		timeout (int): seconds to wait for the association
+		poll_sec (int): polling interval in seconds, events are used if None
+		
+	Returns:
+		dict: {"results": {ls_server_dn: None if associated,
+						   UcsOperationError/exception if failed or timed
+						   out},
+			   "times": {ls_server_dn: seconds from the commit to the
+						 association},
+			   "percentiles": {"p50", "p90", "p99", "max": seconds},
+			   "elapsed": wall-clock time in seconds}
+			   
+	Raises:
+		None
+		
+	Example:
+		ls_requirement_bind_many(handle,
+								 ["org-root/ls-web-%d" % i for i in range(40)],
+								 name="rack-12", timeout=3600)
+	"""
+	from ucsmsdk.mometa.ls.LsRequirement import LsRequirement
+	
+	caller = "ls_requirement_bind_many"
+	start = time.time()
+	# the association state before the binding, in one query
+	prior_mos = handle.query_dns(ls_server_dns) if ls_server_dns else {}
+	for ls_server_dn in ls_server_dns:
+		mo = LsRequirement(parent_mo_or_dn=ls_server_dn, name=name,
+						   qualifier=qualifier,
+						   restrict_migration=restrict_migration)
+		handle.add_mo(mo, modify_present=True)
+	try:
+		handle.commit()
+	except Exception as err:
+		handle.commit_buffer_discard()
+		return {"results": dict((dn, err) for dn in ls_server_dns),
+				"times": {},
+				"percentiles": {},
+				"elapsed": time.time() - start}
+				
+	committed = time.time()
+	times = {}
+	
+	def assoc_cb(dn, status):
+		if status:
+			times[dn] = time.time() - committed
+			
+	watcher = MoWatcher(handle, ["LsServer"], poll_sec=poll_sec)
+	try:
+		for ls_server_dn in ls_server_dns:
+			watcher.watch(ls_server_dn,
+						  _ls_server_bind_check(prior_mos.get(ls_server_dn)),
+						  callback=assoc_cb)
+		status = watcher.wait(ls_server_dns, timeout=timeout)
+	finally:
+		watcher.stop()
+		
+	results = {}
+	for dn in ls_server_dns:
+		if status[dn] is True:
+			results[dn] = None
+		elif status[dn] is False:
+			results[dn] = UcsOperationError(caller, "LsServer '%s' failed "
+											"to associate" % dn)
+		else:
+			results[dn] = UcsOperationError(caller, "LsServer '%s' not "
+											"associated in %s seconds" %
+											(dn, timeout))
+	return {"results": results,
+			"times": times,
+			"percentiles": _percentiles_get(times.values()),
+			"elapsed": time.time() - start}
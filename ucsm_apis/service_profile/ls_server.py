@@ -2,8 +2,24 @@
 This module intends on creating higher level api calls for establishing an
  Ls Server (the base object for a server profile template)
 """
+import threading
+import time
+from collections import namedtuple
+
 from ucsmsdk.ucsexception import UcsOperationError
 
+LsServerInventory = namedtuple("LsServerInventory",
+							   ["dn", "name", "type", "src_templ_name",
+								"assoc_state", "pn_dn", "power_state",
+								"requirement", "vnic_ethers", "vnic_fcs",
+								"vcons"])
+VnicInventory = namedtuple("VnicInventory",
+						   ["name", "switch_id", "addr", "admin_vcon",
+							"order"])
+VconInventory = namedtuple("VconInventory",
+						   ["id", "fabric", "placement", "select", "share",
+							"transport"])
+
 
 def ls_server_create(handle, name, org_dn="org-root", agent_policy_name=None,
 					 bios_profile_name=None, boot_policy_name=None, descr=None,
@@ -213,4 +229,323 @@ def ls_server_delete(handle, name, org_dn="org-root"):
 	mo = ls_server_get(handle=handle, name=name, org_dn=org_dn, 
 					   caller="ls_server_delete")
 	handle.remove_mo(mo)
-	handle.commit()
\ No newline at end of file
+	handle.commit()
+
+
+class _LsServerTreeHandle(object):
+	"""
+	stands in for the handle while the create apis assemble a service
+	profile tree locally, nothing is sent to UCSM
+	"""
+
+	def __init__(self, org_dn):
+		self.org_dn = org_dn
+		self.mos = {}
+
+	def query_dn(self, dn):
+		if dn == self.org_dn:
+			return dn
+		return self.mos.get(dn)
+
+	def add_mo(self, mo, modify_present=False):
+		self.mos[mo.dn] = mo
+
+	def commit(self):
+		pass
+
+
+def _ls_server_tree_child_add(errors, path, child_keys, child_key, create,
+							  *args, **kwargs):
+	if child_key in child_keys:
+		errors.append("%s: duplicate '%s'" % (path, child_key))
+		return None
+	child_keys.add(child_key)
+	try:
+		return create(*args, **kwargs)
+	except (UcsOperationError, ValueError, TypeError) as err:
+		errors.append("%s: %s" % (path, err))
+		return None
+
+
+def ls_server_tree_create(handle, name, org_dn="org-root", vnic_ethers=None,
+						  vnic_fcs=None, vcons=None, requirement=None,
+						  power=None, **kwargs):
+	"""
+	creates a service profile with all its children in one commit
+
+	The LsServer tree is assembled locally by the same create apis which
+	are used for the single objects, so defaults and property checks are
+	identical, and the whole tree is validated before a single commit.
+
+	Args:
+		handle (UcsHandle)
+		name (string): ls server name
+		org_dn (string): location to place ls server
+		vnic_ethers (list of dict): vnic_ether_create args without handle
+			and ls_server_dn, with an optional "ifs" key holding a list
+			of vnic_ether_if_create args
+		vnic_fcs (list of dict): vnic_fc_create args, with an optional
+			"ifs" key holding a list of vnic_fc_if_create args
+		vcons (list of dict): fabric_vcon_create args
+		requirement (dict): ls_requirement_create args
+		power (dict): ls_power_create args
+		**kwargs: ls_server_create args
+
+	Returns:
+		LsServer: managed object with its children
+
+	Raises:
+		UcsOperationError: if the service profile description is not valid
+
+	Example:
+		ls_server_tree_create(handle, name="sp1",
+							  type="instance",
+							  vnic_ethers=[{"name": "eth0", "switch_id": "A",
+											"ifs": [{"name": "default",
+													 "default_net": "yes"}]}],
+							  vnic_fcs=[{"name": "fc0", "switch_id": "A",
+										 "ifs": [{"name": "default"}]}],
+							  vcons=[{"id": "1"}],
+							  power={"state": "up"})
+	"""
+	from .vnic_ether import vnic_ether_create, vnic_ether_if_create
+	from .vnic_fc import vnic_fc_create, vnic_fc_if_create
+	from .fabric_vcon import fabric_vcon_create
+	from .ls_requirement import ls_requirement_create
+	from .ls_power import ls_power_create
+
+	tree_handle = _LsServerTreeHandle(org_dn)
+	errors = []
+	try:
+		mo = ls_server_create(tree_handle, name, org_dn=org_dn, **kwargs)
+	except (UcsOperationError, ValueError, TypeError) as err:
+		raise UcsOperationError("ls_server_tree_create", str(err))
+
+	vnics = [("vnic_ethers", vnic_ether_create, vnic_ether_if_create,
+			  "vnic_ether_dn", vnic_ethers or []),
+			 ("vnic_fcs", vnic_fc_create, vnic_fc_if_create, "vnic_fc_dn",
+			  vnic_fcs or [])]
+	for key, create, if_create, if_parent_key, specs in vnics:
+		names = set()
+		for i, spec in enumerate(specs):
+			spec = dict(spec)
+			ifs = spec.pop("ifs", [])
+			path = "%s[%d]" % (key, i)
+			vnic = _ls_server_tree_child_add(errors, path, names,
+											 spec.get("name"), create,
+											 tree_handle,
+											 ls_server_dn=mo.dn, **spec)
+			if vnic is None:
+				continue
+			if_names = set()
+			for j, if_spec in enumerate(ifs):
+				if_spec = dict(if_spec)
+				if_spec[if_parent_key] = vnic.dn
+				_ls_server_tree_child_add(errors, "%s.ifs[%d]" % (path, j),
+										  if_names, if_spec.get("name"),
+										  if_create, tree_handle, **if_spec)
+
+	ids = set()
+	for i, spec in enumerate(vcons or []):
+		_ls_server_tree_child_add(errors, "vcons[%d]" % i, ids,
+								  str(spec.get("id")), fabric_vcon_create,
+								  tree_handle, ls_server_dn=mo.dn, **spec)
+
+	for key, create, spec in [("requirement", ls_requirement_create,
+							   requirement),
+							  ("power", ls_power_create, power)]:
+		if spec is not None:
+			_ls_server_tree_child_add(errors, key, set(), key, create,
+									  tree_handle, ls_server_dn=mo.dn,
+									  **spec)
+
+	if errors:
+		raise UcsOperationError("ls_server_tree_create", "; ".join(errors))
+
+	handle.add_mo(mo, modify_present=True)
+	handle.commit()
+	return mo
+
+
+def _ls_server_instantiate_chunk(handle, template_dn, names, org_dn):
+	from ucsmsdk.ucsbasetype import DnSet, Dn
+	from ucsmsdk.ucsmethodfactory import ls_instantiate_n_named_template
+
+	# one existing name fails the whole call with in_error_on_existing
+	results = {}
+	dns = dict(("%s/ls-%s" % (org_dn, name), name) for name in names)
+	for dn, mo in handle.query_dns(list(dns)).items():
+		if mo is not None and dn in dns:
+			results[dns[dn]] = UcsOperationError(
+				"ls_server_instantiate_many",
+				"LsServer '%s' already exists" % dn)
+	names = [name for name in names if name not in results]
+	if not names:
+		return results
+
+	dn_set = DnSet()
+	for name in names:
+		dn = Dn()
+		dn.attr_set("value", name)
+		dn_set.child_add(dn)
+
+	elem = ls_instantiate_n_named_template(cookie=handle.cookie,
+										   dn=template_dn,
+										   in_error_on_existing="true",
+										   in_name_set=dn_set,
+										   in_target_org=org_dn)
+	try:
+		mos = handle.process_xml_elem(elem)
+	except Exception as err:
+		results.update((name, err) for name in names)
+		return results
+
+	created = set(mo.name for mo in mos
+				  if mo.get_class_id() == "LsServer")
+	for name in names:
+		if name in created:
+			results[name] = None
+		else:
+			results[name] = UcsOperationError(
+				"ls_server_instantiate_many",
+				"LsServer '%s/ls-%s' was not instantiated" % (org_dn, name))
+	return results
+
+
+def ls_server_instantiate_many(handle, template_dn, names, org_dn="org-root",
+							   chunk_size=50, parallel=1):
+	"""
+	instantiates many service profiles from a template
+
+	The service profiles are created by the LsInstantiateNNamedTemplate
+	method, one call per chunk of names. Up to parallel chunks are sent
+	at the same time. The names of existing service profiles are looked
+	up first and reported as failed, so that they do not fail the rest
+	of their chunk.
+
+	Args:
+		handle (UcsHandle)
+		template_dn (string): dn of the service profile template
+		names (list of string): names of the service profiles to create
+		org_dn (string): location to place the service profiles
+		chunk_size (int): service profiles per call
+		parallel (int): number of calls sent at the same time
+
+	Returns:
+		dict: {"results": {name: None if created,
+						   UcsOperationError/exception if failed},
+			   "calls": number of calls,
+			   "elapsed": wall-clock time in seconds,
+			   "per_sec": service profiles created per second}
+
+	Raises:
+		UcsOperationError: if chunk_size or parallel is not a positive
+			integer
+
+	Example:
+		ls_server_instantiate_many(handle,
+								   template_dn="org-root/ls-web-template",
+								   names=["web-%d" % i for i in range(200)],
+								   org_dn="org-root/org-web",
+								   chunk_size=50, parallel=4)
+	"""
+	for arg, value in [("chunk_size", chunk_size), ("parallel", parallel)]:
+		if not isinstance(value, int) or value < 1:
+			raise UcsOperationError("ls_server_instantiate_many",
+									"%s must be a positive integer, got "
+									"'%s'" % (arg, value))
+
+	start = time.time()
+	chunks = [names[i:i + chunk_size]
+			  for i in range(0, len(names), chunk_size)]
+	calls = len(chunks)
+	results = {}
+	lock = threading.Lock()
+
+	def worker():
+		while True:
+			with lock:
+				if not chunks:
+					return
+				chunk = chunks.pop(0)
+			chunk_results = _ls_server_instantiate_chunk(handle, template_dn,
+														 chunk, org_dn)
+			with lock:
+				results.update(chunk_results)
+
+	threads = [threading.Thread(target=worker)
+			   for _ in range(max(1, min(parallel, calls)))]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	elapsed = time.time() - start
+	created = len([name for name in results if results[name] is None])
+	return {"results": results,
+			"calls": calls,
+			"elapsed": elapsed,
+			"per_sec": created / elapsed if elapsed else 0.0}
+
+
+def ls_server_inventory(handle, org_dn=None):
+	"""
+	gets a compact inventory of the service profiles
+
+	LsServer, VnicEther, VnicFc, FabricVCon, LsPower and LsRequirement are
+	fetched with one class query each and joined on dn. Each class is
+	reduced to tuples before the next one is fetched, so the managed
+	objects of only one class are held at a time.
+
+	Args:
+		handle (UcsHandle)
+		org_dn (string): only the service profiles under this org and its
+			sub-orgs, all the service profiles if None
+
+	Returns:
+		list of LsServerInventory: sorted by dn, vnic_ethers and vnic_fcs
+			are tuples of VnicInventory, vcons a tuple of VconInventory
+
+	Raises:
+		None
+
+	Example:
+		for sp in ls_server_inventory(handle, org_dn="org-root/org-web"):
+			print(sp.name, sp.power_state, len(sp.vnic_ethers))
+	"""
+	filter_str = None
+	if org_dn is not None:
+		filter_str = '(dn, "^%s/", type="re")' % org_dn
+
+	def rows_get(class_id, row_get):
+		rows = {}
+		for mo in handle.query_classid(class_id, filter_str=filter_str):
+			parent_dn = mo.dn.rsplit("/", 1)[0]
+			rows.setdefault(parent_dn, []).append(row_get(mo))
+		return rows
+
+	def vnic_row_get(mo):
+		return VnicInventory(mo.name, mo.switch_id, mo.addr, mo.admin_vcon,
+							 mo.order)
+
+	vnic_ethers = rows_get("VnicEther", vnic_row_get)
+	vnic_fcs = rows_get("VnicFc", vnic_row_get)
+	vcons = rows_get("FabricVCon",
+					 lambda mo: VconInventory(mo.id, mo.fabric, mo.placement,
+											  mo.select, mo.share,
+											  mo.transport))
+	power_states = rows_get("LsPower", lambda mo: mo.state)
+	requirements = rows_get("LsRequirement", lambda mo: mo.name)
+
+	inventory = []
+	for mo in handle.query_classid("LsServer", filter_str=filter_str):
+		inventory.append(LsServerInventory(
+			mo.dn, mo.name, mo.type, mo.src_templ_name, mo.assoc_state,
+			mo.pn_dn,
+			power_states.get(mo.dn, [None])[0],
+			requirements.get(mo.dn, [None])[0],
+			tuple(sorted(vnic_ethers.get(mo.dn, []))),
+			tuple(sorted(vnic_fcs.get(mo.dn, []))),
+			tuple(sorted(vcons.get(mo.dn, [])))))
+	inventory.sort()
+	return inventory
@@ -2,8 +2,14 @@
 This module intends on creating higher level api calls for establishing an
  LsServerFsm
 """
+import threading
+import time
+from functools import partial
+
 from ucsmsdk.ucsexception import UcsOperationError
 
+from ..utils.watcher import MoWatcher
+
 def ls_server_fsm_create(handle, ls_server_dn, **kwargs):
 	"""
 	create the ls server fsm
@@ -136,4 +142,213 @@ def ls_server_fsm_delete(handle, ls_server_dn):
 	mo = ls_server_fsm_get(handle=handle, ls_server_dn=ls_server_dn, 
 					  caller="ls_server_fsm_delete")
 	handle.remove_mo(mo)
-	handle.commit()
\ No newline at end of file
+	handle.commit()
+
+
+def _ls_server_fsm_check(props, since=None):
+	if since is not None and props.get("completion_time") == since:
+		# the previous fsm run, the new one has not completed yet
+		return None
+	fsm_status = props.get("fsm_status")
+	if fsm_status == "fail":
+		return False
+	if fsm_status == "success" or \
+			(fsm_status in ["nop", "skip"] and props.get("progress") == "100"):
+		return True
+	return None
+
+
+class LsServerFsmFuture(object):
+	"""
+	Completion of the fsm of one ls server, returned by
+	LsServerFsmWatcher.watch()
+	"""
+	def __init__(self, watcher, ls_server_dn):
+		self._watcher = watcher
+		self.ls_server_dn = ls_server_dn
+		self._event = threading.Event()
+		self._result = None
+
+	def _set(self, dn, result):
+		self._result = result
+		self._event.set()
+
+	def done(self):
+		"""
+		Returns:
+			True if the fsm has completed
+		"""
+		return self._event.is_set()
+
+	def result(self, timeout=None):
+		"""
+		Waits for the fsm to complete
+
+		Args:
+			timeout (int): timeout in seconds, waits forever if None
+
+		Returns:
+			True if succeeded, False if failed, None if timed out
+		"""
+		deadline = None
+		if timeout is not None:
+			deadline = time.time() + timeout
+
+		while not self._event.is_set():
+			wait_sec = self._watcher.poll_sec
+			if deadline is not None:
+				time_left = deadline - time.time()
+				if time_left <= 0:
+					break
+				if wait_sec is None or time_left < wait_sec:
+					wait_sec = time_left
+			if self._event.wait(wait_sec):
+				break
+			if self._watcher.poll_sec is not None:
+				self._watcher.poll()
+		return self._result
+
+
+class LsServerFsmWatcher(object):
+	"""
+	Follows the fsm of many ls servers from one event subscription on
+	LsServerFsm. If poll_sec is specified, or the event channel is not
+	available, all the pending fsms are polled with one configResolveDns.
+
+	Args:
+		handle (UcsHandle)
+		poll_sec (int): polling interval in seconds, events are used if None
+
+	Example:
+		watcher = LsServerFsmWatcher(handle)
+		futures = watcher.watch(["org-root/ls-sp1", "org-root/ls-sp2"])
+		watcher.progress_get("org-root/ls-sp1")
+		results = watcher.wait(timeout=1800)
+		watcher.stop()
+	"""
+	def __init__(self, handle, poll_sec=None):
+		self._watcher = MoWatcher(handle, ["LsServerFsm"], poll_sec=poll_sec)
+		self._futures = {}
+
+	@property
+	def poll_sec(self):
+		return self._watcher.poll_sec
+
+	def watch(self, ls_server_dns, since=None):
+		"""
+		Starts following the fsm of the ls servers
+
+		Args:
+			ls_server_dns (list of string): dns of the ls servers
+			since (dict): {ls_server_dn: completion_time}, the fsm runs
+				that completed at completion_time are not reported, to wait
+				for an fsm that is about to be triggered
+
+		Returns:
+			dict: {ls_server_dn: LsServerFsmFuture}
+		"""
+		self._watcher.start()
+		futures = {}
+		since = since or {}
+		for ls_server_dn in ls_server_dns:
+			future = LsServerFsmFuture(self, ls_server_dn)
+			check = partial(_ls_server_fsm_check,
+							since=since.get(ls_server_dn))
+			self._watcher.watch(ls_server_dn + "/fsm", check,
+								callback=future._set)
+			self._futures[ls_server_dn] = future
+			futures[ls_server_dn] = future
+		# the initial state also catches fsms completed before the
+		# subscription was in place
+		self._watcher.poll()
+		return futures
+
+	def unwatch(self, ls_server_dn):
+		"""
+		Stops following the fsm of an ls server
+
+		Args:
+			ls_server_dn (string): dn of the ls server
+
+		Returns:
+			None
+		"""
+		self._watcher.unwatch(ls_server_dn + "/fsm")
+		self._futures.pop(ls_server_dn, None)
+
+	def poll(self):
+		"""
+		Refreshes all the pending fsms with one configResolveDns
+
+		Returns:
+			None
+		"""
+		self._watcher.poll()
+
+	def progress_get(self, ls_server_dn):
+		"""
+		Gets the last known progress of the fsm of an ls server
+
+		Args:
+			ls_server_dn (string): dn of the ls server
+
+		Returns:
+			dict: {"stage": current fsm, "status": fsm status,
+				   "progress": percentage as int or None,
+				   "done": True/False/None}
+
+		Raises:
+			UcsOperationError: if the ls server is not watched
+		"""
+		if ls_server_dn not in self._futures:
+			raise UcsOperationError("progress_get",
+									"LsServer '%s' is not watched" %
+									ls_server_dn)
+
+		fsm_dn = ls_server_dn + "/fsm"
+		props = self._watcher.props_get(fsm_dn)
+		progress = props.get("progress")
+		return {
+			"stage": props.get("current_fsm"),
+			"status": props.get("fsm_status"),
+			"progress": int(progress) if progress else None,
+			"done": self._watcher.status_get(fsm_dn),
+		}
+
+	def wait(self, ls_server_dns=None, timeout=None):
+		"""
+		Waits until the fsms have completed or the timeout expires
+
+		Args:
+			ls_server_dns (list of string): dns to wait for, all the
+				watched ls servers if None
+			timeout (int): timeout in seconds, waits forever if None
+
+		Returns:
+			dict: {ls_server_dn: True if succeeded, False if failed,
+				   None if timed out}
+		"""
+		if ls_server_dns is None:
+			ls_server_dns = list(self._futures)
+
+		deadline = None
+		if timeout is not None:
+			deadline = time.time() + timeout
+
+		results = {}
+		for ls_server_dn in ls_server_dns:
+			time_left = None
+			if deadline is not None:
+				time_left = max(deadline - time.time(), 0)
+			results[ls_server_dn] = \
+				self._futures[ls_server_dn].result(time_left)
+		return results
+
+	def stop(self):
+		"""
+		Removes the event subscription
+
+		Returns:
+			None
+		"""
+		self._watcher.stop()
@@ -2,8 +2,12 @@
 This module intends on creating higher level api calls for establishing an
  LsServerFsm
 """
+import time
+
 from ucsmsdk.ucsexception import UcsOperationError
 
+from .ls_server_fsm import LsServerFsmWatcher
+
 def lsmaint_ack_create(handle, ls_server_dn, admin_state=None, auto_delete=None,
 					   descr=None, policy_owner=None, scheduler=None, **kwargs):
 	"""
@@ -145,4 +149,136 @@ def lsmaint_ack_delete(handle, ls_server_dn):
 	mo = lsmaint_ack_get(handle=handle, ls_server_dn=ls_server_dn, 
 					     caller="lsmaint_ack_delete")
 	handle.remove_mo(mo)
-	handle.commit()
\ No newline at end of file
+	handle.commit()
+
+def lsmaint_ack_pending_get(handle, org_dn=None):
+	"""
+	gets the lsmaint acks waiting for a user acknowledgement
+	
+	Args:
+		handle (UcsHandle)
+		org_dn (string): only the service profiles under this org and its
+			sub-orgs, all the service profiles if None
+			
+	Returns:
+		list of LsmaintAck: sorted by dn
+		
+	Raises:
+		None
+		
+	Example:
+		lsmaint_ack_pending_get(handle, org_dn="org-root/org-web")
+	"""
+	filter_str = '(oper_state, "waiting-for-user", type="eq")'
+	if org_dn is not None:
+		filter_str += ' and (dn, "^%s/", type="re")' % org_dn
+	acks = handle.query_classid("LsmaintAck", filter_str=filter_str)
+	return sorted(acks, key=lambda ack: ack.dn)
+	
+def _lsmaint_ack_wave(handle, watcher, acks, timeout):
+	caller = "lsmaint_ack_rolling"
+	ls_server_dns = [ack.dn[:-len("/ack")] for ack in acks]
+	
+	# the completion time of the previous fsm runs, so that only the fsm
+	# triggered by the acknowledgement is waited for
+	fsms = handle.query_dns([dn + "/fsm" for dn in ls_server_dns])
+	since = {}
+	for dn in ls_server_dns:
+		fsm = fsms.get(dn + "/fsm")
+		if fsm is not None:
+			since[dn] = fsm.completion_time
+			
+	for ack in acks:
+		ack.admin_state = "trigger-immediate"
+		handle.set_mo(ack)
+	try:
+		handle.commit()
+	except Exception as err:
+		handle.commit_buffer_discard()
+		return dict((dn, err) for dn in ls_server_dns)
+		
+	watcher.watch(ls_server_dns, since=since)
+	status = watcher.wait(ls_server_dns, timeout=timeout)
+	results = {}
+	for dn in ls_server_dns:
+		watcher.unwatch(dn)
+		if status[dn] is True:
+			results[dn] = None
+		elif status[dn] is False:
+			results[dn] = UcsOperationError(caller, "LsServer '%s' fsm "
+											"failed" % dn)
+		else:
+			results[dn] = UcsOperationError(caller, "LsServer '%s' fsm did "
+											"not complete in %s seconds" %
+											(dn, timeout))
+	return results
+	
+def lsmaint_ack_rolling(handle, wave_size=10, org_dn=None, timeout=1800,
+						max_failures=None, poll_sec=None):
+	"""
+	acknowledges the pending reboots in waves
+	
+	The pending acks are found with one class query. Each wave of up to
+	wave_size acks is acknowledged with one commit, and the next wave is
+	started only once the fsm of every service profile of the wave has
+	completed, so that no more than wave_size hosts are down at once.
+	
+	Args:
+		handle (UcsHandle)
+		wave_size (int): service profiles acknowledged at once
+		org_dn (string): only the service profiles under this org and its
+			sub-orgs, all the service profiles if None
+		timeout (int): seconds to wait for the fsms of a wave
+		max_failures (int): stops starting new waves once more service
+			profiles failed, never stops if None
+		poll_sec (int): polling interval in seconds, fsm events are used
+			if None
+			
+	Returns:
+		dict: {"results": {ls_server_dn: None if acknowledged and
+						   completed, UcsOperationError/exception if failed
+						   or not acknowledged},
+			   "waves": number of waves acknowledged,
+			   "elapsed": wall-clock time in seconds}
+			   
+	Raises:
+		UcsOperationError: if wave_size is not a positive integer
+		
+	Example:
+		lsmaint_ack_rolling(handle, wave_size=25, org_dn="org-root/org-web",
+							timeout=1800, max_failures=5)
+	"""
+	if not isinstance(wave_size, int) or wave_size < 1:
+		raise UcsOperationError("lsmaint_ack_rolling",
+								"wave_size must be a positive integer, got "
+								"'%s'" % wave_size)
+		
+	start = time.time()
+	acks = lsmaint_ack_pending_get(handle, org_dn=org_dn)
+	waves = [acks[i:i + wave_size] for i in range(0, len(acks), wave_size)]
+	results = {}
+	failures = 0
+	acked_waves = 0
+	
+	watcher = LsServerFsmWatcher(handle, poll_sec=poll_sec)
+	try:
+		for wave in waves:
+			if max_failures is not None and failures > max_failures:
+				for ack in wave:
+					dn = ack.dn[:-len("/ack")]
+					results[dn] = UcsOperationError(
+						"lsmaint_ack_rolling", "LsmaintAck '%s' not "
+						"acknowledged, %d failures" % (ack.dn, failures))
+				continue
+				
+			wave_results = _lsmaint_ack_wave(handle, watcher, wave, timeout)
+			acked_waves += 1
+			failures += len([dn for dn in wave_results
+							 if wave_results[dn] is not None])
+			results.update(wave_results)
+	finally:
+		watcher.stop()
+		
+	return {"results": results,
+			"waves": acked_waves,
+			"elapsed": time.time() - start}
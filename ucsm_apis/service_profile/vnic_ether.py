@@ -4,6 +4,8 @@ This module intends on creating higher level api calls for establishing an
 """
 from ucsmsdk.ucsexception import UcsOperationError
 
+from ..utils.utils import _mo_modify_many
+
 def vnic_ether_create(handle, name, ls_server_dn, adaptor_profile_name=None,
 					  addr="derived", admin_cdn_name=None, 
 					  admin_host_port="ANY", admin_vcon="any", 
@@ -328,3 +330,43 @@ def vnic_ether_if_delete(handle, name, vnic_ether_dn):
 	handle.remove_mo(mo)
 	handle.commit()
 	
+	
+def vnic_ether_modify_many(handle, selector, chunk_size=None, **kwargs):
+	"""
+	modifies the vnic ether of many service profiles
+	
+	The VnicEther objects of the service profiles are selected with one
+	class query, the vnics of LAN connectivity policies and vnic templates
+	are left out. The ones which already match are skipped and the others
+	are committed chunk_size at a time.
+	
+	Args:
+		handle (UcsHandle)
+		selector (dict): {"name": vnic ether name, "org_dn": org dn}, both
+			optional, org_dn selects the service profiles under the org
+			and its sub-orgs
+		chunk_size (int): vnic ethers per commit, all in one if None
+		**kwargs: key-value pair of managed object(MO) property and value, Use
+                  'print(ucscoreutils.get_meta_info(<classid>).config_props)'
+                  to get all configurable properties of class
+				  
+	Returns:
+		dict: {"results": {dn: None if modified,
+						   exception if the commit failed},
+			   "skipped": [dn already matching],
+			   "changes": {dn: {property: (current value, value)}}}
+			   
+	Raises:
+		UcsOperationError: if no property is given
+		
+	Example:
+		vnic_ether_modify_many(handle,
+							  selector={"name": "eth0",
+										"org_dn": "org-root/org-web"},
+							  chunk_size=50, mtu="9000")
+	"""
+	
+	return _mo_modify_many(handle, "VnicEther", selector, kwargs,
+						   dn_re="ls-[^/]+/ether-[^/]+$",
+						   chunk_size=chunk_size,
+						   caller="vnic_ether_modify_many")
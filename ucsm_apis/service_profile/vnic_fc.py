@@ -4,6 +4,9 @@ This module intends on creating higher level api calls for establishing an
 """
 from ucsmsdk.ucsexception import UcsOperationError
 
+from ..utils.utils import _dn_re_escape
+from ..utils.utils import _mo_modify_many
+
 def vnic_fc_create(handle, name, ls_server_dn, adaptor_profile_name="",
 				   addr="derived", admin_cdn_name="", admin_host_port="ANY", 
 				   admin_vcon="any", cdn_prop_in_sync=None, cdn_source=None,
@@ -326,3 +329,122 @@ def vnic_fc_if_delete(handle, name, vnic_fc_dn):
 	handle.remove_mo(mo)
 	handle.commit()
 	
+	
+def vnic_fc_modify_many(handle, selector, chunk_size=None, **kwargs):
+	"""
+	modifies the vnic fc of many service profiles
+	
+	The VnicFc objects of the service profiles are selected with one
+	class query, the vhbas of SAN connectivity policies and vhba templates
+	are left out. The ones which already match are skipped and the others
+	are committed chunk_size at a time.
+	
+	Args:
+		handle (UcsHandle)
+		selector (dict): {"name": vnic fc name, "org_dn": org dn}, both
+			optional, org_dn selects the service profiles under the org
+			and its sub-orgs
+		chunk_size (int): vnic fcs per commit, all in one if None
+		**kwargs: key-value pair of managed object(MO) property and value, Use
+                  'print(ucscoreutils.get_meta_info(<classid>).config_props)'
+                  to get all configurable properties of class
+				  
+	Returns:
+		dict: {"results": {dn: None if modified,
+						   exception if the commit failed},
+			   "skipped": [dn already matching],
+			   "changes": {dn: {property: (current value, value)}}}
+			   
+	Raises:
+		UcsOperationError: if no property is given
+		
+	Example:
+		vnic_fc_modify_many(handle,
+							  selector={"name": "fc0",
+										"org_dn": "org-root/org-web"},
+							  chunk_size=50, qos_policy_name="fc-qos")
+	"""
+	
+	return _mo_modify_many(handle, "VnicFc", selector, kwargs,
+						   dn_re="ls-[^/]+/fc-[^/]+$",
+						   chunk_size=chunk_size,
+						   caller="vnic_fc_modify_many")
+	
+def _ls_server_templated_get(handle, org_dn):
+	# service profiles bound to an updating template reject the changes
+	# of the vhbas, they are only made on the template
+	templates = handle.query_classid(
+		"LsServer", filter_str='(type, "updating-template", type="eq")')
+	template_dns = set(mo.dn for mo in templates)
+	if not template_dns:
+		return {}
+		
+	filter_str = '(type, "instance", type="eq") and ' \
+		'(dn, "^%s/(org-[^/]+/)*ls-[^/]+$", type="re")' % \
+		_dn_re_escape(org_dn or "org-root")
+	servers = handle.query_classid("LsServer", filter_str=filter_str)
+	return dict((mo.dn, mo.oper_src_templ_name) for mo in servers
+				if mo.oper_src_templ_name in template_dns)
+	
+def vnic_fc_if_set_many(handle, selector, name, chunk_size=None,
+						dry_run=False):
+	"""
+	sets the vsan of the vnic fc interfaces of many service profiles
+	
+	The VnicFcIf objects of the service profile vhbas are selected with
+	one class query, the ones already on the vsan are skipped and the
+	others are committed chunk_size at a time. The service profiles bound
+	to an updating template are reported as failed without a commit, the
+	vsan is set on their template instead.
+	
+	Args:
+		handle (UcsHandle)
+		selector (dict): {"vnic_fc_name": vnic fc name,
+						  "vsan": current vsan name, "org_dn": org dn},
+			all optional, org_dn selects the service profiles under the org
+			and its sub-orgs
+		name (string): name of the vsan to set
+		chunk_size (int): vnic fc interfaces per commit, all in one if None
+		dry_run (bool): only reports the changes, nothing is committed
+		
+	Returns:
+		dict: {"results": {dn: None if modified,
+						   exception if the commit failed or the
+						   service profile is bound to an updating
+						   template},
+			   "skipped": [dn already on the vsan],
+			   "changes": {dn: {"name": (current vsan, vsan)}}}
+			   
+	Raises:
+		UcsOperationError: if name is not given
+		
+	Example:
+		vnic_fc_if_set_many(handle,
+							selector={"vnic_fc_name": "fc0",
+									  "vsan": "vsan-100",
+									  "org_dn": "org-root/org-web"},
+							name="vsan-200", chunk_size=50, dry_run=True)
+	"""
+	
+	mo_selector = {"name": selector.get("vsan"),
+				   "org_dn": selector.get("org_dn")}
+	vnic_fc_re = "[^/]+"
+	if selector.get("vnic_fc_name"):
+		vnic_fc_re = _dn_re_escape(selector["vnic_fc_name"])
+		
+	templated = _ls_server_templated_get(handle, selector.get("org_dn"))
+	
+	def error_get(mo):
+		ls_server_dn = mo.dn.rsplit("/", 2)[0]
+		if ls_server_dn in templated:
+			return UcsOperationError(
+				"vnic_fc_if_set_many",
+				"service profile %s is bound to the updating template %s" %
+				(ls_server_dn, templated[ls_server_dn]))
+		return None
+		
+	return _mo_modify_many(handle, "VnicFcIf", mo_selector, {"name": name},
+						   dn_re="ls-[^/]+/fc-%s/if-default$" % vnic_fc_re,
+						   chunk_size=chunk_size, dry_run=dry_run,
+						   error_get=error_get,
+						   caller="vnic_fc_if_set_many")
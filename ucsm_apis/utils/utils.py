@@ -11,6 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+
 
 def blade_dn_get(chassis_id, blade_id):
     return "sys/chassis-" + str(chassis_id) + '/blade-' + str(blade_id)
@@ -18,3 +20,114 @@ def blade_dn_get(chassis_id, blade_id):
 
 def rack_dn_get(rack_id):
     return "sys/rack-unit-" + str(rack_id)
+
+
+_mo_classes = {}
+
+
+def mo_class_get(class_id):
+    """
+    Gets the ucsmsdk class of a class id.
+
+    The class is resolved and imported on the first call only, later
+    calls are served from a cache shared by all the apis.
+
+    Args:
+        class_id (string): class id, e.g. "LsbootLan"
+
+    Returns:
+        ManagedObject class or None if the class id is unknown
+
+    Example:
+        LsbootLan = mo_class_get("LsbootLan")
+    """
+    try:
+        return _mo_classes[class_id]
+    except KeyError:
+        from ucsmsdk.ucscoreutils import load_class
+
+        mo_class = _mo_classes[class_id] = load_class(class_id)
+        return mo_class
+
+
+def _dn_re_escape(value):
+    # re.escape also escapes "-" and "/", which the UCSM filter regex
+    # does not need to accept
+    return re.sub(r"([.^$*+?()\[\]{}|\\])", r"\\\1", value)
+
+
+def _mo_props_differ_get(mo, props):
+    # compares as strings, properties are read back from UCSM as strings
+    return dict((prop, (getattr(mo, prop, None), value))
+                for prop, value in props.items()
+                if value is not None and
+                str(getattr(mo, prop, None)) != str(value))
+
+
+def _mo_modify_many(handle, class_id, selector, props, dn_re,
+                    chunk_size=None, dry_run=False, error_get=None,
+                    caller="_mo_modify_many"):
+    # dn_re matches the dn below the org, so that the objects of the same
+    # class under policies and templates are left out. error_get returns
+    # the error of an object which cannot be modified, it is reported in
+    # the results instead of failing the whole chunk on commit.
+    from ucsmsdk.ucsexception import UcsOperationError
+
+    if not props:
+        raise UcsOperationError(caller, "No property to modify.")
+    # set as strings, as they are compared and read back from UCSM
+    values = dict((prop, str(value)) for prop, value in props.items()
+                  if value is not None)
+
+    org_dn = selector.get("org_dn") or "org-root"
+    dn_pattern = "^%s/(org-[^/]+/)*%s" % (_dn_re_escape(org_dn), dn_re)
+    filters = ['(dn, "%s", type="re")' % dn_pattern]
+    if selector.get("name"):
+        filters.append('(name, "%s", type="eq")' % selector["name"])
+    mos = handle.query_classid(class_id, filter_str=" and ".join(filters))
+
+    results = {}
+    skipped = []
+    staged = []
+    changes = {}
+    for mo in mos:
+        if not re.match(dn_pattern, mo.dn):
+            continue
+        mo_changes = _mo_props_differ_get(mo, props)
+        error = None
+        if mo_changes and error_get is not None:
+            error = error_get(mo)
+        if mo_changes and error is None:
+            try:
+                mo.set_prop_multiple(**values)
+            except ValueError as err:
+                error = UcsOperationError(caller, "%s: %s" % (mo.dn, err))
+        if not mo_changes:
+            skipped.append(mo.dn)
+        elif error is not None:
+            results[mo.dn] = error
+        else:
+            staged.append(mo)
+            changes[mo.dn] = mo_changes
+
+    if dry_run:
+        return {"results": results, "skipped": sorted(skipped),
+                "changes": changes}
+
+    if not chunk_size:
+        chunk_size = len(staged) or 1
+
+    for i in range(0, len(staged), chunk_size):
+        chunk = staged[i:i + chunk_size]
+        for mo in chunk:
+            handle.set_mo(mo)
+            results[mo.dn] = None
+        try:
+            handle.commit()
+        except Exception as err:
+            handle.commit_buffer_discard()
+            for mo in chunk:
+                results[mo.dn] = err
+
+    return {"results": results, "skipped": sorted(skipped),
+            "changes": changes}
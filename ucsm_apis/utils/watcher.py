@@ -0,0 +1,257 @@
+# Copyright 2017 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+This module waits on many managed objects with one event subscription.
+"""
+import threading
+import time
+
+from ucsmsdk.ucseventhandler import UcsEventHandle
+
+
+def _mo_props_get(mo, xml_props=None):
+    if xml_props is None:
+        return dict((prop, getattr(mo, prop, None)) for prop in mo.prop_meta)
+
+    props = {}
+    for xml_prop in xml_props:
+        prop = mo.prop_map.get(xml_prop)
+        if prop is not None:
+            props[prop] = getattr(mo, prop, None)
+    return props
+
+
+class MoWatcher(object):
+    """
+    Tracks the properties of many managed objects until they complete.
+
+    A single event channel subscription is shared by all the watched dns.
+    Every event for a watched dn is merged into the last known properties
+    of the object, which are passed to the check function of the dn.
+    The check function returns None while the operation is in progress,
+    True once it succeeded and False once it failed.
+
+    If poll_sec is specified, or the event channel is not available, the
+    pending dns are instead polled together with one query every poll_sec.
+
+    Args:
+        handle (UcsHandle)
+        class_ids (list of string): class ids of the watched objects
+        poll_sec (int): polling interval in seconds, events are used if None
+
+    Example:
+        watcher = MoWatcher(handle, ["ComputeBlade", "ComputeRackUnit"])
+        watcher.watch("sys/chassis-1/blade-1",
+                      lambda props: props.get("oper_power") == "on" or None)
+        watcher.wait(["sys/chassis-1/blade-1"], timeout=600)
+        watcher.stop()
+    """
+
+    def __init__(self, handle, class_ids, poll_sec=None):
+        self.handle = handle
+        self.class_ids = class_ids
+        self.poll_sec = poll_sec
+        self._condition = threading.Condition()
+        self._checks = {}
+        self._props = {}
+        self._status = {}
+        self._callbacks = {}
+        self._event_handle = None
+        self._watch_blocks = []
+
+    def start(self):
+        """
+        Subscribes to the events of the watched classes, or switches to
+        polling if the event channel is not available. Called by wait().
+
+        Returns:
+            None
+        """
+        # checked and subscribed under the lock, so that concurrent calls
+        # subscribe only once
+        with self._condition:
+            if self.poll_sec is not None or self._watch_blocks:
+                return
+
+            self._event_handle = UcsEventHandle(self.handle)
+            for class_id in self.class_ids:
+                watch_block = self._event_handle.add(
+                    class_id=class_id, call_back=self._event_cb)
+                if watch_block is None:
+                    # no event channel, fall back to polling
+                    self.stop()
+                    self.poll_sec = 5
+                    return
+                self._watch_blocks.append(watch_block)
+
+    def stop(self):
+        """
+        Removes the event subscription.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            for watch_block in self._watch_blocks:
+                self._event_handle.remove(watch_block)
+            self._watch_blocks = []
+            self._event_handle = None
+
+    def _update(self, dn, props):
+        # must be called with self._condition held
+        if dn not in self._checks or self._status[dn] is not None:
+            return
+        self._props[dn].update(props)
+        self._status[dn] = self._checks[dn](self._props[dn])
+        if self._status[dn] is not None:
+            self._condition.notify_all()
+            callback = self._callbacks.get(dn)
+            if callback is not None:
+                callback(dn, self._status[dn])
+
+    def _event_cb(self, mce):
+        if mce.mo is None:
+            return
+        with self._condition:
+            self._update(mce.mo.dn, _mo_props_get(mce.mo, mce.change_list))
+
+    def _refresh(self, dns):
+        mos = self.handle.query_dns(dns)
+        with self._condition:
+            for dn in dns:
+                mo = mos.get(dn)
+                if mo is not None:
+                    self._update(dn, _mo_props_get(mo))
+
+    def watch(self, dn, check, callback=None):
+        """
+        Starts watching a managed object.
+
+        Args:
+            dn (string): dn of the managed object
+            check (function): called with the properties of the object,
+                returns None/True/False
+            callback (function): called with (dn, True/False) once the
+                check succeeds or fails
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._checks[dn] = check
+            self._props[dn] = {}
+            self._status[dn] = None
+            self._callbacks[dn] = callback
+
+    def unwatch(self, dn):
+        """
+        Stops watching a managed object.
+
+        Args:
+            dn (string): dn of the managed object
+
+        Returns:
+            None
+        """
+        with self._condition:
+            for state in [self._checks, self._props, self._status,
+                          self._callbacks]:
+                state.pop(dn, None)
+
+    def props_get(self, dn):
+        """
+        Gets the last known properties of a watched managed object.
+
+        Args:
+            dn (string): dn of the managed object
+
+        Returns:
+            dict: {property: value}, empty if nothing is known yet
+        """
+        with self._condition:
+            return dict(self._props.get(dn, {}))
+
+    def status_get(self, dn):
+        """
+        Gets the status of a watched managed object.
+
+        Args:
+            dn (string): dn of the managed object
+
+        Returns:
+            True if succeeded, False if failed, None if in progress
+        """
+        with self._condition:
+            return self._status.get(dn)
+
+    def poll(self):
+        """
+        Refreshes all the pending watched objects with one query.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            pending = [dn for dn in self._status
+                       if self._status[dn] is None]
+        if pending:
+            self._refresh(pending)
+
+    def wait(self, dns, timeout=None):
+        """
+        Waits until all the dns have completed or the timeout expires.
+
+        Args:
+            dns (list of string): watched dns to wait for
+            timeout (int): timeout in seconds, waits forever if None
+
+        Returns:
+            dict: {dn: True if succeeded, False if failed,
+                   None if timed out}
+        """
+        self.start()
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        # the initial state also catches operations completed before the
+        # subscription was in place
+        self._refresh(dns)
+
+        while True:
+            with self._condition:
+                pending = [dn for dn in dns if dn in self._status and
+                           self._status[dn] is None]
+                if not pending:
+                    break
+                wait_sec = self.poll_sec
+                if deadline is not None:
+                    time_left = deadline - time.time()
+                    if time_left <= 0:
+                        break
+                    if wait_sec is None or time_left < wait_sec:
+                        wait_sec = time_left
+                self._condition.wait(wait_sec)
+
+            if self.poll_sec is not None:
+                self._refresh(pending)
+
+        with self._condition:
+            status = {}
+            for dn in dns:
+                # the dn may have been unwatched meanwhile
+                status[dn] = self._status.pop(dn, None)
+                self._checks.pop(dn, None)
+                self._props.pop(dn, None)
+                self._callbacks.pop(dn, None)
+            return status